@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Build the signed-distance-field glyph atlas used for in-scene labels.
+
+Renders printable ASCII with a TrueType font at 4x resolution, computes an exact
+Euclidean distance transform inside and outside each glyph, downsamples to the
+atlas size and shelf-packs everything into one grayscale PNG plus a JSON file with
+per-glyph metrics.
+
+    python3 build_label_atlas.py [--font path/to/font.ttf]
+
+Requires numpy and Pillow (build time only, the browser just loads the outputs).
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_CANDIDATES = [
+    'fonts/Outfit-Bold.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    '/Library/Fonts/Arial Bold.ttf',
+    'C:/Windows/Fonts/arialbd.ttf',
+]
+CHARSET = ''.join(chr(c) for c in range(32, 127))
+FONT_SIZE = 32       # Glyph size in the atlas (pixels)
+SPREAD = 4           # Distance range encoded either side of the edge (atlas pixels)
+UPSCALE = 4          # Supersampling used to compute the distance field
+ATLAS_WIDTH = 512
+OUTPUT_PNG = 'textures/label_atlas.png'
+OUTPUT_JSON = 'textures/label_atlas.json'
+
+
+def squared_distance_1d(f):
+    """Exact 1D squared distance transform along the last axis (brute force, vectorised)."""
+    n = f.shape[-1]
+    idx = np.arange(n, dtype=np.float32)
+    offsets = (idx[:, None] - idx[None, :]) ** 2  # (n, n)
+    out = np.empty_like(f)
+    # Chunk rows to keep the (rows, n, n) temporary small
+    chunk = max(1, (1 << 22) // (n * n))
+    for start in range(0, f.shape[0], chunk):
+        rows = f[start:start + chunk]
+        out[start:start + chunk] = (rows[:, None, :] + offsets[None, :, :]).min(axis=-1)
+    return out
+
+
+def distance_transform(mask):
+    """Euclidean distance from each pixel to the nearest True pixel of mask."""
+    inf = np.float32(mask.shape[0] ** 2 + mask.shape[1] ** 2)
+    f = np.where(mask, np.float32(0), inf).astype(np.float32)
+    f = squared_distance_1d(f)        # along rows
+    f = squared_distance_1d(f.T).T    # along columns
+    return np.sqrt(f)
+
+
+def glyph_sdf(font, char):
+    """Render one glyph at UPSCALE and return (sdf uint8 array, metrics)."""
+    pad = SPREAD * UPSCALE
+    left, top, right, bottom = font.getbbox(char)
+    advance = font.getlength(char)
+    width = max(right - left, 0)
+    height = max(bottom - top, 0)
+
+    if width == 0 or height == 0:
+        return None, {'advance': advance / UPSCALE}
+
+    canvas = Image.new('L', (width + pad * 2, height + pad * 2), 0)
+    ImageDraw.Draw(canvas).text((pad - left, pad - top), char, font=font, fill=255)
+    inside = np.asarray(canvas) >= 128
+
+    # Signed distance: positive inside, negative outside, 0.5 on the edge after mapping
+    signed = distance_transform(~inside) - distance_transform(inside)
+    out_w = canvas.width // UPSCALE
+    out_h = canvas.height // UPSCALE
+    signed = signed[:out_h * UPSCALE, :out_w * UPSCALE]
+    signed = signed.reshape(out_h, UPSCALE, out_w, UPSCALE).mean(axis=(1, 3)) / UPSCALE
+    sdf = np.clip(0.5 + signed / (2 * SPREAD), 0, 1)
+
+    return (sdf * 255 + 0.5).astype(np.uint8), {
+        'advance': advance / UPSCALE,
+        'xoffset': (left - pad) / UPSCALE,
+        'yoffset': (top - pad) / UPSCALE,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--font', help='TrueType font to rasterize')
+    args = parser.parse_args()
+
+    font_path = args.font or next((p for p in FONT_CANDIDATES if os.path.exists(p)), None)
+    if font_path is None:
+        raise SystemExit('No font found, pass one with --font')
+    font = ImageFont.truetype(font_path, FONT_SIZE * UPSCALE)
+    ascent, descent = font.getmetrics()
+
+    glyphs = {}
+    bitmaps = []
+    for char in CHARSET:
+        sdf, metrics = glyph_sdf(font, char)
+        glyphs[char] = metrics
+        if sdf is not None:
+            bitmaps.append((char, sdf))
+
+    # Shelf packing, tallest glyphs first
+    bitmaps.sort(key=lambda item: -item[1].shape[0])
+    x = y = shelf = 0
+    for char, sdf in bitmaps:
+        h, w = sdf.shape
+        if x + w > ATLAS_WIDTH:
+            x = 0
+            y += shelf + 1
+            shelf = 0
+        glyphs[char].update({'x': x, 'y': y, 'width': w, 'height': h})
+        x += w + 1
+        shelf = max(shelf, h)
+
+    atlas_height = 1
+    while atlas_height < y + shelf:
+        atlas_height *= 2
+    atlas = np.zeros((atlas_height, ATLAS_WIDTH), dtype=np.uint8)
+    for char, sdf in bitmaps:
+        g = glyphs[char]
+        atlas[g['y']:g['y'] + g['height'], g['x']:g['x'] + g['width']] = sdf
+
+    Image.fromarray(atlas, 'L').save(OUTPUT_PNG, optimize=True)
+    with open(OUTPUT_JSON, 'w') as f:
+        json.dump({
+            'font': os.path.basename(font_path),
+            'size': FONT_SIZE,
+            'spread': SPREAD,
+            'ascent': ascent / UPSCALE,
+            'descent': descent / UPSCALE,
+            'width': ATLAS_WIDTH,
+            'height': atlas_height,
+            'glyphs': glyphs,
+        }, f, separators=(',', ':'))
+
+    print(f"Wrote {OUTPUT_PNG} ({ATLAS_WIDTH}x{atlas_height}) and {OUTPUT_JSON} from {font_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Receive frames from the browser's capture mode and write a numbered image sequence.
+
+Open the scene with ?capture=1 (see captureSettings in script.js) while this runs:
+
+    python3 capture_server.py --out captures/promo --port 8765
+
+PNG frames are written as-is. Raw RGBA frames (format=raw) arrive bottom-up from
+readPixels; they are flipped and encoded to PNG here. Standard library only.
+"""
+import argparse
+import os
+import struct
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def encode_png(rgba, width, height):
+    """Encode bottom-up RGBA rows as a top-down 8-bit RGBA PNG."""
+    stride = width * 4
+    rows = bytearray()
+    for y in range(height - 1, -1, -1):
+        rows.append(0)  # Filter type: none
+        rows += rgba[y * stride:(y + 1) * stride]
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(bytes(rows), 6)) + chunk(b'IEND', b''))
+
+
+class CaptureHandler(BaseHTTPRequestHandler):
+    out_dir = 'captures'
+
+    def send_cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+
+    def reply(self, status, message=''):
+        body = message.encode()
+        self.send_response(status)
+        self.send_cors_headers()
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors_headers()
+        self.end_headers()
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        parts = url.path.strip('/').split('/')
+
+        if parts[0] == 'frame' and len(parts) == 2 and parts[1].isdigit():
+            index = int(parts[1])
+            if query.get('format') == 'rgba':
+                width, height = int(query['width']), int(query['height'])
+                if len(body) != width * height * 4:
+                    self.reply(400, f'expected {width * height * 4} bytes, got {len(body)}')
+                    return
+                body = encode_png(body, width, height)
+            path = os.path.join(self.out_dir, f'frame_{index:06d}.png')
+            with open(path, 'wb') as f:
+                f.write(body)
+            self.reply(200)
+        elif parts[0] == 'done':
+            frames = query.get('frames', '?')
+            fps = query.get('fps', '60')
+            print(f"Capture complete: {frames} frames in {self.out_dir}")
+            print(f"  ffmpeg -framerate {fps} -i {self.out_dir}/frame_%06d.png -c:v libx264 -pix_fmt yuv420p out.mp4")
+            self.reply(200)
+        else:
+            self.reply(404, 'unknown endpoint')
+
+    def log_message(self, format, *args):
+        pass  # One line per frame is too noisy
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write frames streamed from capture mode to disk.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--out', default='captures', help='Output directory for frame_NNNNNN.png')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    CaptureHandler.out_dir = args.out
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), CaptureHandler)
+    print(f"Listening on http://localhost:{args.port}, writing frames to {args.out}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
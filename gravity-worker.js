@@ -0,0 +1,457 @@
+// Gravity simulation worker
+// Heavy bodies (sun + planets) are summed directly, small bodies (asteroids, meteors,
+// debris) use a Barnes-Hut octree. Everything is advanced with kick-drift-kick leapfrog,
+// which is symplectic, so orbits stay bounded instead of spiralling in or out.
+
+// Simulation parameters (replaced by the 'init' message)
+let params = {
+    G: 1,
+    theta: 0.7,        // Barnes-Hut opening angle (0 = exact, larger = faster)
+    dt: 0.5,           // Step size in simulation ticks
+    softening: 2,      // Plummer softening length
+    particleMass: 0,   // Mass of each small body (0 disables self-gravity)
+    leafSize: 16,      // Bodies per octree leaf (leaves share one tree walk)
+    treeInterval: 4,   // Rebuild the octree every N steps, reuse self-gravity in between
+    pinFirstHeavy: true // Keep the sun fixed at the origin
+};
+
+// Heavy bodies: x, y, z, vx, vy, vz, ax, ay, az per body + mass
+let heavyCount = 0;
+let heavyPos = null;
+let heavyVel = null;
+let heavyAcc = null;
+let heavyMass = null;
+
+// Small bodies (struct-of-arrays)
+let particleCount = 0;
+let pos = null;
+let vel = null;
+let acc = null;
+let selfAcc = null; // Octree contribution, refreshed every params.treeInterval steps
+let stepCount = 0;
+
+// Octree node pool
+let nodeCapacity = 0;
+let nodeCount = 0;
+let nodeCenterX, nodeCenterY, nodeCenterZ, nodeHalf;
+let nodeMass, nodeComX, nodeComY, nodeComZ;
+let nodeFirstChild, nodeBody, nodeBodyCount;
+let nextInLeaf = null;
+let walkStack = new Int32Array(256);
+
+// Interaction lists shared by all bodies of one leaf
+let farCount = 0;
+let farX = new Float64Array(1024);
+let farY = new Float64Array(1024);
+let farZ = new Float64Array(1024);
+let farM = new Float64Array(1024);
+let nearCount = 0;
+let nearList = new Int32Array(1024);
+
+const minNodeHalf = 1e-3; // Below this, coincident bodies share a leaf
+
+function allocateNodes(capacity) {
+    nodeCapacity = capacity;
+    nodeCenterX = new Float64Array(capacity);
+    nodeCenterY = new Float64Array(capacity);
+    nodeCenterZ = new Float64Array(capacity);
+    nodeHalf = new Float64Array(capacity);
+    nodeMass = new Float64Array(capacity);
+    nodeComX = new Float64Array(capacity);
+    nodeComY = new Float64Array(capacity);
+    nodeComZ = new Float64Array(capacity);
+    nodeFirstChild = new Int32Array(capacity);
+    nodeBody = new Int32Array(capacity);
+    nodeBodyCount = new Int32Array(capacity);
+}
+
+function growNodes() {
+    const old = {
+        cx: nodeCenterX, cy: nodeCenterY, cz: nodeCenterZ, half: nodeHalf,
+        firstChild: nodeFirstChild, body: nodeBody, bodyCount: nodeBodyCount
+    };
+    allocateNodes(nodeCapacity * 2);
+    nodeCenterX.set(old.cx);
+    nodeCenterY.set(old.cy);
+    nodeCenterZ.set(old.cz);
+    nodeHalf.set(old.half);
+    nodeFirstChild.set(old.firstChild);
+    nodeBody.set(old.body);
+    nodeBodyCount.set(old.bodyCount);
+}
+
+function initNode(node, cx, cy, cz, half) {
+    nodeCenterX[node] = cx;
+    nodeCenterY[node] = cy;
+    nodeCenterZ[node] = cz;
+    nodeHalf[node] = half;
+    nodeFirstChild[node] = -1;
+    nodeBody[node] = -1;
+    nodeBodyCount[node] = 0;
+}
+
+function octant(node, i) {
+    return (pos[i * 3] >= nodeCenterX[node] ? 1 : 0) |
+        (pos[i * 3 + 1] >= nodeCenterY[node] ? 2 : 0) |
+        (pos[i * 3 + 2] >= nodeCenterZ[node] ? 4 : 0);
+}
+
+function subdivide(node) {
+    if (nodeCount + 8 > nodeCapacity) growNodes();
+
+    const first = nodeCount;
+    const half = nodeHalf[node] / 2;
+    for (let k = 0; k < 8; k++) {
+        initNode(
+            first + k,
+            nodeCenterX[node] + (k & 1 ? half : -half),
+            nodeCenterY[node] + (k & 2 ? half : -half),
+            nodeCenterZ[node] + (k & 4 ? half : -half),
+            half
+        );
+    }
+    nodeCount += 8;
+    nodeFirstChild[node] = first;
+
+    // Push the bodies held by this leaf down into the new children
+    let body = nodeBody[node];
+    nodeBody[node] = -1;
+    nodeBodyCount[node] = 0;
+    while (body !== -1) {
+        const next = nextInLeaf[body];
+        const child = first + octant(node, body);
+        nextInLeaf[body] = nodeBody[child];
+        nodeBody[child] = body;
+        nodeBodyCount[child]++;
+        body = next;
+    }
+}
+
+function insertParticle(i) {
+    let node = 0;
+    for (;;) {
+        if (nodeFirstChild[node] === -1) {
+            if (nodeBodyCount[node] < params.leafSize || nodeHalf[node] < minNodeHalf) {
+                nextInLeaf[i] = nodeBody[node];
+                nodeBody[node] = i;
+                nodeBodyCount[node]++;
+                return;
+            }
+            subdivide(node);
+        }
+        node = nodeFirstChild[node] + octant(node, i);
+    }
+}
+
+function buildTree() {
+    let minX = Infinity, minY = Infinity, minZ = Infinity;
+    let maxX = -Infinity, maxY = -Infinity, maxZ = -Infinity;
+    for (let i = 0; i < particleCount; i++) {
+        const x = pos[i * 3], y = pos[i * 3 + 1], z = pos[i * 3 + 2];
+        if (x < minX) minX = x;
+        if (y < minY) minY = y;
+        if (z < minZ) minZ = z;
+        if (x > maxX) maxX = x;
+        if (y > maxY) maxY = y;
+        if (z > maxZ) maxZ = z;
+    }
+    const half = Math.max(maxX - minX, maxY - minY, maxZ - minZ) / 2 + 1;
+
+    nodeCount = 1;
+    initNode(0, (minX + maxX) / 2, (minY + maxY) / 2, (minZ + maxZ) / 2, half);
+    for (let i = 0; i < particleCount; i++) {
+        insertParticle(i);
+    }
+
+    // Children are always allocated after their parent, so a reverse sweep is post-order
+    const m = params.particleMass;
+    for (let node = nodeCount - 1; node >= 0; node--) {
+        let mass = 0, cx = 0, cy = 0, cz = 0;
+        const first = nodeFirstChild[node];
+        if (first === -1) {
+            for (let body = nodeBody[node]; body !== -1; body = nextInLeaf[body]) {
+                mass += m;
+                cx += pos[body * 3] * m;
+                cy += pos[body * 3 + 1] * m;
+                cz += pos[body * 3 + 2] * m;
+            }
+        } else {
+            for (let k = first; k < first + 8; k++) {
+                const childMass = nodeMass[k];
+                mass += childMass;
+                cx += nodeComX[k] * childMass;
+                cy += nodeComY[k] * childMass;
+                cz += nodeComZ[k] * childMass;
+            }
+        }
+        nodeMass[node] = mass;
+        if (mass > 0) {
+            nodeComX[node] = cx / mass;
+            nodeComY[node] = cy / mass;
+            nodeComZ[node] = cz / mass;
+        }
+    }
+}
+
+function pushFar(x, y, z, m) {
+    if (farCount === farX.length) {
+        const grow = (array) => {
+            const grown = new Float64Array(array.length * 2);
+            grown.set(array);
+            return grown;
+        };
+        farX = grow(farX);
+        farY = grow(farY);
+        farZ = grow(farZ);
+        farM = grow(farM);
+    }
+    farX[farCount] = x;
+    farY[farCount] = y;
+    farZ[farCount] = z;
+    farM[farCount] = m;
+    farCount++;
+}
+
+function pushNear(body) {
+    if (nearCount === nearList.length) {
+        const grown = new Int32Array(nearList.length * 2);
+        grown.set(nearList);
+        nearList = grown;
+    }
+    nearList[nearCount++] = body;
+}
+
+// Barnes-Hut walk for one leaf: cells that are far from every point of the leaf's box
+// go on the far list as single masses, everything else is opened down to its bodies.
+function buildInteractionList(leaf) {
+    const cx = nodeCenterX[leaf], cy = nodeCenterY[leaf], cz = nodeCenterZ[leaf];
+    const half = nodeHalf[leaf];
+    const theta2 = params.theta * params.theta;
+    farCount = 0;
+    nearCount = 0;
+
+    let top = 0;
+    walkStack[top++] = 0;
+    while (top > 0) {
+        const node = walkStack[--top];
+        const mass = nodeMass[node];
+        if (mass === 0) continue;
+
+        const first = nodeFirstChild[node];
+        if (first === -1) {
+            for (let body = nodeBody[node]; body !== -1; body = nextInLeaf[body]) {
+                pushNear(body);
+            }
+            continue;
+        }
+
+        // Distance from the cell's centre of mass to the nearest point of the leaf box
+        const dx = Math.max(Math.abs(nodeComX[node] - cx) - half, 0);
+        const dy = Math.max(Math.abs(nodeComY[node] - cy) - half, 0);
+        const dz = Math.max(Math.abs(nodeComZ[node] - cz) - half, 0);
+        const d2 = dx * dx + dy * dy + dz * dz;
+        const size = nodeHalf[node] * 2;
+
+        if (size * size < theta2 * d2) {
+            pushFar(nodeComX[node], nodeComY[node], nodeComZ[node], mass);
+        } else {
+            if (top + 8 > walkStack.length) {
+                const grown = new Int32Array(walkStack.length * 2);
+                grown.set(walkStack);
+                walkStack = grown;
+            }
+            for (let k = first; k < first + 8; k++) {
+                walkStack[top++] = k;
+            }
+        }
+    }
+}
+
+// Self-gravity on every small body, written into selfAcc
+function treeForces() {
+    const eps2 = params.softening * params.softening;
+    const G = params.G;
+    const gm = G * params.particleMass;
+
+    for (let leaf = 0; leaf < nodeCount; leaf++) {
+        if (nodeFirstChild[leaf] !== -1 || nodeBody[leaf] === -1) continue;
+
+        buildInteractionList(leaf);
+
+        for (let i = nodeBody[leaf]; i !== -1; i = nextInLeaf[i]) {
+            const x = pos[i * 3], y = pos[i * 3 + 1], z = pos[i * 3 + 2];
+            let ax = 0, ay = 0, az = 0;
+
+            for (let k = 0; k < farCount; k++) {
+                const dx = farX[k] - x;
+                const dy = farY[k] - y;
+                const dz = farZ[k] - z;
+                const d2 = dx * dx + dy * dy + dz * dz + eps2;
+                const f = G * farM[k] / (d2 * Math.sqrt(d2));
+                ax += dx * f;
+                ay += dy * f;
+                az += dz * f;
+            }
+
+            for (let k = 0; k < nearCount; k++) {
+                const j = nearList[k];
+                if (j === i) continue;
+                const dx = pos[j * 3] - x;
+                const dy = pos[j * 3 + 1] - y;
+                const dz = pos[j * 3 + 2] - z;
+                const d2 = dx * dx + dy * dy + dz * dz + eps2;
+                const f = gm / (d2 * Math.sqrt(d2));
+                ax += dx * f;
+                ay += dy * f;
+                az += dz * f;
+            }
+
+            selfAcc[i * 3] = ax;
+            selfAcc[i * 3 + 1] = ay;
+            selfAcc[i * 3 + 2] = az;
+        }
+    }
+}
+
+function computeAccelerations() {
+    const G = params.G;
+    const eps2 = params.softening * params.softening;
+
+    // Heavy bodies: direct O(H^2) sum (H is ten)
+    heavyAcc.fill(0);
+    for (let a = 0; a < heavyCount; a++) {
+        for (let b = a + 1; b < heavyCount; b++) {
+            const dx = heavyPos[b * 3] - heavyPos[a * 3];
+            const dy = heavyPos[b * 3 + 1] - heavyPos[a * 3 + 1];
+            const dz = heavyPos[b * 3 + 2] - heavyPos[a * 3 + 2];
+            const d2 = dx * dx + dy * dy + dz * dz + eps2;
+            const inv = G / (d2 * Math.sqrt(d2));
+            heavyAcc[a * 3] += dx * inv * heavyMass[b];
+            heavyAcc[a * 3 + 1] += dy * inv * heavyMass[b];
+            heavyAcc[a * 3 + 2] += dz * inv * heavyMass[b];
+            heavyAcc[b * 3] -= dx * inv * heavyMass[a];
+            heavyAcc[b * 3 + 1] -= dy * inv * heavyMass[a];
+            heavyAcc[b * 3 + 2] -= dz * inv * heavyMass[a];
+        }
+    }
+
+    // Small bodies: pulled by every heavy body directly
+    for (let i = 0; i < particleCount; i++) {
+        const x = pos[i * 3], y = pos[i * 3 + 1], z = pos[i * 3 + 2];
+        let ax = 0, ay = 0, az = 0;
+        for (let h = 0; h < heavyCount; h++) {
+            const dx = heavyPos[h * 3] - x;
+            const dy = heavyPos[h * 3 + 1] - y;
+            const dz = heavyPos[h * 3 + 2] - z;
+            const d2 = dx * dx + dy * dy + dz * dz + eps2;
+            const f = G * heavyMass[h] / (d2 * Math.sqrt(d2));
+            ax += dx * f;
+            ay += dy * f;
+            az += dz * f;
+        }
+        acc[i * 3] = ax;
+        acc[i * 3 + 1] = ay;
+        acc[i * 3 + 2] = az;
+    }
+
+    // ...and by each other through the octree. Self-gravity is tiny next to the sun,
+    // so it is refreshed on a slower cadence than the heavy-body forces.
+    if (params.particleMass > 0 && particleCount > 1) {
+        if (stepCount % params.treeInterval === 0) {
+            buildTree();
+            treeForces();
+        }
+        for (let k = 0; k < particleCount * 3; k++) {
+            acc[k] += selfAcc[k];
+        }
+    }
+}
+
+function kick(halfDt) {
+    const firstHeavy = params.pinFirstHeavy ? 1 : 0;
+    for (let k = firstHeavy * 3; k < heavyCount * 3; k++) {
+        heavyVel[k] += heavyAcc[k] * halfDt;
+    }
+    for (let k = 0; k < particleCount * 3; k++) {
+        vel[k] += acc[k] * halfDt;
+    }
+}
+
+function drift(dt) {
+    const firstHeavy = params.pinFirstHeavy ? 1 : 0;
+    for (let k = firstHeavy * 3; k < heavyCount * 3; k++) {
+        heavyPos[k] += heavyVel[k] * dt;
+    }
+    for (let k = 0; k < particleCount * 3; k++) {
+        pos[k] += vel[k] * dt;
+    }
+}
+
+// One kick-drift-kick leapfrog step (accelerations carried over from the last step)
+function step() {
+    const dt = params.dt;
+    kick(dt / 2);
+    drift(dt);
+    computeAccelerations();
+    kick(dt / 2);
+    stepCount++;
+}
+
+self.onmessage = (event) => {
+    const message = event.data;
+
+    if (message.type === 'init') {
+        params = Object.assign(params, message.params);
+
+        heavyCount = message.heavyMass.length;
+        heavyMass = message.heavyMass;
+        heavyPos = message.heavyPositions;
+        heavyVel = message.heavyVelocities;
+        heavyAcc = new Float64Array(heavyCount * 3);
+
+        particleCount = message.positions.length / 3;
+        pos = message.positions;
+        vel = message.velocities;
+        acc = new Float32Array(particleCount * 3);
+        selfAcc = new Float32Array(particleCount * 3);
+        stepCount = 0;
+        nextInLeaf = new Int32Array(particleCount);
+        allocateNodes(Math.max(1024, particleCount * 4));
+
+        computeAccelerations();
+    } else if (message.type === 'params') {
+        params = Object.assign(params, message.params);
+    } else if (message.type === 'step') {
+        const started = performance.now();
+        for (let s = 0; s < message.steps; s++) {
+            step();
+        }
+
+        // Fill the buffer handed over by the main thread and send it straight back.
+        // Layout is interleaved position/velocity/acceleration so the renderer can
+        // extrapolate between (possibly slow) steps.
+        const out = message.buffer;
+        for (let i = 0; i < particleCount; i++) {
+            const o = i * 9;
+            const k = i * 3;
+            out[o] = pos[k];
+            out[o + 1] = pos[k + 1];
+            out[o + 2] = pos[k + 2];
+            out[o + 3] = vel[k];
+            out[o + 4] = vel[k + 1];
+            out[o + 5] = vel[k + 2];
+            out[o + 6] = acc[k];
+            out[o + 7] = acc[k + 1];
+            out[o + 8] = acc[k + 2];
+        }
+        self.postMessage({
+            type: 'state',
+            steps: message.steps,
+            buffer: out,
+            heavyPositions: heavyPos.slice(),
+            heavyVelocities: heavyVel.slice(),
+            heavyAccelerations: heavyAcc.slice(),
+            stepMs: performance.now() - started
+        }, [out.buffer]);
+    }
+};
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Sort a star catalog CSV into sky/magnitude chunks that the scene streams in.
+
+Reads a CSV with cartesian positions (HYG style x, y, z columns) or ra/dec, plus
+apparent magnitude and B-V color index, and writes
+
+    stars/index.json                    chunk list, quantisation, band edges and the
+                                        camera distance at which each band loads
+    stars/<face>-<i>-<j>-<band>.bin     one chunk per sky tile and magnitude band
+
+Only the direction of each star is kept: the scene draws the catalog on a sky sphere
+around the camera. Tiles come from a cube map (6 faces x tiles x tiles) so each chunk
+covers a compact patch of sky; bands let faint stars load only when zoomed in.
+
+Chunk layout (little-endian, struct of arrays):
+    int16[count * 3]  unit direction * 32767
+    uint8[count]      magnitude, (mag - MAG_MIN) / MAG_STEP
+    uint8[count]      color index, (ci - CI_MIN) / CI_STEP
+
+    python3 ingest_stars.py hygdata_v41.csv --tiles 4 --max-mag 11
+
+The page only looks for the catalog when opened with ?stars=1 (or ?stars=<url>/).
+
+Standard library only.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import struct
+
+MAG_MIN, MAG_STEP = -2.0, 1 / 16      # uint8 covers -2 .. 13.9
+CI_MIN, CI_STEP = -0.5, 3.0 / 255     # uint8 covers -0.5 .. 2.5
+DEFAULT_CI = 0.65                     # Sun-like, for rows without a color index
+
+
+def parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def direction_from_row(row, args):
+    """Unit direction in scene axes (y = celestial north), or None."""
+    x, y, z = (parse_float(row.get(c)) for c in (args.x, args.y, args.z))
+    if x is None or y is None or z is None:
+        ra = parse_float(row.get(args.ra))
+        dec = parse_float(row.get(args.dec))
+        if ra is None or dec is None:
+            return None
+        ra = math.radians(ra * 15 if args.ra_hours else ra)
+        dec = math.radians(dec)
+        x, y, z = math.cos(dec) * math.cos(ra), math.cos(dec) * math.sin(ra), math.sin(dec)
+
+    length = math.sqrt(x * x + y * y + z * z)
+    if length == 0:
+        return None  # The Sun itself
+    # Equatorial z (north) becomes scene y
+    return x / length, z / length, -y / length
+
+
+def cube_tile(d, tiles):
+    """Cube face (0-5) and tile coordinates for a unit direction."""
+    ax, ay, az = (abs(c) for c in d)
+    if ax >= ay and ax >= az:
+        face, u, v, m = (0 if d[0] > 0 else 1), d[1], d[2], ax
+    elif ay >= az:
+        face, u, v, m = (2 if d[1] > 0 else 3), d[0], d[2], ay
+    else:
+        face, u, v, m = (4 if d[2] > 0 else 5), d[0], d[1], az
+    i = min(int((u / m + 1) / 2 * tiles), tiles - 1)
+    j = min(int((v / m + 1) / 2 * tiles), tiles - 1)
+    return face, i, j
+
+
+def face_point(face, u, v):
+    axis, sign = divmod(face, 2)
+    major = 1.0 if sign == 0 else -1.0
+    if axis == 0:
+        p = (major, u, v)
+    elif axis == 1:
+        p = (u, major, v)
+    else:
+        p = (u, v, major)
+    length = math.sqrt(sum(c * c for c in p))
+    return tuple(c / length for c in p)
+
+
+def tile_bounds(face, i, j, tiles):
+    """Centre direction and angular radius (radians) of a cube-map tile."""
+    def uv(k):
+        return k / tiles * 2 - 1
+    centre = face_point(face, uv(i + 0.5), uv(j + 0.5))
+    corners = [face_point(face, uv(a), uv(b)) for a in (i, i + 1) for b in (j, j + 1)]
+    radius = max(math.acos(max(-1.0, min(1.0, sum(c * k for c, k in zip(centre, corner)))))
+                 for corner in corners)
+    return centre, radius
+
+
+def quantise(value, minimum, step):
+    return max(0, min(255, int(round((value - minimum) / step))))
+
+
+def band_distances(spec, band_count):
+    """Camera distance at which each band loads; None means always loaded.
+
+    Bands not given in spec default to always for the two brightest and then
+    2000, 1000, 500, ... scene units.
+    """
+    given = [None if d.strip() in ('', 'inf') else float(d) for d in spec.split(',')] if spec else []
+    distances = []
+    for band in range(band_count):
+        if band < len(given):
+            distances.append(given[band])
+        else:
+            distances.append(None if band < 2 else 2000 / 2 ** (band - 2))
+    return distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunk a star catalog for streaming.')
+    parser.add_argument('catalog', help='CSV star catalog (e.g. HYG)')
+    parser.add_argument('--out', default='stars')
+    parser.add_argument('--tiles', type=int, default=4, help='Tiles per cube face edge')
+    parser.add_argument('--bands', default='4,6,8', help='Magnitude band edges')
+    parser.add_argument('--band-distances', default=None,
+                        help='Camera distance at which each band loads, comma separated (inf = always)')
+    parser.add_argument('--max-mag', type=float, default=None, help='Drop stars fainter than this')
+    parser.add_argument('--x', default='x')
+    parser.add_argument('--y', default='y')
+    parser.add_argument('--z', default='z')
+    parser.add_argument('--ra', default='ra')
+    parser.add_argument('--dec', default='dec')
+    parser.add_argument('--ra-hours', action='store_true', help='ra column is in hours (HYG)')
+    parser.add_argument('--mag', default='mag')
+    parser.add_argument('--ci', default='ci')
+    args = parser.parse_args()
+
+    band_edges = [float(b) for b in args.bands.split(',')]
+    distances = band_distances(args.band_distances, len(band_edges) + 1)
+    chunks = {}
+    total = skipped = 0
+
+    with open(args.catalog, newline='') as f:
+        for row in csv.DictReader(f):
+            mag = parse_float(row.get(args.mag))
+            direction = direction_from_row(row, args)
+            if mag is None or direction is None or (args.max_mag is not None and mag > args.max_mag):
+                skipped += 1
+                continue
+            ci = parse_float(row.get(args.ci))
+            band = sum(1 for edge in band_edges if mag >= edge)
+            key = cube_tile(direction, args.tiles) + (band,)
+            chunks.setdefault(key, []).append((direction, mag, DEFAULT_CI if ci is None else ci))
+            total += 1
+
+    os.makedirs(args.out, exist_ok=True)
+    index = []
+    for (face, i, j, band), stars in sorted(chunks.items()):
+        stars.sort(key=lambda s: s[1])  # Brightest first
+        name = f'{face}-{i}-{j}-{band}.bin'
+        with open(os.path.join(args.out, name), 'wb') as f:
+            f.write(b''.join(struct.pack('<3h', *(int(round(c * 32767)) for c in d)) for d, _, _ in stars))
+            f.write(bytes(quantise(mag, MAG_MIN, MAG_STEP) for _, mag, _ in stars))
+            f.write(bytes(quantise(ci, CI_MIN, CI_STEP) for _, _, ci in stars))
+        centre, radius = tile_bounds(face, i, j, args.tiles)
+        index.append({
+            'file': name,
+            'band': band,
+            'count': len(stars),
+            'center': [round(c, 6) for c in centre],
+            'radius': round(radius, 6),
+            'minMag': round(stars[0][1], 2),
+        })
+
+    with open(os.path.join(args.out, 'index.json'), 'w') as f:
+        json.dump({
+            'version': 1,
+            'tiles': args.tiles,
+            'bands': band_edges,
+            'bandDistances': distances,
+            'magnitude': {'min': MAG_MIN, 'step': MAG_STEP},
+            'colorIndex': {'min': CI_MIN, 'step': CI_STEP},
+            'stars': total,
+            'chunks': index,
+        }, f, separators=(',', ':'))
+
+    print(f"Wrote {total} stars in {len(index)} chunks to {args.out}/ ({skipped} rows skipped)")
+
+
+if __name__ == '__main__':
+    main()
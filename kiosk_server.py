@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Authoritative state server for multi-display kiosk mode.
+
+Owns the simulation time, time scale, focused body, camera preset and (while the
+controller is orbiting) the camera pose, and broadcasts compact binary deltas to
+every display at a fixed rate. Displays open the scene with
+
+    ?kiosk=ws://<host>:8766&tile=<col>,<row>&grid=<cols>,<rows>
+
+and one controller with ?kiosk=ws://<host>:8766&role=controller.
+
+    python3 kiosk_server.py --port 8766 --rate 10
+
+Standard library only (asyncio + a minimal RFC 6455 implementation).
+
+Wire format, little-endian, same layout in both directions:
+    u8  type   1 = state (server -> client), 2 = control (controller -> server)
+    u8  mask   which fields follow, in this order:
+               1  simTime    f64 ticks
+               2  timeScale  f32
+               4  focus      i8  planet index, -1 for none
+               8  preset     u8  camera preset index
+               16 camera     6 x f32 position xyz, target xyz
+    u16 seq
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import struct
+import time
+
+STATE, CONTROL = 1, 2
+TIME, SCALE, FOCUS, PRESET, CAMERA = 1, 2, 4, 8, 16
+ALL_FIELDS = TIME | SCALE | FOCUS | PRESET
+TICKS_PER_SECOND = 60
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+MAX_CLIENT_BACKLOG = 64 * 1024  # Drop displays that stop reading
+
+
+class SimulationState:
+    def __init__(self):
+        self.base_time = 0.0
+        self.base_clock = time.monotonic()
+        self.time_scale = 1.0
+        self.focus = -1
+        self.preset = 0
+        self.camera = None
+        self.changed = 0  # Fields to include in the next broadcast besides simTime
+        self.seq = 0
+
+    def sim_time(self):
+        return self.base_time + (time.monotonic() - self.base_clock) * TICKS_PER_SECOND * self.time_scale
+
+    def rebase(self, sim_time=None):
+        now_time = self.sim_time() if sim_time is None else sim_time
+        self.base_clock = time.monotonic()
+        self.base_time = now_time
+
+    def encode(self, mask):
+        mask |= TIME
+        if self.camera is None:
+            mask &= ~CAMERA
+        self.seq = (self.seq + 1) & 0xffff
+        parts = [struct.pack('<BBH', STATE, mask, self.seq), struct.pack('<d', self.sim_time())]
+        if mask & SCALE:
+            parts.append(struct.pack('<f', self.time_scale))
+        if mask & FOCUS:
+            parts.append(struct.pack('<b', self.focus))
+        if mask & PRESET:
+            parts.append(struct.pack('<B', self.preset))
+        if mask & CAMERA:
+            parts.append(struct.pack('<6f', *self.camera))
+        return b''.join(parts)
+
+    def apply_control(self, data):
+        if len(data) < 4:
+            return
+        kind, mask, _seq = struct.unpack_from('<BBH', data, 0)
+        if kind != CONTROL:
+            return
+        offset = 4
+        try:
+            if mask & TIME:
+                (sim_time,) = struct.unpack_from('<d', data, offset)
+                offset += 8
+                self.rebase(sim_time)
+            if mask & SCALE:
+                (scale,) = struct.unpack_from('<f', data, offset)
+                offset += 4
+                self.rebase()
+                self.time_scale = scale
+            if mask & FOCUS:
+                (self.focus,) = struct.unpack_from('<b', data, offset)
+                offset += 1
+            if mask & PRESET:
+                (self.preset,) = struct.unpack_from('<B', data, offset)
+                offset += 1
+                self.camera = None  # The preset flight replaces any streamed pose
+            if mask & CAMERA:
+                self.camera = struct.unpack_from('<6f', data, offset)
+                offset += 24
+        except struct.error:
+            return
+        self.changed |= mask
+
+
+def encode_frame(payload, opcode=0x2):
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack('>H', length)
+    else:
+        header += bytes([127]) + struct.pack('>Q', length)
+    return header + payload
+
+
+async def read_frame(reader):
+    """Return (opcode, payload) for one client frame (clients always mask)."""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0f
+    length = second & 0x7f
+    if length == 126:
+        (length,) = struct.unpack('>H', await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack('>Q', await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else b'\0\0\0\0'
+    payload = bytearray(await reader.readexactly(length))
+    for i in range(length):
+        payload[i] ^= mask[i & 3]
+    return opcode, bytes(payload)
+
+
+async def handshake(reader, writer):
+    request = await reader.readuntil(b'\r\n\r\n')
+    headers = {}
+    for line in request.decode('latin-1').split('\r\n')[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    key = headers.get('sec-websocket-key')
+    if not key:
+        writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+        await writer.drain()
+        return False
+    accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+    writer.write((
+        'HTTP/1.1 101 Switching Protocols\r\n'
+        'Upgrade: websocket\r\n'
+        'Connection: Upgrade\r\n'
+        f'Sec-WebSocket-Accept: {accept}\r\n\r\n'
+    ).encode())
+    await writer.drain()
+    return True
+
+
+class KioskServer:
+    def __init__(self, rate):
+        self.state = SimulationState()
+        self.clients = set()
+        self.interval = 1.0 / rate
+
+    async def handle_client(self, reader, writer):
+        try:
+            if not await handshake(reader, writer):
+                return
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        self.clients.add(writer)
+        peer = writer.get_extra_info('peername')
+        print(f"Client connected: {peer} ({len(self.clients)} total)")
+        writer.write(encode_frame(self.state.encode(ALL_FIELDS | CAMERA)))  # Full state to join
+
+        try:
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 0x8:  # Close
+                    writer.write(encode_frame(b'', 0x8))
+                    break
+                if opcode == 0x9:  # Ping
+                    writer.write(encode_frame(payload, 0xA))
+                elif opcode == 0x2:
+                    self.state.apply_control(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+            print(f"Client disconnected: {peer} ({len(self.clients)} total)")
+
+    async def broadcast_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self.clients:
+                continue
+            frame = encode_frame(self.state.encode(self.state.changed))
+            self.state.changed = 0
+            for writer in list(self.clients):
+                if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                    self.clients.discard(writer)
+                    writer.close()
+                    continue
+                writer.write(frame)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Synchronise kiosk displays over WebSockets.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rate', type=float, default=10, help='State broadcasts per second')
+    args = parser.parse_args()
+
+    kiosk = KioskServer(args.rate)
+    server = await asyncio.start_server(kiosk.handle_client, args.host, args.port)
+    print(f"Kiosk server on ws://{args.host}:{args.port}, broadcasting at {args.rate} Hz")
+    async with server:
+        await asyncio.gather(server.serve_forever(), kiosk.broadcast_loop())
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""NumPy reference for the orbital body kernel (updateBodies in script.js).
+
+Evaluates the same closed-form rules, vectorised over every body, from the initial
+conditions the browser dumps with dumpSimulationState(), and compares positions and
+orientations at fixed simulation times:
+
+    python3 reference_sim.py check simulation-state-42.json
+        browser kernel against this reference, same initial conditions
+
+    python3 reference_sim.py golden simulation-state-42.json --out golden/seed-42.json
+    python3 reference_sim.py compare golden/seed-42.json simulation-state-42.json
+        freeze reference snapshots, then catch changes in initial conditions or motion
+        after later edits (run the browser with the same ?seed=)
+
+    python3 reference_sim.py bench --bodies 2000000 --steps 20
+        throughput baseline on a synthetic store
+
+    python3 -m pytest tests
+        runs check and compare on the committed seed-42 fixture and tests the kernel
+        against known orbital positions
+
+Dump / golden format (JSON): seed, count, labels, columns (bodyStore initial-condition
+columns, positions excluded) and snapshots [{time, positions (n*3), orientations (n*9,
+rotation times scale, column-major 3x3)}].
+
+Requires numpy.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+BODY_FACE_MOTION = 1
+BODY_FACE_PARENT = 2
+BODY_EXTERNAL = 4
+BODY_BOUNCE_LIMIT = 100.0
+FLOAT_COLUMNS = ('orbitRadius', 'eccentricity', 'phase', 'angularSpeed', 'height',
+                 'verticalSpeed', 'wobble', 'spinX', 'spinY', 'spinZ', 'scale')
+
+
+def load_state(path):
+    with open(path) as f:
+        state = json.load(f)
+    if state.get('version') != 1:
+        raise SystemExit(f'{path}: unsupported state version {state.get("version")}')
+    return state
+
+
+def body_columns(state):
+    """Columns as float64 arrays holding the browser's float32 values exactly."""
+    columns = {key: np.asarray(state['columns'][key], dtype=np.float64) for key in FLOAT_COLUMNS}
+    for key in ('parent', 'flags', 'instanceOf'):
+        columns[key] = np.asarray(state['columns'][key], dtype=np.int64)
+    return index_levels(columns)
+
+
+def parent_depth(parent):
+    """Number of ancestors of every body, so one level can be resolved at a time."""
+    depth = np.zeros(len(parent), dtype=np.int64)
+    p = parent.copy()
+    while np.any(p >= 0):
+        has_parent = p >= 0
+        depth += has_parent
+        p = np.where(has_parent, parent[np.maximum(p, 0)], -1)
+    return depth
+
+
+def index_levels(columns):
+    """Precompute the index sets evaluate() works on (most bodies are roots)."""
+    depth = parent_depth(columns['parent'])
+    external = (columns['flags'] & BODY_EXTERNAL) != 0
+    columns['levels'] = [(np.flatnonzero((depth == level) & ~external),
+                          np.flatnonzero((depth == level) & external))
+                         for level in range(int(depth.max(initial=0)) + 1)]
+    columns['wobbling'] = np.flatnonzero((columns['wobble'] != 0) & (depth == 0) & ~external)
+    is_object = columns['instanceOf'] < 0
+    flags = columns['flags']
+    columns['facing'] = np.flatnonzero(is_object & ((flags & BODY_FACE_MOTION) != 0))
+    columns['watching'] = np.flatnonzero(
+        is_object & ((flags & (BODY_FACE_MOTION | BODY_FACE_PARENT)) == BODY_FACE_PARENT))
+    columns['instanced'] = np.flatnonzero(~is_object)
+    columns['orientationScale'] = np.where(is_object, 1.0, columns['scale'])
+    return columns
+
+
+def fold_bounce(u, limit):
+    """Triangle wave folding u into [-limit, limit] (foldBounce)."""
+    period = 4 * limit
+    w = np.mod(u + limit, period)
+    return np.where(w < 2 * limit, w - limit, 3 * limit - w)
+
+
+def euler_xyz(rx, ry, rz, scale):
+    """Column-major 3x3 rotation (Euler XYZ) times scale, shape (n, 9)."""
+    a, b = np.cos(rx), np.sin(rx)
+    c, d = np.cos(ry), np.sin(ry)
+    e, f = np.cos(rz), np.sin(rz)
+    ae, af, be, bf = a * e, a * f, b * e, b * f
+    out = np.empty((len(rx), 9))
+    out[:, 0] = c * e
+    out[:, 1] = af + be * d
+    out[:, 2] = bf - ae * d
+    out[:, 3] = -c * f
+    out[:, 4] = ae - bf * d
+    out[:, 5] = be + af * d
+    out[:, 6] = d
+    out[:, 7] = -b * c
+    out[:, 8] = a * c
+    out *= scale[:, None]
+    return out
+
+
+def look_at(position, target):
+    """Object3D.lookAt for non-camera objects: +z towards the target, y up."""
+    z = target - position
+    z /= np.linalg.norm(z, axis=1, keepdims=True)
+    x = np.cross(np.array([0.0, 1.0, 0.0]), z)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    y = np.cross(z, x)
+    return np.concatenate([x, y, z], axis=1)
+
+
+def evaluate(columns, t, external=None):
+    """Positions (n, 3) float32 and orientations (n, 9) at simulation time t.
+
+    external supplies positions for BODY_EXTERNAL bodies, which another system
+    (gravity mode) writes instead of the kernel.
+    """
+    angle = columns['phase'] + columns['angularSpeed'] * t
+    e = columns['eccentricity']
+    radius = columns['orbitRadius']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(e == 0, radius, radius * (1 - e * e) / (1 + e * np.cos(angle)))
+    vertical = columns['verticalSpeed']
+    unrounded = np.empty((len(angle), 3))
+    unrounded[:, 0] = np.cos(angle) * r
+    unrounded[:, 1] = np.where(vertical == 0, columns['height'],
+                               fold_bounce(columns['height'] + vertical * t, BODY_BOUNCE_LIMIT))
+    unrounded[:, 2] = np.sin(angle) * r
+
+    # Roots in one pass, then children level by level reading the stored (float32)
+    # parent position, in the kernel's order: base + parent, then wobble
+    wobble = columns['wobble']
+    wobbling = columns['wobbling']
+    unrounded[wobbling, 1] += np.sin(angle[wobbling] * 2) * wobble[wobbling]
+    positions = unrounded.astype(np.float32)
+    parent = columns['parent']
+    for level, (inner, outer) in enumerate(columns['levels']):
+        if level > 0 and len(inner):
+            unrounded[inner] += positions[parent[inner]]
+            unrounded[inner, 1] += np.where(wobble[inner] != 0, np.sin(angle[inner] * 2) * wobble[inner], 0.0)
+            positions[inner] = unrounded[inner].astype(np.float32)
+        if len(outer) and external is not None:
+            positions[outer] = external[outer]
+            unrounded[outer] = external[outer]
+
+    # Instanced bodies always use their spin and scale; objects may face their motion or parent
+    rot_x = columns['spinX'] * t
+    rot_z = columns['spinZ'] * t
+    orientations = euler_xyz(rot_x, columns['spinY'] * t, rot_z, columns['orientationScale'])
+    facing = columns['facing']
+    if len(facing):
+        orientations[facing] = euler_xyz(rot_x[facing], angle[facing] + math.pi / 2, rot_z[facing],
+                                         np.ones(len(facing)))
+    watching = columns['watching']
+    if len(watching):
+        orientations[watching] = look_at(unrounded[watching], positions[parent[watching]].astype(np.float64))
+    instanced = columns['instanced']
+    orientations[instanced] = orientations[instanced].astype(np.float32)
+    return positions, orientations
+
+
+def snapshot_arrays(snapshot, count):
+    return (np.asarray(snapshot['positions'], dtype=np.float64).reshape(count, 3),
+            np.asarray(snapshot['orientations'], dtype=np.float64).reshape(count, 9))
+
+
+def reference_snapshots(state, times):
+    """Reference snapshots for the state's initial conditions at the given times."""
+    columns = body_columns(state)
+    dumped = {s['time']: s for s in state.get('snapshots', [])}
+    snapshots = []
+    for t in times:
+        external = snapshot_arrays(dumped[t], state['count'])[0] if t in dumped else None
+        positions, orientations = evaluate(columns, t, external)
+        snapshots.append({
+            'time': t,
+            'positions': positions.astype(np.float64).ravel().tolist(),
+            'orientations': orientations.astype(np.float64).ravel().tolist(),
+        })
+    return snapshots
+
+
+def compare_states(expected, actual, atol, rtol, orientation_atol):
+    """Print a per-time report; return the number of failing bodies."""
+    if expected['count'] != actual['count']:
+        print(f"Body count differs: expected {expected['count']}, got {actual['count']}")
+        return max(expected['count'], actual['count'])
+    count = expected['count']
+    labels = expected['labels']
+    failures = 0
+
+    # Initial conditions first: a changed column explains every later mismatch
+    for key, values in expected['columns'].items():
+        if key not in actual['columns']:
+            print(f"  column {key}: missing")
+            failures += 1
+            continue
+        diff = np.flatnonzero(np.asarray(values) != np.asarray(actual['columns'][key]))
+        if len(diff):
+            names = ', '.join(labels[i] for i in diff[:5]) + (' ...' if len(diff) > 5 else '')
+            print(f"  column {key}: {len(diff)} bodies changed ({names})")
+            failures += len(diff)
+
+    actual_snapshots = {s['time']: s for s in actual['snapshots']}
+    for snapshot in expected['snapshots']:
+        t = snapshot['time']
+        if t not in actual_snapshots:
+            print(f"t={t:>10g}  missing from {actual.get('source', 'dump')}")
+            failures += 1
+            continue
+        want_pos, want_rot = snapshot_arrays(snapshot, count)
+        got_pos, got_rot = snapshot_arrays(actual_snapshots[t], count)
+
+        pos_error = np.abs(got_pos - want_pos).max(axis=1, initial=0)
+        pos_limit = atol + rtol * np.abs(want_pos).max(axis=1, initial=0)
+        rot_error = np.abs(got_rot - want_rot).max(axis=1, initial=0)
+        bad = np.flatnonzero((pos_error > pos_limit) | (rot_error > orientation_atol) |
+                             ~np.isfinite(pos_error) | ~np.isfinite(rot_error))
+        worst = f' ({labels[int(np.argmax(pos_error))]})' if pos_error.max(initial=0) > 0 else ''
+        status = 'ok' if len(bad) == 0 else f'{len(bad)} FAILED'
+        print(f"t={t:>10g}  max position error {pos_error.max(initial=0):.3g}{worst}, "
+              f"max orientation error {rot_error.max(initial=0):.3g}  {status}")
+        for i in bad[:10]:
+            print(f"    {labels[i]} (#{i}): expected {want_pos[i].round(4).tolist()}, got {got_pos[i].round(4).tolist()}")
+        failures += len(bad)
+    return failures
+
+
+def synthetic_columns(n, seed):
+    """A store shaped like the scene's: mostly circular, some eccentric, bobbing or moons."""
+    rng = np.random.default_rng(seed)
+    parent = np.full(n, -1, dtype=np.int64)
+    moons = rng.random(n) < 0.05
+    moons[:min(n, 16)] = False
+    parent[moons] = rng.integers(0, min(n, 16), moons.sum())
+    columns = {
+        'orbitRadius': rng.uniform(40, 1500, n),
+        'eccentricity': np.where(rng.random(n) < 0.01, 0.7, 0.0),
+        'phase': rng.uniform(0, 2 * math.pi, n),
+        'angularSpeed': rng.uniform(0.001, 0.05, n),
+        'height': rng.uniform(-10, 10, n),
+        'verticalSpeed': np.where(rng.random(n) < 0.1, rng.uniform(-0.005, 0.005, n), 0.0),
+        'wobble': np.where(rng.random(n) < 0.01, 100.0, 0.0),
+        'spinX': rng.uniform(-0.01, 0.01, n),
+        'spinY': rng.uniform(-0.01, 0.01, n),
+        'spinZ': rng.uniform(-0.01, 0.01, n),
+        'scale': rng.uniform(0.5, 2, n),
+        'parent': parent,
+        'flags': np.zeros(n, dtype=np.int64),
+        'instanceOf': np.zeros(n, dtype=np.int64),
+    }
+    for key in FLOAT_COLUMNS:
+        columns[key] = columns[key].astype(np.float32).astype(np.float64)
+    return index_levels(columns)
+
+
+def command_check(args):
+    state = load_state(args.dump)
+    reference = dict(state, snapshots=reference_snapshots(state, [s['time'] for s in state['snapshots']]),
+                     source='reference')
+    print(f"Checking {args.dump} (seed {state['seed']}, {state['count']} bodies) against the reference")
+    return compare_states(reference, state, args.atol, args.rtol, args.orientation_atol)
+
+
+def command_golden(args):
+    state = load_state(args.dump)
+    times = [float(t) for t in args.times.split(',')] if args.times else [s['time'] for s in state['snapshots']]
+    golden = {
+        'version': 1,
+        'seed': state['seed'],
+        'count': state['count'],
+        'labels': state['labels'],
+        'columns': state['columns'],
+        'snapshots': reference_snapshots(state, times),
+        'source': 'reference_sim.py',
+    }
+    out = args.out or os.path.join('golden', f"seed-{state['seed']}.json")
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(golden, f, separators=(',', ':'))
+    print(f"Wrote {len(times)} reference snapshots of {state['count']} bodies to {out}")
+    return 0
+
+
+def command_compare(args):
+    golden = load_state(args.golden)
+    state = load_state(args.dump)
+    if golden['seed'] != state['seed']:
+        print(f"Seed differs: golden {golden['seed']}, dump {state['seed']} (open the scene with ?seed={golden['seed']})")
+        return 1
+    print(f"Comparing {args.dump} against {args.golden} ({golden['count']} bodies)")
+    return compare_states(golden, state, args.atol, args.rtol, args.orientation_atol)
+
+
+def command_bench(args):
+    columns = synthetic_columns(args.bodies, args.seed)
+    evaluate(columns, 0.0)  # Warm up allocations
+    start = time.perf_counter()
+    for step in range(args.steps):
+        evaluate(columns, step * 16.0)
+    elapsed = time.perf_counter() - start
+    rate = args.bodies * args.steps / elapsed
+    print(f"{args.bodies} bodies x {args.steps} steps in {elapsed:.2f}s: "
+          f"{rate / 1e6:.1f}M body updates/s ({elapsed / args.steps * 1000:.1f} ms per step)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NumPy reference for the orbital body kernel.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def tolerances(p):
+        p.add_argument('--atol', type=float, default=1e-3, help='Absolute position tolerance (scene units)')
+        p.add_argument('--rtol', type=float, default=1e-6, help='Position tolerance relative to magnitude')
+        p.add_argument('--orientation-atol', type=float, default=1e-4)
+
+    p = sub.add_parser('check', help='Compare a browser dump with the reference')
+    p.add_argument('dump')
+    tolerances(p)
+
+    p = sub.add_parser('golden', help='Write reference snapshots for a dump\'s initial conditions')
+    p.add_argument('dump')
+    p.add_argument('--out', help='Output file (default golden/seed-<seed>.json)')
+    p.add_argument('--times', help='Comma-separated ticks (default: the dump\'s snapshot times)')
+
+    p = sub.add_parser('compare', help='Compare a browser dump with a golden file')
+    p.add_argument('golden')
+    p.add_argument('dump')
+    tolerances(p)
+
+    p = sub.add_parser('bench', help='Throughput on a synthetic body store')
+    p.add_argument('--bodies', type=int, default=1000000)
+    p.add_argument('--steps', type=int, default=20)
+    p.add_argument('--seed', type=int, default=1)
+
+    args = parser.parse_args()
+    handler = {'check': command_check, 'golden': command_golden,
+               'compare': command_compare, 'bench': command_bench}[args.command]
+    sys.exit(1 if handler(args) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@ let stars = [];
 let planets = [];
 let satellites = [];
 let spaceships = [];
-let asteroids = [];
+let asteroidBelt = null;
 let moon = null;
 let comet = null;
 let meteors = [];
@@ -14,11 +14,22 @@ let iss = null;
 let nebulas = [];
 let planetInfoData = {};
 let timeScale = 1;
+const simulationSpeed = { get value() { return timeScale; }, set value(v) { timeScale = v; } }; // Tween target for timeScale
 let wormhole = null;
 let ufos = [];
 let lensFlare = null;
-let tick = 0;
+let atmospheres = null; // One instanced fresnel shell per planet with an atmosphere
+let simTime = 0; // Simulation time in ticks (one tick = one 60 Hz frame at 1x)
 let controls = null;
+let gravity = null; // Active gravity simulation (see enableGravityMode)
+
+// URL options (e.g. ?gravity=1&particles=100000)
+const urlParams = new URLSearchParams(window.location.search);
+
+// Scene randomness comes from one seeded generator so a world can be reproduced (?seed=).
+// The last saved session's seed (see Resume snapshots) replaces it before init builds the world.
+let worldSeed = (parseInt(urlParams.get('seed'), 10) || Math.floor(Math.random() * 4294967296)) >>> 0;
+const worldRandom = seededRandom(worldSeed);
 
 // Motion trails
 let trails = {
@@ -32,7 +43,6 @@ let trails = {
 let cameraDistance = 1200;
 const minDistance = 300;
 const maxDistance = 3000;
-let cameraAnimating = false;
 
 // Camera presets
 const cameraPresets = {
@@ -44,19 +54,258 @@ const cameraPresets = {
     outerPlanets: { position: { x: -1200, y: 800, z: 800 }, target: { x: -1200, y: 0, z: 1200 } }
 };
 
-// Texture loader
-const textureLoader = new THREE.TextureLoader();
+// Texture loaders - decode JPEGs off the main thread via createImageBitmap when available
+const imageLoader = new THREE.ImageLoader();
+const imageBitmapLoader = typeof createImageBitmap !== 'undefined' ? new THREE.ImageBitmapLoader() : null;
+if (imageBitmapLoader) {
+    // Flip during decode, WebGL ignores UNPACK_FLIP_Y for ImageBitmaps
+    imageBitmapLoader.setOptions({ imageOrientation: 'flipY', premultiplyAlpha: 'none' });
+}
+
+// GPU upload budget - decoded images wait here until a frame has room for them
+const textureUploadBudget = 12 * 1024 * 1024; // bytes per frame (one 2k texture + mipmaps)
+const pendingTextureUploads = [];
+const disposedTextures = new WeakSet(); // Released before their image arrived or uploaded
+let pendingAssetLoads = 0; // Requests still downloading or decoding (capture waits for zero)
 
 // Helper function to load textures with high-quality filtering
 function loadTextureWithFiltering(url) {
-    const texture = textureLoader.load(url);
+    // Empty texture until the decoded image is uploaded (renders black, never blocks)
+    const texture = new THREE.Texture();
     texture.anisotropy = renderer.capabilities.getMaxAnisotropy(); // Best quality at angles
     texture.minFilter = THREE.LinearMipmapLinearFilter; // Smooth when zoomed out
     texture.magFilter = THREE.LinearFilter; // Smooth when zoomed in
     texture.generateMipmaps = true; // Enable mipmaps for better LOD
+
+    texture.addEventListener('dispose', () => disposedTextures.add(texture));
+
+    pendingAssetLoads++;
+    const loaded = image => {
+        pendingAssetLoads--;
+        if (disposedTextures.has(texture)) {
+            if (image.close) image.close(); // ImageBitmap
+            return;
+        }
+        queueTextureUpload(texture, image);
+    };
+    const failed = () => {
+        pendingAssetLoads--;
+        console.warn('Texture failed to load:', url);
+    };
+
+    if (imageBitmapLoader) {
+        texture.flipY = false; // Already flipped by createImageBitmap
+        imageBitmapLoader.load(url, loaded, undefined, failed);
+    } else {
+        imageLoader.load(url, loaded, undefined, failed);
+    }
     return texture;
 }
 
+function queueTextureUpload(texture, image) {
+    const mipmapFactor = texture.generateMipmaps ? 4 / 3 : 1;
+    pendingTextureUploads.push({
+        texture: texture,
+        image: image,
+        bytes: Math.ceil(image.width * image.height * 4 * mipmapFactor)
+    });
+}
+
+// Upload decoded textures to the GPU, at most textureUploadBudget bytes per frame
+function processTextureUploads() {
+    let budget = textureUploadBudget;
+
+    while (pendingTextureUploads.length > 0) {
+        const upload = pendingTextureUploads[0];
+        if (disposedTextures.has(upload.texture)) {
+            pendingTextureUploads.shift();
+            if (upload.image.close) upload.image.close();
+            continue; // Uploading now would leave GPU memory nothing frees
+        }
+
+        // Always let one texture through so oversized images still make progress
+        if (upload.bytes > budget && budget < textureUploadBudget) break;
+
+        pendingTextureUploads.shift();
+        upload.texture.image = upload.image;
+        upload.texture.needsUpdate = true;
+        renderer.initTexture(upload.texture); // Upload + mipmaps now, not on first draw
+        budget -= upload.bytes;
+    }
+}
+
+// Resource registry
+// Geometries and materials built from the same parameters are shared, with one reference
+// per mesh using them, and disposed when the last of those meshes is released.
+const resourceRegistry = {
+    entries: new Map(),  // key -> { resource, refs }
+    keys: new Map()      // resource -> key
+};
+
+function acquireResource(key, create) {
+    let entry = resourceRegistry.entries.get(key);
+    if (!entry) {
+        entry = { resource: create(), refs: 0 };
+        resourceRegistry.entries.set(key, entry);
+        resourceRegistry.keys.set(entry.resource, key);
+    }
+    entry.refs++;
+    return entry.resource;
+}
+
+// getGeometry('BoxGeometry', 6, 3, 3) - constructor name plus its arguments
+function getGeometry(type, ...args) {
+    return acquireResource('geometry:' + type + JSON.stringify(args), () => new THREE[type](...args));
+}
+
+// getMaterial('MeshStandardMaterial', { color: 0xcccccc }) - plain parameters only, no textures
+function getMaterial(type, params) {
+    return acquireResource('material:' + type + JSON.stringify(params), () => new THREE[type](params));
+}
+
+// getTexture('textures/2k_mars.jpg') - loaded once per URL; each material using it holds a reference
+function getTexture(url) {
+    return acquireResource('texture:' + url, () => loadTextureWithFiltering(url));
+}
+
+// Drop one reference; shared resources are disposed with their last user, others immediately
+function releaseResource(resource) {
+    const key = resourceRegistry.keys.get(resource);
+    if (key === undefined) {
+        disposeResource(resource);
+        return;
+    }
+
+    const entry = resourceRegistry.entries.get(key);
+    entry.refs--;
+    if (entry.refs <= 0) {
+        resourceRegistry.entries.delete(key);
+        resourceRegistry.keys.delete(resource);
+        disposeResource(resource);
+    }
+}
+
+// A disposed material hands back the textures it holds
+function disposeResource(resource) {
+    if (resource.isMaterial) {
+        disposeShadingVariants(resource);
+        materialTextures(resource).forEach(releaseResource);
+    }
+    resource.dispose();
+}
+
+// Textures referenced by a material's own properties or its shader uniforms
+function materialTextures(material) {
+    const textures = new Set();
+    const collect = value => {
+        if (value && value.isTexture) textures.add(value);
+    };
+    Object.keys(material).forEach(name => collect(material[name]));
+    if (material.uniforms) {
+        Object.keys(material.uniforms).forEach(name => collect(material.uniforms[name].value));
+    }
+    return textures;
+}
+
+// Remove an entity from the scene and release everything its meshes hold
+function disposeObject(object) {
+    if (object.parent) object.parent.remove(object);
+
+    object.traverse(child => {
+        if (lightingState.sources.has(child)) {
+            child.material = lightingState.sources.get(child); // Release the shared original
+            lightingState.sources.delete(child);
+        }
+        if (child.geometry) releaseResource(child.geometry);
+        if (child.material) {
+            const materials = Array.isArray(child.material) ? child.material : [child.material];
+            materials.forEach(releaseResource);
+        }
+    });
+}
+
+// Debug: compare GPU-side counts with what the scene still references.
+// More GPU geometries or textures than live ones means something was removed without disposeObject.
+function resourceReport() {
+    const liveGeometries = new Set();
+    const liveTextures = new Set();
+
+    scene.traverse(child => {
+        if (child.geometry) liveGeometries.add(child.geometry);
+        if (!child.material) return;
+        const materials = Array.isArray(child.material) ? child.material : [child.material];
+        materials.forEach(material => {
+            materialTextures(material).forEach(texture => liveTextures.add(texture));
+        });
+    });
+
+    let sharedRefs = 0;
+    resourceRegistry.entries.forEach(entry => sharedRefs += entry.refs);
+
+    const memory = renderer.info.memory;
+    return {
+        gpuGeometries: memory.geometries,
+        liveGeometries: liveGeometries.size,
+        gpuTextures: memory.textures,
+        liveTextures: liveTextures.size,
+        programs: renderer.info.programs ? renderer.info.programs.length : 0,
+        sharedResources: resourceRegistry.entries.size,
+        sharedReferences: sharedRefs
+    };
+}
+
+function reportResourceLeaks() {
+    const report = resourceReport();
+    console.table(report);
+
+    if (report.gpuGeometries > report.liveGeometries) {
+        console.warn(`${report.gpuGeometries - report.liveGeometries} geometries on the GPU are no longer in the scene`);
+    }
+    if (report.gpuTextures > report.liveTextures) {
+        console.warn(`${report.gpuTextures - report.liveTextures} textures on the GPU are no longer referenced`);
+    }
+    return report;
+}
+
+// Debug overlay
+// ?debug=1 (or D to toggle) shows the resource counts above and the lighting profile's
+// cost, refreshed once a second, instead of having to call reportResourceLeaks() and
+// reportLightingCost() from the console.
+const debugOverlay = {
+    element: document.getElementById('debug-overlay'),
+    visible: false,
+    lastSecond: 0
+};
+
+function toggleDebugOverlay() {
+    debugOverlay.visible = !debugOverlay.visible;
+    debugOverlay.lastSecond = 0; // Refresh on the next frame
+    debugOverlay.element.classList.toggle('hidden', !debugOverlay.visible);
+}
+
+// Called every frame; does work once per second while visible
+function updateDebugOverlay() {
+    if (!debugOverlay.visible) return;
+    const second = Math.floor(Date.now() / 1000);
+    if (second === debugOverlay.lastSecond) return;
+    debugOverlay.lastSecond = second;
+
+    const resources = resourceReport();
+    const lighting = lightingReport();
+    const lines = [
+        `geometries  ${resources.liveGeometries} live / ${resources.gpuGeometries} on GPU`,
+        `textures    ${resources.liveTextures} live / ${resources.gpuTextures} on GPU`,
+        `programs    ${resources.programs}`,
+        `shared      ${resources.sharedResources} resources, ${resources.sharedReferences} references`,
+        `lighting    ${lighting.profile} (L), ~${lighting.fragmentCost} standard-fragment equivalents`
+    ];
+    Object.keys(lighting.tiers).forEach(tier => {
+        const entry = lighting.tiers[tier];
+        if (entry.meshes) lines.push(`  ${tier.padEnd(9)} ${entry.meshes} meshes, ${entry.instances} instances, cost ${entry.cost}`);
+    });
+    debugOverlay.element.textContent = lines.join('\n');
+}
+
 // Planet texture URLs (local files)
 const planetTextures = {
     sun: 'textures/2k_sun.jpg',
@@ -73,6 +322,389 @@ const planetTextures = {
     moon: 'textures/2k_moon.jpg'
 };
 
+// Simulation clock
+// Everything on the timeline is a closed-form function of simTime, so jumping to any
+// time costs one pass over the bodies and nothing drifts over long sessions.
+const frameClock = new THREE.Clock();
+const maxFrameTicks = 4; // Cap after stalls (tab switches) so the scene doesn't lurch
+const ticksPerYear = 2 * Math.PI / 0.01; // One Earth orbit
+
+// Deterministic hash -> [0, 1) random generator (mulberry32)
+// The generator's position is its `state` property, so a stream can be saved and resumed.
+function seededRandom(seed) {
+    const random = function () {
+        random.state = (random.state + 0x6D2B79F5) >>> 0;
+        let t = random.state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+    random.state = seed >>> 0;
+    return random;
+}
+
+// Triangle wave folding an unbounded coordinate into [-limit, limit] (a bounce)
+function foldBounce(u, limit) {
+    const period = 4 * limit;
+    const w = ((u + limit) % period + period) % period;
+    return w < 2 * limit ? w - limit : 3 * limit - w;
+}
+
+// Orbiting body store (struct-of-arrays)
+// Every circular/conic orbiter lives in these typed-array columns and is evaluated by
+// one kernel (updateBodies) instead of per-category userData loops. The columns hold
+// initial conditions (phase, height at simTime 0) plus the resolved world positions.
+const BODY_FACE_MOTION = 1; // rotation.y follows the orbit heading
+const BODY_FACE_PARENT = 2; // look at the parent body (ISS)
+const BODY_EXTERNAL = 4;    // position written by another system (gravity mode)
+const bodyBounceLimit = 100; // vertical drift bounds for bobbing bodies
+
+const bodyStore = {
+    count: 0,
+    capacity: 0,
+    objects: [],         // Object3D driven by the kernel (null for instanced bodies)
+    instancedMeshes: [], // InstancedMesh targets referenced by instanceOf
+    columns: {
+        orbitRadius: Float32Array,
+        eccentricity: Float32Array,
+        phase: Float32Array,
+        angularSpeed: Float32Array,
+        parent: Int32Array,
+        height: Float32Array,
+        verticalSpeed: Float32Array,
+        wobble: Float32Array,
+        spinX: Float32Array,
+        spinY: Float32Array,
+        spinZ: Float32Array,
+        scale: Float32Array,
+        flags: Uint8Array,
+        instanceOf: Int32Array,
+        instanceId: Int32Array,
+        posX: Float32Array,
+        posY: Float32Array,
+        posZ: Float32Array
+    }
+};
+
+function growBodyStore(capacity) {
+    Object.keys(bodyStore.columns).forEach(key => {
+        const column = bodyStore[key];
+        const grown = new bodyStore.columns[key](capacity);
+        if (column) grown.set(column.subarray(0, bodyStore.count));
+        bodyStore[key] = grown;
+    });
+    bodyStore.capacity = capacity;
+}
+growBodyStore(1024);
+
+// Register an orbiting body and return its store index.
+// Parents must be added before their children so one forward pass resolves them.
+function addBody(object, config) {
+    if (bodyStore.count === bodyStore.capacity) {
+        growBodyStore(bodyStore.capacity * 2);
+    }
+
+    const i = bodyStore.count++;
+    const spin = config.spin || { x: 0, y: 0, z: 0 };
+
+    bodyStore.objects[i] = object;
+    bodyStore.orbitRadius[i] = config.radius;
+    bodyStore.eccentricity[i] = config.eccentricity || 0;
+    bodyStore.phase[i] = config.phase || 0;
+    bodyStore.angularSpeed[i] = config.speed;
+    bodyStore.parent[i] = config.parent === undefined ? -1 : config.parent;
+    bodyStore.height[i] = config.height || 0;
+    bodyStore.verticalSpeed[i] = config.verticalSpeed || 0;
+    bodyStore.wobble[i] = config.wobble || 0;
+    bodyStore.spinX[i] = spin.x;
+    bodyStore.spinY[i] = spin.y;
+    bodyStore.spinZ[i] = spin.z;
+    bodyStore.scale[i] = config.scale || 1;
+    bodyStore.flags[i] = config.flags || 0;
+    bodyStore.instanceOf[i] = -1;
+    bodyStore.instanceId[i] = -1;
+
+    if (config.instancedMesh) {
+        let meshIndex = bodyStore.instancedMeshes.indexOf(config.instancedMesh);
+        if (meshIndex === -1) {
+            meshIndex = bodyStore.instancedMeshes.push(config.instancedMesh) - 1;
+        }
+        bodyStore.instanceOf[i] = meshIndex;
+        bodyStore.instanceId[i] = config.instanceId;
+    }
+
+    if (object) {
+        object.userData.bodyIndex = i;
+    }
+    return i;
+}
+
+// Write a TRS matrix (Euler XYZ, uniform scale) straight into an instanceMatrix array
+function writeInstanceMatrix(te, offset, x, y, z, rx, ry, rz, s) {
+    const a = Math.cos(rx), b = Math.sin(rx);
+    const c = Math.cos(ry), d = Math.sin(ry);
+    const e = Math.cos(rz), f = Math.sin(rz);
+    const ae = a * e, af = a * f, be = b * e, bf = b * f;
+
+    te[offset] = c * e * s;
+    te[offset + 1] = (af + be * d) * s;
+    te[offset + 2] = (bf - ae * d) * s;
+    te[offset + 3] = 0;
+    te[offset + 4] = -c * f * s;
+    te[offset + 5] = (ae - bf * d) * s;
+    te[offset + 6] = (be + af * d) * s;
+    te[offset + 7] = 0;
+    te[offset + 8] = d * s;
+    te[offset + 9] = -b * c * s;
+    te[offset + 10] = a * c * s;
+    te[offset + 11] = 0;
+    te[offset + 12] = x;
+    te[offset + 13] = y;
+    te[offset + 14] = z;
+    te[offset + 15] = 1;
+}
+
+// Batched update kernel: evaluate every orbiting body at simulation time `time`
+function updateBodies(time) {
+    const n = bodyStore.count;
+    const {
+        objects, instancedMeshes, orbitRadius, eccentricity, phase, angularSpeed, parent,
+        height, verticalSpeed, wobble, spinX, spinY, spinZ, scale,
+        flags, instanceOf, instanceId, posX, posY, posZ
+    } = bodyStore;
+
+    for (let i = 0; i < n; i++) {
+        const angle = phase[i] + angularSpeed[i] * time;
+        const rotX = spinX[i] * time;
+        const rotY = spinY[i] * time;
+        const rotZ = spinZ[i] * time;
+
+        const p = parent[i];
+        let x, y, z;
+        if (flags[i] & BODY_EXTERNAL) {
+            x = posX[i];
+            y = posY[i];
+            z = posZ[i];
+        } else {
+            // Conic section around the parent (eccentricity 0 is a circle)
+            const e = eccentricity[i];
+            const r = e === 0 ? orbitRadius[i] : orbitRadius[i] * (1 - e * e) / (1 + e * Math.cos(angle));
+            x = Math.cos(angle) * r;
+            y = verticalSpeed[i] === 0 ? height[i] : foldBounce(height[i] + verticalSpeed[i] * time, bodyBounceLimit);
+            z = Math.sin(angle) * r;
+            if (p >= 0) {
+                x += posX[p];
+                y += posY[p];
+                z += posZ[p];
+            }
+            if (wobble[i] !== 0) {
+                y += Math.sin(angle * 2) * wobble[i];
+            }
+            posX[i] = x;
+            posY[i] = y;
+            posZ[i] = z;
+        }
+
+        const object = objects[i];
+        if (object) {
+            object.position.set(x, y, z);
+            if (flags[i] & BODY_FACE_MOTION) {
+                object.rotation.set(rotX, angle + Math.PI / 2, rotZ);
+            } else if (flags[i] & BODY_FACE_PARENT) {
+                object.lookAt(posX[p], posY[p], posZ[p]);
+            } else {
+                object.rotation.set(rotX, rotY, rotZ);
+            }
+        } else if (instanceOf[i] >= 0) {
+            const matrices = instancedMeshes[instanceOf[i]].instanceMatrix.array;
+            writeInstanceMatrix(matrices, instanceId[i] * 16, x, y, z, rotX, rotY, rotZ, scale[i]);
+        }
+    }
+
+    for (let m = 0; m < instancedMeshes.length; m++) {
+        instancedMeshes[m].instanceMatrix.needsUpdate = true;
+    }
+}
+
+// Spatial hash grid
+// Uniform grid hashed into a fixed bucket table. Entries are linked into their bucket
+// and only relinked when they cross a cell boundary, so a rebuild is O(moved).
+const SPATIAL_BODY = 1;      // Sun, planets, moon - things meteors can hit
+const SPATIAL_CRAFT = 2;     // Satellites, spaceships, ISS, comet
+const SPATIAL_METEOR = 4;
+const SPATIAL_UFO = 8;
+const SPATIAL_WORMHOLE = 16;
+const SPATIAL_ANY = 0xff;
+
+const spatialGrid = {
+    cellSize: 100,
+    tableSize: 4096, // Power of two
+    capacity: 0,
+    objects: [],
+    freeIds: [],
+    maxRadius: 0,
+    stamp: 0,
+    head: new Int32Array(4096).fill(-1),
+    columns: {
+        kind: Uint8Array,
+        radius: Float32Array,
+        x: Float32Array,
+        y: Float32Array,
+        z: Float32Array,
+        bucket: Int32Array,
+        next: Int32Array,
+        prev: Int32Array,
+        queryStamp: Uint32Array
+    }
+};
+
+function growSpatialGrid(capacity) {
+    Object.keys(spatialGrid.columns).forEach(key => {
+        const column = spatialGrid[key];
+        const grown = new spatialGrid.columns[key](capacity);
+        if (column) grown.set(column);
+        spatialGrid[key] = grown;
+    });
+    for (let id = capacity - 1; id >= spatialGrid.capacity; id--) {
+        spatialGrid.kind[id] = 0;
+        spatialGrid.bucket[id] = -1;
+        spatialGrid.freeIds.push(id);
+    }
+    spatialGrid.capacity = capacity;
+}
+growSpatialGrid(256);
+
+function spatialBucket(cx, cy, cz) {
+    // Large primes hash (Teschner et al.), masked to the table size
+    return ((Math.imul(cx, 73856093) ^ Math.imul(cy, 19349663) ^ Math.imul(cz, 83492791)) >>> 0) & (spatialGrid.tableSize - 1);
+}
+
+function spatialCell(value) {
+    return Math.floor(value / spatialGrid.cellSize);
+}
+
+function linkSpatialEntry(id, bucket) {
+    const grid = spatialGrid;
+    grid.bucket[id] = bucket;
+    grid.prev[id] = -1;
+    grid.next[id] = grid.head[bucket];
+    if (grid.head[bucket] !== -1) grid.prev[grid.head[bucket]] = id;
+    grid.head[bucket] = id;
+}
+
+function unlinkSpatialEntry(id) {
+    const grid = spatialGrid;
+    const bucket = grid.bucket[id];
+    if (bucket === -1) return;
+    if (grid.prev[id] !== -1) grid.next[grid.prev[id]] = grid.next[id];
+    else grid.head[bucket] = grid.next[id];
+    if (grid.next[id] !== -1) grid.prev[grid.next[id]] = grid.prev[id];
+    grid.bucket[id] = -1;
+}
+
+// Track an object in the grid; its world position is sampled by updateSpatialGrid
+function addSpatialEntry(object, kind, radius) {
+    if (spatialGrid.freeIds.length === 0) {
+        growSpatialGrid(spatialGrid.capacity * 2);
+    }
+
+    const id = spatialGrid.freeIds.pop();
+    spatialGrid.objects[id] = object;
+    spatialGrid.kind[id] = kind;
+    spatialGrid.radius[id] = radius;
+    spatialGrid.maxRadius = Math.max(spatialGrid.maxRadius, radius);
+    spatialGrid.queryStamp[id] = 0;
+    object.userData.spatialId = id;
+
+    const p = object.position;
+    spatialGrid.x[id] = p.x;
+    spatialGrid.y[id] = p.y;
+    spatialGrid.z[id] = p.z;
+    linkSpatialEntry(id, spatialBucket(spatialCell(p.x), spatialCell(p.y), spatialCell(p.z)));
+    return id;
+}
+
+function removeSpatialEntry(id) {
+    unlinkSpatialEntry(id);
+    spatialGrid.objects[id] = null;
+    spatialGrid.kind[id] = 0;
+    spatialGrid.freeIds.push(id);
+}
+
+// Incremental rebuild: sample positions, relink only entries that changed bucket
+function updateSpatialGrid() {
+    const grid = spatialGrid;
+    for (let id = 0; id < grid.capacity; id++) {
+        if (grid.kind[id] === 0) continue;
+
+        const p = grid.objects[id].position;
+        grid.x[id] = p.x;
+        grid.y[id] = p.y;
+        grid.z[id] = p.z;
+
+        const bucket = spatialBucket(spatialCell(p.x), spatialCell(p.y), spatialCell(p.z));
+        if (bucket !== grid.bucket[id]) {
+            unlinkSpatialEntry(id);
+            linkSpatialEntry(id, bucket);
+        }
+    }
+}
+
+// Collect ids whose bounding spheres overlap the query sphere into out (returns count)
+function querySpatialRadius(x, y, z, radius, kindMask, out) {
+    const grid = spatialGrid;
+    const reach = radius + grid.maxRadius; // Entries are binned by centre only
+    const minX = spatialCell(x - reach), maxX = spatialCell(x + reach);
+    const minY = spatialCell(y - reach), maxY = spatialCell(y + reach);
+    const minZ = spatialCell(z - reach), maxZ = spatialCell(z + reach);
+    const stamp = ++grid.stamp; // Hash collisions can visit a bucket twice
+    let count = 0;
+
+    for (let cx = minX; cx <= maxX; cx++) {
+        for (let cy = minY; cy <= maxY; cy++) {
+            for (let cz = minZ; cz <= maxZ; cz++) {
+                for (let id = grid.head[spatialBucket(cx, cy, cz)]; id !== -1; id = grid.next[id]) {
+                    if (grid.queryStamp[id] === stamp || !(grid.kind[id] & kindMask)) continue;
+                    grid.queryStamp[id] = stamp;
+
+                    const dx = grid.x[id] - x, dy = grid.y[id] - y, dz = grid.z[id] - z;
+                    const limit = radius + grid.radius[id];
+                    if (dx * dx + dy * dy + dz * dz <= limit * limit) {
+                        out[count++] = id;
+                    }
+                }
+            }
+        }
+    }
+    return count;
+}
+
+// Nearest entry (centre distance) within maxDistance, or -1. Grows the search sphere
+// from one cell outward so typical queries only touch a handful of buckets.
+const spatialQueryResults = [];
+function querySpatialNearest(x, y, z, maxDistance, kindMask, excludeId) {
+    const grid = spatialGrid;
+    let radius = Math.min(grid.cellSize, maxDistance);
+
+    for (;;) {
+        const count = querySpatialRadius(x, y, z, radius, kindMask, spatialQueryResults);
+        let best = -1;
+        let bestDistSq = radius * radius;
+        for (let k = 0; k < count; k++) {
+            const id = spatialQueryResults[k];
+            if (id === excludeId) continue;
+            const dx = grid.x[id] - x, dy = grid.y[id] - y, dz = grid.z[id] - z;
+            const distSq = dx * dx + dy * dy + dz * dz;
+            if (distSq <= bestDistSq) {
+                best = id;
+                bestDistSq = distSq;
+            }
+        }
+        if (best !== -1 || radius >= maxDistance) return best;
+        radius = Math.min(radius * 2, maxDistance);
+    }
+}
+
 // Initialize Three.js
 function init() {
     // Scene
@@ -96,6 +728,9 @@ function init() {
     });
     renderer.setSize(window.innerWidth, window.innerHeight);
     renderer.setPixelRatio(window.devicePixelRatio);
+    if (captureSettings.enabled) {
+        startCapture();
+    }
 
     // OrbitControls for interactive camera movement (must be after renderer)
     controls = new THREE.OrbitControls(camera, renderer.domElement);
@@ -107,6 +742,7 @@ function init() {
     controls.panSpeed = 1.0;
     controls.rotateSpeed = 0.5;
     controls.target.set(0, 0, 0);
+    controls.addEventListener('start', cancelCameraTweens); // Dragging interrupts preset flights
 
     // Enhanced Lighting System
     // Ambient light (subtle base lighting)
@@ -136,7 +772,9 @@ function init() {
     createSun();
 
     // Create planets
+    loadLabelAtlas();
     createPlanets();
+    createAtmospheres();
 
     // Create satellites
     createSatellites();
@@ -150,6 +788,11 @@ function init() {
     // Create Earth's moon
     createMoon();
 
+    // Create satellite constellations around Earth
+    if (urlParams.get('constellations') !== '0') {
+        createConstellations();
+    }
+
     // Create comet
     createComet();
 
@@ -177,6 +820,9 @@ function init() {
     // Init Controls
     initControls();
 
+    // Register everything that takes part in proximity queries
+    initSpatialGrid();
+
     // Initialize motion trails
     trails.iss.line = createTrail(0x88ccff, trails.iss.maxPoints);
     trails.comet.line = createTrail(0x00ffff, trails.comet.maxPoints);
@@ -194,6 +840,31 @@ function init() {
     window.addEventListener('resize', onWindowResize);
     window.addEventListener('click', onPlanetClick);
     window.addEventListener('keydown', onKeyDown);
+    document.addEventListener('meteorimpact', onMeteorImpact);
+    document.addEventListener('wormholeapproach', onWormholeApproach);
+
+    // Optional gravity simulation mode
+    if (urlParams.get('gravity') === '1') {
+        enableGravityMode();
+    }
+
+    if (urlParams.get('debug') === '1') {
+        toggleDebugOverlay();
+    }
+
+    // Cheaper shading for small bodies (after everything that uses standard materials exists)
+    setLightingProfile(lightingState.profile);
+
+    // World clock panel
+    initClocks();
+
+    // Resume where the last session left off, then keep the record current
+    startSnapshots();
+
+    // Optional display-wall synchronisation
+    if (kioskSettings.url) {
+        startKiosk();
+    }
 
     // Start animation
     animate();
@@ -206,9 +877,9 @@ function createStarfield() {
     const positions = new Float32Array(starCount * 3);
 
     for (let i = 0; i < starCount * 3; i += 3) {
-        positions[i] = (Math.random() - 0.5) * 4000;
-        positions[i + 1] = (Math.random() - 0.5) * 4000;
-        positions[i + 2] = (Math.random() - 0.5) * 4000;
+        positions[i] = (worldRandom() - 0.5) * 4000;
+        positions[i + 1] = (worldRandom() - 0.5) * 4000;
+        positions[i + 2] = (worldRandom() - 0.5) * 4000;
     }
 
     starGeometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
@@ -220,23 +891,259 @@ function createStarfield() {
     });
 
     const starField = new THREE.Points(starGeometry, starMaterial);
+    starField.userData.base = positions.slice();             // Positions at zero drift
+    starField.userData.cycles = new Int32Array(starCount);   // Wraps each star has made
     scene.add(starField);
     stars.push(starField);
+
+    // Swap in the real sky if a catalog has been ingested
+    if (starCatalogUrl) {
+        loadStarCatalog();
+    }
+}
+
+// Stars drift upward (towards the camera) at 2 units per real-time tick and wrap from
+// the top of the field back to the bottom, respawning at a new x/z. The drift is
+// closed-form in starDrift, so a resume snapshot only needs that one number; each
+// wrap's x/z is hashed from the world seed, the star and the wrap count.
+let starDrift = 0;
+
+function updateStarDrift() {
+    const field = stars[0];
+    const positions = field.geometry.attributes.position.array;
+    const { base, cycles } = field.userData;
+
+    for (let s = 0; s < cycles.length; s++) {
+        const i = s * 3;
+        const travelled = base[i + 1] + 2000 + starDrift * 2;
+        const cycle = Math.floor(travelled / 4000);
+        positions[i + 1] = travelled - cycle * 4000 - 2000;
+
+        if (cycle !== cycles[s]) {
+            cycles[s] = cycle;
+            if (cycle === 0) {
+                positions[i] = base[i];
+                positions[i + 2] = base[i + 2];
+            } else {
+                const random = seededRandom(worldSeed ^ Math.imul(s + 1, 0x9E3779B1) ^ Math.imul(cycle, 0x85EBCA77));
+                positions[i] = (random() - 0.5) * 4000;
+                positions[i + 2] = (random() - 0.5) * 4000;
+            }
+        }
+    }
+
+    field.geometry.attributes.position.needsUpdate = true;
+}
+
+// Star catalog streaming
+// With ?stars=1 (stars/) or ?stars=<url>/, the catalog written by ingest_stars.py
+// replaces the procedural field. Chunks are sky tiles split by magnitude band; only
+// tiles inside the camera's view cone, and faint bands only when zoomed in, are
+// fetched and kept on the GPU. Without the parameter nothing is requested.
+const starCatalogSetting = urlParams.get('stars');
+const starCatalogUrl = starCatalogSetting === '1' ? 'stars/' : starCatalogSetting;
+const starSkyRadius = 4000;                              // Sky sphere radius around the camera
+const starChunkLinger = 3000;                            // ms an unwanted chunk stays resident
+const starMaxFetches = 4;
+const starRetryDelay = 2000;                             // ms before refetching a failed chunk, doubled per failure
+const starRetryMaxDelay = 60000;
+const starCatalog = {
+    index: null,
+    bandDistances: null,  // Camera distance at which each band loads
+    group: null,
+    material: null,
+    resident: new Map(),  // file -> { points, lastWanted } (points null while fetching)
+    failed: new Map(),    // file -> { failures, retryAt }
+    fetching: 0
+};
+const starForward = new THREE.Vector3();
+
+function loadStarCatalog() {
+    pendingAssetLoads++;
+    fetch(starCatalogUrl + 'index.json')
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.json();
+        })
+        .then(index => {
+            starCatalog.index = index;
+            starCatalog.bandDistances = starBandDistances(index);
+            starCatalog.group = new THREE.Group();
+            starCatalog.material = createStarCatalogMaterial(index);
+            scene.add(starCatalog.group);
+
+            // The catalog replaces the procedural field
+            stars.forEach(disposeObject);
+            stars.length = 0;
+        })
+        .catch(error => console.warn('Star catalog unavailable, keeping the procedural stars:', error))
+        .finally(() => pendingAssetLoads--);
+}
+
+// From the index (null = always loaded); older indexes without distances get the
+// ingest defaults: the two brightest bands always, then 2000, 1000, 500, ...
+function starBandDistances(index) {
+    const given = index.bandDistances || [];
+    const distances = [];
+    for (let band = 0; band <= index.bands.length; band++) {
+        const distance = band < given.length ? given[band] : (band < 2 ? null : 2000 / Math.pow(2, band - 2));
+        distances.push(distance === null ? Infinity : distance);
+    }
+    return distances;
+}
+
+function createStarCatalogMaterial(index) {
+    return new THREE.ShaderMaterial({
+        uniforms: {
+            skyRadius: { value: starSkyRadius },
+            magnitudeMin: { value: index.magnitude.min },
+            magnitudeRange: { value: index.magnitude.step * 255 },
+            colorIndexMin: { value: index.colorIndex.min },
+            colorIndexRange: { value: index.colorIndex.step * 255 },
+            pixelRatio: { value: renderer.getPixelRatio() }
+        },
+        vertexShader: `
+            attribute float magnitude;   // Normalised uint8
+            attribute float colorIndex;  // Normalised uint8
+            uniform float skyRadius;
+            uniform float magnitudeMin;
+            uniform float magnitudeRange;
+            uniform float colorIndexMin;
+            uniform float colorIndexRange;
+            uniform float pixelRatio;
+            varying vec3 vColor;
+            varying float vAlpha;
+
+            void main() {
+                float mag = magnitudeMin + magnitude * magnitudeRange;
+                float bv = colorIndexMin + colorIndex * colorIndexRange;
+
+                // Apparent brightness from magnitude: bright stars are bigger, faint ones dimmer
+                float brightness = pow(10.0, -0.1 * mag); // Fourth root of the flux
+                gl_PointSize = clamp(10.0 * brightness, 1.0, 8.0) * pixelRatio;
+                vAlpha = clamp(4.0 * brightness, 0.15, 1.0);
+
+                // B-V color index: blue-white hot stars through yellow to red
+                vec3 hot = vec3(0.62, 0.72, 1.0);
+                vec3 mid = vec3(1.0, 0.96, 0.88);
+                vec3 cool = vec3(1.0, 0.62, 0.38);
+                vColor = bv < 0.6 ? mix(hot, mid, clamp(bv + 0.4, 0.0, 1.0)) : mix(mid, cool, clamp((bv - 0.6) / 1.4, 0.0, 1.0));
+
+                gl_Position = projectionMatrix * modelViewMatrix * vec4(normalize(position) * skyRadius, 1.0);
+            }
+        `,
+        fragmentShader: `
+            varying vec3 vColor;
+            varying float vAlpha;
+
+            void main() {
+                float falloff = 1.0 - smoothstep(0.2, 0.5, length(gl_PointCoord - 0.5));
+                gl_FragColor = vec4(vColor, vAlpha * falloff);
+            }
+        `,
+        transparent: true,
+        depthWrite: false
+    });
+}
+
+function loadStarChunk(chunk) {
+    const entry = { points: null, lastWanted: performance.now() };
+    starCatalog.resident.set(chunk.file, entry);
+    starCatalog.fetching++;
+    pendingAssetLoads++;
+
+    fetch(starCatalogUrl + chunk.file)
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.arrayBuffer();
+        })
+        .then(buffer => {
+            // Unloaded while in flight
+            if (starCatalog.resident.get(chunk.file) !== entry) return;
+            starCatalog.failed.delete(chunk.file);
+
+            const count = chunk.count;
+            const geometry = new THREE.BufferGeometry();
+            geometry.setAttribute('position', new THREE.BufferAttribute(new Int16Array(buffer, 0, count * 3), 3, true));
+            geometry.setAttribute('magnitude', new THREE.BufferAttribute(new Uint8Array(buffer, count * 6, count), 1, true));
+            geometry.setAttribute('colorIndex', new THREE.BufferAttribute(new Uint8Array(buffer, count * 7, count), 1, true));
+
+            entry.points = new THREE.Points(geometry, starCatalog.material);
+            entry.points.frustumCulled = false; // Positions are scaled onto the sky sphere in the shader
+            starCatalog.group.add(entry.points);
+        })
+        .catch(error => {
+            // Back off instead of refetching a missing or bad chunk every frame
+            const failed = starCatalog.failed.get(chunk.file) || { failures: 0, retryAt: 0 };
+            failed.failures++;
+            failed.retryAt = performance.now() + Math.min(starRetryDelay * Math.pow(2, failed.failures - 1), starRetryMaxDelay);
+            starCatalog.failed.set(chunk.file, failed);
+            if (failed.failures === 1) console.warn('Star chunk failed to load:', chunk.file, error);
+            if (starCatalog.resident.get(chunk.file) === entry) starCatalog.resident.delete(chunk.file);
+        })
+        .finally(() => {
+            starCatalog.fetching--;
+            pendingAssetLoads--;
+        });
+}
+
+function unloadStarChunk(file, entry) {
+    starCatalog.resident.delete(file);
+    if (entry.points) {
+        starCatalog.group.remove(entry.points);
+        entry.points.geometry.dispose(); // The material is shared by every chunk
+    }
+}
+
+// Keep the sky centred on the camera and the resident chunks matching the view
+function updateStarCatalog() {
+    if (!starCatalog.index) return;
+
+    starCatalog.group.position.copy(camera.position);
+
+    // View cone: half the frustum diagonal
+    camera.getWorldDirection(starForward);
+    const halfHeight = Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2);
+    const coneAngle = Math.atan(halfHeight * Math.sqrt(1 + camera.aspect * camera.aspect));
+    const zoomDistance = camera.position.distanceTo(controls.target);
+    const now = performance.now();
+
+    starCatalog.index.chunks.forEach(chunk => {
+        const c = chunk.center;
+        const angle = Math.acos(Math.min(1, Math.max(-1, starForward.x * c[0] + starForward.y * c[1] + starForward.z * c[2])));
+        const wanted = angle < coneAngle + chunk.radius && zoomDistance <= starCatalog.bandDistances[chunk.band];
+        const entry = starCatalog.resident.get(chunk.file);
+
+        if (wanted) {
+            const failed = starCatalog.failed.get(chunk.file);
+            if (entry) {
+                entry.lastWanted = now;
+            } else if (starCatalog.fetching < starMaxFetches && !(failed && now < failed.retryAt)) {
+                loadStarChunk(chunk);
+            }
+        } else if (entry && entry.points && now - entry.lastWanted > starChunkLinger) {
+            unloadStarChunk(chunk.file, entry);
+        }
+    });
 }
 
 // Planet data
 const planetData = [
-    { name: 'Mercury', color: 0xA5A5A5, radius: 15, distance: 200, speed: 0.02 },
-    { name: 'Venus', color: 0xE3BB76, radius: 25, distance: 300, speed: 0.015 },
-    { name: 'Earth', color: 0x22A6B3, radius: 26, distance: 400, speed: 0.01 },
-    { name: 'Mars', color: 0xDD4C39, radius: 18, distance: 500, speed: 0.008 },
-    { name: 'Jupiter', color: 0xD9A066, radius: 60, distance: 700, speed: 0.005 },
-    { name: 'Saturn', color: 0xEAD6B8, radius: 50, distance: 900, speed: 0.004, hasRings: true },
-    { name: 'Uranus', color: 0xD1F7F8, radius: 35, distance: 1100, speed: 0.003 },
-    { name: 'Neptune', color: 0x4B70DD, radius: 34, distance: 1300, speed: 0.002 },
-    { name: 'Pluto', color: 0xE3D2B4, radius: 8, distance: 1500, speed: 0.001 }
+    { name: 'Mercury', color: 0xA5A5A5, radius: 15, distance: 200, speed: 0.02, mass: 1.7e-7 },
+    { name: 'Venus', color: 0xE3BB76, radius: 25, distance: 300, speed: 0.015, mass: 2.4e-6, atmosphere: { color: 0xffddaa, thickness: 1.2, opacity: 0.4 } },
+    { name: 'Earth', color: 0x22A6B3, radius: 26, distance: 400, speed: 0.01, mass: 3.0e-6 },
+    { name: 'Mars', color: 0xDD4C39, radius: 18, distance: 500, speed: 0.008, mass: 3.2e-7, atmosphere: { color: 0xff4400, thickness: 1.1, opacity: 0.2 } },
+    { name: 'Jupiter', color: 0xD9A066, radius: 60, distance: 700, speed: 0.005, mass: 9.5e-4, atmosphere: { color: 0xffaa88, thickness: 1.05, opacity: 0.2 } },
+    { name: 'Saturn', color: 0xEAD6B8, radius: 50, distance: 900, speed: 0.004, mass: 2.9e-4, hasRings: true, atmosphere: { color: 0xeebb88, thickness: 1.05, opacity: 0.2 } },
+    { name: 'Uranus', color: 0xD1F7F8, radius: 35, distance: 1100, speed: 0.003, mass: 4.4e-5, atmosphere: { color: 0x88ffff, thickness: 1.1, opacity: 0.3 } },
+    { name: 'Neptune', color: 0x4B70DD, radius: 34, distance: 1300, speed: 0.002, mass: 5.2e-5, atmosphere: { color: 0x4444ff, thickness: 1.1, opacity: 0.3 } },
+    { name: 'Pluto', color: 0xE3D2B4, radius: 8, distance: 1500, speed: 0.001, mass: 6.6e-9 }
 ];
 
+// Planet masses above are in solar masses (only used by the gravity simulation).
+// atmosphere.thickness is the shell radius as a multiple of the planet radius; Earth's
+// atmosphere is part of its own shader.
+
 // Create Sun at center
 let sunGroup; // Make it accessible for animations
 function createSun() {
@@ -245,7 +1152,7 @@ function createSun() {
     // Sun sphere (core) with realistic texture
     const sunGeometry = new THREE.SphereGeometry(50, 128, 128);
     sunGeometry.computeVertexNormals(); // Ensure smooth shading
-    const sunTexture = loadTextureWithFiltering(planetTextures.sun);
+    const sunTexture = getTexture(planetTextures.sun);
     const sunMaterial = new THREE.MeshBasicMaterial({
         map: sunTexture,
         emissive: 0xffff00,
@@ -259,19 +1166,30 @@ function createSun() {
 
     scene.add(sunGroup);
 
-    // Add orbital path lines for each planet
+    // Orbital paths for every planet in one LineSegments draw
+    const orbitSegments = 128;
+    const orbitPositions = new Float32Array(planetData.length * orbitSegments * 6);
+    let offset = 0;
     planetData.forEach(data => {
-        const orbitGeometry = new THREE.RingGeometry(data.distance - 0.5, data.distance + 0.5, 128);
-        const orbitMaterial = new THREE.MeshBasicMaterial({
-            color: 0xffffff,
-            transparent: true,
-            opacity: 0.5,
-            side: THREE.DoubleSide
-        });
-        const orbit = new THREE.Mesh(orbitGeometry, orbitMaterial);
-        orbit.rotation.x = Math.PI / 2;
-        scene.add(orbit);
+        for (let i = 0; i < orbitSegments; i++) {
+            const a0 = (i / orbitSegments) * Math.PI * 2;
+            const a1 = ((i + 1) / orbitSegments) * Math.PI * 2;
+            orbitPositions[offset++] = Math.cos(a0) * data.distance;
+            orbitPositions[offset++] = 0;
+            orbitPositions[offset++] = Math.sin(a0) * data.distance;
+            orbitPositions[offset++] = Math.cos(a1) * data.distance;
+            orbitPositions[offset++] = 0;
+            orbitPositions[offset++] = Math.sin(a1) * data.distance;
+        }
+    });
+    const orbitGeometry = new THREE.BufferGeometry();
+    orbitGeometry.setAttribute('position', new THREE.BufferAttribute(orbitPositions, 3));
+    const orbitMaterial = new THREE.LineBasicMaterial({
+        color: 0xffffff,
+        transparent: true,
+        opacity: 0.5
     });
+    scene.add(new THREE.LineSegments(orbitGeometry, orbitMaterial));
 }
 
 // Create 3D planets
@@ -287,7 +1205,7 @@ function createPlanets() {
 
         // Create material with texture if available, fallback to color
         if (planetTextures[textureKey]) {
-            const texture = loadTextureWithFiltering(planetTextures[textureKey]);
+            const texture = getTexture(planetTextures[textureKey]);
             material = new THREE.MeshStandardMaterial({
                 map: texture,
                 roughness: data.name === 'Jupiter' || data.name === 'Saturn' ? 0.7 : 0.9,
@@ -306,19 +1224,24 @@ function createPlanets() {
 
         const planet = new THREE.Mesh(geometry, material);
 
-        // Special handling for Earth - add clouds layer and night lights
+        // Special handling for Earth - day, night lights, clouds and atmosphere in one pass
         if (data.name === 'Earth') {
-            // Load Earth textures with high-quality filtering
-            const earthDayTexture = loadTextureWithFiltering(planetTextures.earth);
-            const earthNightTexture = loadTextureWithFiltering(planetTextures.earthNight);
-            const cloudTexture = loadTextureWithFiltering(planetTextures.earthClouds);
+            // Load Earth textures with high-quality filtering. The day map is acquired before
+            // the placeholder material (replaced by the shader below) releases its reference.
+            const earthDayTexture = getTexture(planetTextures.earth);
+            const earthNightTexture = getTexture(planetTextures.earthNight);
+            const cloudTexture = getTexture(planetTextures.earthClouds);
+            releaseResource(planet.material);
+            cloudTexture.wrapS = THREE.RepeatWrapping; // Cloud UVs scroll around the globe
 
-            // Create custom shader material for day/night blend
             planet.material = new THREE.ShaderMaterial({
                 uniforms: {
                     dayTexture: { value: earthDayTexture },
                     nightTexture: { value: earthNightTexture },
-                    sunDirection: { value: new THREE.Vector3(0, 0, 0) }
+                    cloudTexture: { value: cloudTexture },
+                    cloudOffset: { value: 0 },
+                    sunPosition: { value: new THREE.Vector3(0, 0, 0) }, // Sun is fixed at the origin
+                    atmosphereColor: { value: new THREE.Color(0x4488ff) }
                 },
                 vertexShader: `
                     varying vec2 vUv;
@@ -327,7 +1250,8 @@ function createPlanets() {
 
                     void main() {
                         vUv = uv;
-                        vNormal = normalize(normalMatrix * normal);
+                        // World space, to match vPosition and the sun position
+                        vNormal = normalize(mat3(modelMatrix) * normal);
                         vPosition = (modelMatrix * vec4(position, 1.0)).xyz;
                         gl_Position = projectionMatrix * modelViewMatrix * vec4(position, 1.0);
                     }
@@ -335,54 +1259,44 @@ function createPlanets() {
                 fragmentShader: `
                     uniform sampler2D dayTexture;
                     uniform sampler2D nightTexture;
-                    uniform vec3 sunDirection;
+                    uniform sampler2D cloudTexture;
+                    uniform float cloudOffset;
+                    uniform vec3 sunPosition;
+                    uniform vec3 atmosphereColor;
 
                     varying vec2 vUv;
                     varying vec3 vNormal;
                     varying vec3 vPosition;
 
                     void main() {
-                        // Calculate direction from planet to sun
-                        vec3 toSun = normalize(sunDirection - vPosition);
+                        vec3 normal = normalize(vNormal);
 
-                        // Calculate how much this fragment faces the sun
-                        float sunAmount = dot(vNormal, toSun);
+                        // How much this fragment faces the sun
+                        vec3 toSun = normalize(sunPosition - vPosition);
+                        float sunAmount = dot(normal, toSun);
 
                         // Create smooth transition between day and night
                         float mixAmount = smoothstep(-0.1, 0.1, sunAmount);
 
-                        // Sample both textures
-                        vec4 dayColor = texture2D(dayTexture, vUv);
-                        vec4 nightColor = texture2D(nightTexture, vUv);
+                        // Sample surface and the drifting cloud layer
+                        vec3 dayColor = texture2D(dayTexture, vUv).rgb;
+                        vec3 nightColor = texture2D(nightTexture, vUv).rgb * 2.5; // Boost night lights
+                        float cloud = texture2D(cloudTexture, vec2(vUv.x - cloudOffset, vUv.y)).r;
 
-                        // Boost night lights intensity
-                        nightColor.rgb *= 2.5;
+                        // Clouds are lit white by day and hide city lights by night
+                        dayColor = mix(dayColor, vec3(1.0), cloud * 0.8);
+                        nightColor *= 1.0 - cloud * 0.7;
+                        vec3 color = mix(nightColor, dayColor, mixAmount);
 
-                        // Mix between day and night
-                        vec4 finalColor = mix(nightColor, dayColor, mixAmount);
+                        // Fresnel rim for the atmosphere, brightest on the day side
+                        vec3 toCamera = normalize(cameraPosition - vPosition);
+                        float rim = pow(1.0 - max(dot(normal, toCamera), 0.0), 3.0);
+                        color += atmosphereColor * rim * (0.3 + 0.7 * mixAmount);
 
-                        gl_FragColor = finalColor;
+                        gl_FragColor = vec4(color, 1.0);
                     }
                 `
             });
-
-            // Store reference to update sun direction
-            planet.userData.nightMaterial = planet.material;
-
-            // Add clouds layer (slightly larger sphere)
-            const cloudsGeometry = new THREE.SphereGeometry(data.radius * 1.01, 128, 128);
-            cloudsGeometry.computeVertexNormals(); // Ensure smooth shading
-            const cloudsMaterial = new THREE.MeshStandardMaterial({
-                map: cloudTexture,
-                transparent: true,
-                opacity: 0.4,
-                blending: THREE.NormalBlending
-            });
-            const clouds = new THREE.Mesh(cloudsGeometry, cloudsMaterial);
-            planet.add(clouds);
-
-            // Store clouds for animation
-            planet.userData.clouds = clouds;
         }
 
         // Position in orbit on same plane
@@ -391,14 +1305,18 @@ function createPlanets() {
         planet.position.z = Math.sin(angle) * data.distance;
         planet.position.y = 0;
 
-        // Store data for animation
         planet.userData = {
-            name: data.name,
-            distance: data.distance,
-            speed: data.speed,
-            angle: angle
+            name: data.name
         };
 
+        // Orbit state lives in the body store
+        addBody(planet, {
+            radius: data.distance,
+            speed: data.speed,
+            phase: angle,
+            spin: { x: 0, y: 0.01, z: 0 }
+        });
+
         scene.add(planet);
         planets.push(planet);
 
@@ -449,8 +1367,49 @@ function createPlanets() {
     });
 }
 
-// Create text labels for planets
-function createTextLabel(planet, text) {
+// Text labels
+// All labels are drawn by one instanced mesh: one quad per glyph, sampled from the
+// signed-distance-field atlas written by build_label_atlas.py. If the atlas metrics
+// can't be fetched (file:// pages block fetch) labels fall back to one canvas sprite each.
+const labelAtlasUrl = 'textures/label_atlas';
+const labelPixelScale = 0.15; // World units per atlas pixel
+const labelBatch = {
+    atlas: null,     // Glyph metrics from label_atlas.json
+    texture: null,
+    labels: [],      // { object, text, lift, firstGlyph, glyphCount }
+    dirty: false,    // Labels were added since the batch was built
+    fallback: false, // Drawing canvas sprites instead
+    mesh: null,
+    anchors: null    // Per-glyph world anchor, rewritten every frame
+};
+const labelAnchor = new THREE.Vector3();
+
+function loadLabelAtlas() {
+    labelBatch.texture = loadTextureWithFiltering(labelAtlasUrl + '.png');
+    labelBatch.texture.minFilter = THREE.LinearFilter; // Mipmaps would blur the distance field
+    labelBatch.texture.generateMipmaps = false;
+
+    pendingAssetLoads++;
+    fetch(labelAtlasUrl + '.json')
+        .then(response => {
+            if (!response.ok) throw new Error(response.status + ' ' + response.statusText);
+            return response.json();
+        })
+        .then(atlas => {
+            labelBatch.atlas = atlas;
+            labelBatch.dirty = true;
+        })
+        .catch(error => {
+            console.warn('Label atlas unavailable, using canvas labels:', error);
+            labelBatch.fallback = true;
+            labelBatch.texture.dispose();
+            labelBatch.labels.forEach(label => createCanvasLabel(label.object, label.text, label.lift));
+        })
+        .finally(() => pendingAssetLoads--);
+}
+
+// One canvas texture per label, attached to the object it names
+function createCanvasLabel(object, text, lift) {
     const canvas = document.createElement('canvas');
     const context = canvas.getContext('2d');
     canvas.width = 256;
@@ -465,9 +1424,150 @@ function createTextLabel(planet, text) {
     const spriteMaterial = new THREE.SpriteMaterial({ map: texture });
     const sprite = new THREE.Sprite(spriteMaterial);
     sprite.scale.set(50, 12.5, 1);
-    sprite.position.y = planet.geometry.parameters.radius + 20;
+    sprite.position.y = lift;
+
+    object.add(sprite);
+}
+
+// Create text labels for planets
+function createTextLabel(planet, text) {
+    const lift = planet.geometry.parameters.radius + 20;
+    if (labelBatch.fallback) {
+        createCanvasLabel(planet, text, lift);
+        return;
+    }
+
+    labelBatch.labels.push({
+        object: planet,
+        text: text,
+        lift: lift,
+        firstGlyph: 0,
+        glyphCount: 0
+    });
+    labelBatch.dirty = true;
+}
+
+function buildLabelBatch() {
+    const atlas = labelBatch.atlas;
+    const glyphFor = char => atlas.glyphs[char] || atlas.glyphs['?'];
+
+    let total = 0;
+    labelBatch.labels.forEach(label => {
+        for (const char of label.text) {
+            if (glyphFor(char).width) total++;
+        }
+    });
+
+    const rects = new Float32Array(total * 4);  // Atlas uv rect (x, y, w, h)
+    const quads = new Float32Array(total * 4);  // Quad in label pixels (x, y, w, h)
+    let g = 0;
+    labelBatch.labels.forEach(label => {
+        let width = 0;
+        for (const char of label.text) width += glyphFor(char).advance;
+
+        // Centred horizontally, and vertically between the ascent line and baseline
+        let penX = -width / 2;
+        const top = atlas.ascent / 2;
+        label.firstGlyph = g;
+        for (const char of label.text) {
+            const glyph = glyphFor(char);
+            if (glyph.width) {
+                rects[g * 4] = glyph.x / atlas.width;
+                rects[g * 4 + 1] = 1 - (glyph.y + glyph.height) / atlas.height;
+                rects[g * 4 + 2] = glyph.width / atlas.width;
+                rects[g * 4 + 3] = glyph.height / atlas.height;
+                quads[g * 4] = penX + glyph.xoffset;
+                quads[g * 4 + 1] = top - glyph.yoffset - glyph.height;
+                quads[g * 4 + 2] = glyph.width;
+                quads[g * 4 + 3] = glyph.height;
+                g++;
+            }
+            penX += glyph.advance;
+        }
+        label.glyphCount = g - label.firstGlyph;
+    });
+
+    const geometry = new THREE.InstancedBufferGeometry();
+    const quad = new THREE.PlaneGeometry(1, 1);
+    quad.translate(0.5, 0.5, 0);
+    geometry.index = quad.index;
+    geometry.setAttribute('position', quad.attributes.position);
+    geometry.setAttribute('uv', quad.attributes.uv);
+    geometry.setAttribute('glyphRect', new THREE.InstancedBufferAttribute(rects, 4));
+    geometry.setAttribute('glyphQuad', new THREE.InstancedBufferAttribute(quads, 4));
+    labelBatch.anchors = new THREE.InstancedBufferAttribute(new Float32Array(total * 3), 3);
+    labelBatch.anchors.setUsage(THREE.DynamicDrawUsage);
+    geometry.setAttribute('labelAnchor', labelBatch.anchors);
+    geometry.instanceCount = total;
+
+    if (labelBatch.mesh) {
+        labelBatch.mesh.geometry.dispose();
+        labelBatch.mesh.geometry = geometry;
+    } else {
+        const material = new THREE.ShaderMaterial({
+            uniforms: {
+                atlas: { value: labelBatch.texture },
+                color: { value: new THREE.Color(0xffffff) },
+                opacity: { value: 0.9 },
+                pixelScale: { value: labelPixelScale }
+            },
+            vertexShader: `
+                attribute vec3 labelAnchor;
+                attribute vec4 glyphRect;
+                attribute vec4 glyphQuad;
+                uniform float pixelScale;
+                varying vec2 vUv;
+
+                void main() {
+                    vUv = glyphRect.xy + uv * glyphRect.zw;
+                    // Billboard: offset the glyph in view space around its label anchor
+                    vec4 mvPosition = modelViewMatrix * vec4(labelAnchor, 1.0);
+                    mvPosition.xy += (glyphQuad.xy + position.xy * glyphQuad.zw) * pixelScale;
+                    gl_Position = projectionMatrix * mvPosition;
+                }
+            `,
+            fragmentShader: `
+                uniform sampler2D atlas;
+                uniform vec3 color;
+                uniform float opacity;
+                varying vec2 vUv;
+
+                void main() {
+                    float distance = texture2D(atlas, vUv).r;
+                    float edge = fwidth(distance);
+                    float alpha = smoothstep(0.5 - edge, 0.5 + edge, distance) * opacity;
+                    if (alpha < 0.01) discard;
+                    gl_FragColor = vec4(color, alpha);
+                }
+            `,
+            extensions: { derivatives: true },
+            transparent: true,
+            depthWrite: false
+        });
+        labelBatch.mesh = new THREE.Mesh(geometry, material);
+        labelBatch.mesh.frustumCulled = false; // Anchors live in attributes, not the bounding box
+        scene.add(labelBatch.mesh);
+    }
+    labelBatch.dirty = false;
+}
 
-    planet.add(sprite);
+// Move every glyph to its label's current anchor
+function updateLabels() {
+    if (labelBatch.dirty && labelBatch.atlas) buildLabelBatch();
+    if (!labelBatch.mesh) return;
+
+    const anchors = labelBatch.anchors.array;
+    labelBatch.labels.forEach(label => {
+        label.object.getWorldPosition(labelAnchor);
+        labelAnchor.y += label.lift;
+        const end = (label.firstGlyph + label.glyphCount) * 3;
+        for (let i = label.firstGlyph * 3; i < end; i += 3) {
+            anchors[i] = labelAnchor.x;
+            anchors[i + 1] = labelAnchor.y;
+            anchors[i + 2] = labelAnchor.z;
+        }
+    });
+    labelBatch.anchors.needsUpdate = true;
 }
 
 
@@ -483,40 +1583,42 @@ function createSatellites() {
         const satelliteGroup = new THREE.Group();
 
         // Satellite body
-        const bodyGeometry = new THREE.BoxGeometry(config.size * 2, config.size, config.size);
-        const bodyMaterial = new THREE.MeshStandardMaterial({
-            color: 0xcccccc,
-            metalness: 0.7,
-            roughness: 0.3
-        });
-        const body = new THREE.Mesh(bodyGeometry, bodyMaterial);
+        const body = new THREE.Mesh(
+            getGeometry('BoxGeometry', config.size * 2, config.size, config.size),
+            getMaterial('MeshStandardMaterial', {
+                color: 0xcccccc,
+                metalness: 0.7,
+                roughness: 0.3
+            })
+        );
         satelliteGroup.add(body);
 
-        // Solar panels
-        const panelGeometry = new THREE.BoxGeometry(config.size * 4, config.size * 0.2, config.size * 2);
-        const panelMaterial = new THREE.MeshStandardMaterial({
+        // Solar panels (shared by every satellite)
+        const panelParams = {
             color: 0x1a3a5c,
             metalness: 0.5,
             roughness: 0.2,
             emissive: 0x0a1a2c,
             emissiveIntensity: 0.3
-        });
+        };
+        const panelSize = [config.size * 4, config.size * 0.2, config.size * 2];
 
-        const leftPanel = new THREE.Mesh(panelGeometry, panelMaterial);
+        const leftPanel = new THREE.Mesh(getGeometry('BoxGeometry', ...panelSize), getMaterial('MeshStandardMaterial', panelParams));
         leftPanel.position.x = -config.size * 3;
         satelliteGroup.add(leftPanel);
 
-        const rightPanel = new THREE.Mesh(panelGeometry, panelMaterial);
+        const rightPanel = new THREE.Mesh(getGeometry('BoxGeometry', ...panelSize), getMaterial('MeshStandardMaterial', panelParams));
         rightPanel.position.x = config.size * 3;
         satelliteGroup.add(rightPanel);
 
         // Antenna
-        const antennaGeometry = new THREE.CylinderGeometry(0.2, 0.2, config.size * 2, 8);
-        const antennaMaterial = new THREE.MeshStandardMaterial({
-            color: 0xffffff,
-            metalness: 0.8
-        });
-        const antenna = new THREE.Mesh(antennaGeometry, antennaMaterial);
+        const antenna = new THREE.Mesh(
+            getGeometry('CylinderGeometry', 0.2, 0.2, config.size * 2, 8),
+            getMaterial('MeshStandardMaterial', {
+                color: 0xffffff,
+                metalness: 0.8
+            })
+        );
         antenna.position.y = config.size * 1.5;
         satelliteGroup.add(antenna);
 
@@ -526,11 +1628,12 @@ function createSatellites() {
         satelliteGroup.position.z = Math.sin(angle) * config.distance;
         satelliteGroup.position.y = 0;
 
-        satelliteGroup.userData = {
-            distance: config.distance,
+        addBody(satelliteGroup, {
+            radius: config.distance,
             speed: config.speed,
-            angle: angle
-        };
+            phase: angle,
+            spin: { x: 0, y: 0.02, z: 0 } // Rotate satellite slowly
+        });
 
         scene.add(satelliteGroup);
         satellites.push(satelliteGroup);
@@ -549,64 +1652,63 @@ function createSpaceships() {
 
         if (config.type === 'explorer') {
             // Main body (cylinder)
-            const bodyGeometry = new THREE.CylinderGeometry(3, 3, 15, 16);
-            const bodyMaterial = new THREE.MeshStandardMaterial({
-                color: 0xeeeeee,
-                metalness: 0.6,
-                roughness: 0.4
-            });
-            const body = new THREE.Mesh(bodyGeometry, bodyMaterial);
+            const body = new THREE.Mesh(
+                getGeometry('CylinderGeometry', 3, 3, 15, 16),
+                getMaterial('MeshStandardMaterial', {
+                    color: 0xeeeeee,
+                    metalness: 0.6,
+                    roughness: 0.4
+                })
+            );
             body.rotation.z = Math.PI / 2;
             shipGroup.add(body);
 
             // Cockpit (sphere)
-            const cockpitGeometry = new THREE.SphereGeometry(3.5, 16, 16);
-            const cockpitMaterial = new THREE.MeshStandardMaterial({
-                color: 0x4488ff,
-                metalness: 0.8,
-                roughness: 0.2,
-                transparent: true,
-                opacity: 0.7
-            });
-            const cockpit = new THREE.Mesh(cockpitGeometry, cockpitMaterial);
+            const cockpit = new THREE.Mesh(
+                getGeometry('SphereGeometry', 3.5, 16, 16),
+                getMaterial('MeshStandardMaterial', {
+                    color: 0x4488ff,
+                    metalness: 0.8,
+                    roughness: 0.2,
+                    transparent: true,
+                    opacity: 0.7
+                })
+            );
             cockpit.position.x = 8;
             shipGroup.add(cockpit);
 
             // Engine glow
-            const engineGeometry = new THREE.ConeGeometry(2, 4, 8);
-            const engineMaterial = new THREE.MeshBasicMaterial({
-                color: 0xff6600,
-                emissive: 0xff6600,
-                emissiveIntensity: 1
-            });
-            const engine = new THREE.Mesh(engineGeometry, engineMaterial);
+            const engine = new THREE.Mesh(
+                getGeometry('ConeGeometry', 2, 4, 8),
+                getMaterial('MeshBasicMaterial', { color: 0xff6600 })
+            );
             engine.rotation.z = -Math.PI / 2;
             engine.position.x = -9;
             shipGroup.add(engine);
         } else {
             // Shuttle design
-            const bodyGeometry = new THREE.ConeGeometry(4, 12, 8);
-            const bodyMaterial = new THREE.MeshStandardMaterial({
-                color: 0xdddddd,
-                metalness: 0.7,
-                roughness: 0.3
-            });
-            const body = new THREE.Mesh(bodyGeometry, bodyMaterial);
+            const body = new THREE.Mesh(
+                getGeometry('ConeGeometry', 4, 12, 8),
+                getMaterial('MeshStandardMaterial', {
+                    color: 0xdddddd,
+                    metalness: 0.7,
+                    roughness: 0.3
+                })
+            );
             body.rotation.z = -Math.PI / 2;
             shipGroup.add(body);
 
             // Wings
-            const wingGeometry = new THREE.BoxGeometry(1, 8, 6);
-            const wingMaterial = new THREE.MeshStandardMaterial({
+            const wingParams = {
                 color: 0xaaaaaa,
                 metalness: 0.6
-            });
+            };
 
-            const leftWing = new THREE.Mesh(wingGeometry, wingMaterial);
+            const leftWing = new THREE.Mesh(getGeometry('BoxGeometry', 1, 8, 6), getMaterial('MeshStandardMaterial', wingParams));
             leftWing.position.z = 5;
             shipGroup.add(leftWing);
 
-            const rightWing = new THREE.Mesh(wingGeometry, wingMaterial);
+            const rightWing = new THREE.Mesh(getGeometry('BoxGeometry', 1, 8, 6), getMaterial('MeshStandardMaterial', wingParams));
             rightWing.position.z = -5;
             shipGroup.add(rightWing);
         }
@@ -615,14 +1717,17 @@ function createSpaceships() {
         const angle = (index / spaceshipConfigs.length) * Math.PI * 2 + Math.PI;
         shipGroup.position.x = Math.cos(angle) * config.distance;
         shipGroup.position.z = Math.sin(angle) * config.distance;
-        shipGroup.position.y = (Math.random() - 0.5) * 50;
+        shipGroup.position.y = (worldRandom() - 0.5) * 50;
 
-        shipGroup.userData = {
-            distance: config.distance,
+        // Point ship in direction of movement, with gentle vertical movement
+        addBody(shipGroup, {
+            radius: config.distance,
             speed: config.speed,
-            angle: angle,
-            verticalSpeed: (Math.random() - 0.5) * 0.01
-        };
+            phase: angle,
+            height: shipGroup.position.y,
+            verticalSpeed: (worldRandom() - 0.5) * 0.01,
+            flags: BODY_FACE_MOTION
+        });
 
         scene.add(shipGroup);
         spaceships.push(shipGroup);
@@ -630,51 +1735,53 @@ function createSpaceships() {
 }
 
 
-// Create asteroid belt
+// Create asteroid belt (one instanced draw, matrices written by updateBodies)
 function createAsteroidBelt() {
     const asteroidCount = 500;
     const minDistance = 550;
     const maxDistance = 650;
 
+    const geometry = new THREE.DodecahedronGeometry(1, 0);
+    const material = new THREE.MeshStandardMaterial({
+        color: 0x888888,
+        roughness: 0.9,
+        metalness: 0.1
+    });
+    asteroidBelt = new THREE.InstancedMesh(geometry, material, asteroidCount);
+    asteroidBelt.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
+    asteroidBelt.frustumCulled = false; // Instances span the whole belt
+
     for (let i = 0; i < asteroidCount; i++) {
-        const size = Math.random() * 1.5 + 0.5;
-        const geometry = new THREE.DodecahedronGeometry(size, 0);
-        const material = new THREE.MeshStandardMaterial({
-            color: 0x888888,
-            roughness: 0.9,
-            metalness: 0.1
+        const size = worldRandom() * 1.5 + 0.5;
+        const distance = minDistance + worldRandom() * (maxDistance - minDistance);
+        const angle = worldRandom() * Math.PI * 2;
+        const verticalOffset = (worldRandom() - 0.5) * 20;
+
+        const bodyIndex = addBody(null, {
+            radius: distance,
+            speed: 0.003 + worldRandom() * 0.002,
+            phase: angle,
+            height: verticalOffset,
+            scale: size,
+            spin: {
+                x: (worldRandom() - 0.5) * 0.02,
+                y: (worldRandom() - 0.5) * 0.02,
+                z: (worldRandom() - 0.5) * 0.02
+            },
+            instancedMesh: asteroidBelt,
+            instanceId: i
         });
-        const asteroid = new THREE.Mesh(geometry, material);
-
-        const distance = minDistance + Math.random() * (maxDistance - minDistance);
-        const angle = Math.random() * Math.PI * 2;
-        const verticalOffset = (Math.random() - 0.5) * 20;
-
-        asteroid.position.x = Math.cos(angle) * distance;
-        asteroid.position.z = Math.sin(angle) * distance;
-        asteroid.position.y = verticalOffset;
-
-        asteroid.userData = {
-            distance: distance,
-            speed: 0.003 + Math.random() * 0.002,
-            angle: angle,
-            rotationSpeed: {
-                x: (Math.random() - 0.5) * 0.02,
-                y: (Math.random() - 0.5) * 0.02,
-                z: (Math.random() - 0.5) * 0.02
-            }
-        };
-
-        scene.add(asteroid);
-        asteroids.push(asteroid);
+        if (i === 0) asteroidBelt.userData.firstBody = bodyIndex;
     }
+
+    scene.add(asteroidBelt);
 }
 
 // Create Earth's moon
 function createMoon() {
     const moonGeometry = new THREE.SphereGeometry(7, 128, 128);
     moonGeometry.computeVertexNormals(); // Ensure smooth shading
-    const moonTexture = loadTextureWithFiltering(planetTextures.moon);
+    const moonTexture = getTexture(planetTextures.moon);
     const moonMaterial = new THREE.MeshStandardMaterial({
         map: moonTexture,
         roughness: 0.9,
@@ -682,15 +1789,341 @@ function createMoon() {
     });
     moon = new THREE.Mesh(moonGeometry, moonMaterial);
 
-    moon.userData = {
-        orbitRadius: 40,
+    // Orbits Earth
+    addBody(moon, {
+        radius: 40,
         speed: 0.05,
-        angle: 0
-    };
+        phase: 0,
+        parent: planets[2].userData.bodyIndex // Earth is index 2
+    });
 
     scene.add(moon);
 }
 
+// Satellite constellations
+// Walker-style shells of thousands of satellites around Earth. Each part of the model
+// (bus, solar panels, antenna) is one instanced draw over every satellite in every
+// shell, and the orbit is evaluated in the vertex shader: the CPU writes the elements
+// once and per frame only updates Earth's position and one angle per shell.
+//   altitude (km), inclination (degrees), planes, perPlane, phasing (Walker F)
+const constellationShells = [
+    { name: 'Shell 1', altitude: 550, inclination: 53, planes: 72, perPlane: 22, phasing: 17 },
+    { name: 'Shell 2', altitude: 540, inclination: 53.2, planes: 72, perPlane: 22, phasing: 17 },
+    { name: 'Shell 3', altitude: 570, inclination: 70, planes: 36, perPlane: 20, phasing: 11 },
+    { name: 'Polar A', altitude: 560, inclination: 97.6, planes: 6, perPlane: 58, phasing: 1 },
+    { name: 'Polar B', altitude: 560, inclination: 97.6, planes: 4, perPlane: 43, phasing: 1 }
+];
+
+// Model parts in satellite units; every offset becomes a copy of the part's geometry
+const constellationParts = [
+    { geometry: ['BoxGeometry', 2, 1, 1], offsets: [[0, 0, 0]], color: 0xcccccc, emissive: 0x000000, shininess: 0.5 },
+    { geometry: ['BoxGeometry', 4, 0.2, 2], offsets: [[-3, 0, 0], [3, 0, 0]], color: 0x1a3a5c, emissive: 0x0a1a2c, shininess: 0.8 },
+    { geometry: ['CylinderGeometry', 0.2, 0.2, 2, 8], offsets: [[0, 1.5, 0]], color: 0xffffff, emissive: 0x000000, shininess: 0.6 }
+];
+
+const earthRadiusKm = 6371;
+const constellationAltitudeScale = 4; // Real LEO altitudes would sit on the surface at scene scale
+const constellationModelScale = 0.12;
+let constellations = null;
+
+// Angular speed (radians per tick) at an Earth-centred radius, from Kepler's third law
+// scaled to the Moon's orbit (radius 40, speed 0.05)
+function constellationOrbitSpeed(radius) {
+    return 0.05 * Math.pow(40 / radius, 1.5);
+}
+
+// One indexed geometry holding a copy of `part.geometry` at every offset
+function buildPartGeometry(part) {
+    const [type, ...args] = part.geometry;
+    const source = new THREE[type](...args);
+    const position = source.attributes.position.array;
+    const normal = source.attributes.normal.array;
+    const index = source.index.array;
+    const vertices = position.length / 3;
+    const copies = part.offsets.length;
+
+    const positions = new Float32Array(position.length * copies);
+    const normals = new Float32Array(normal.length * copies);
+    const indices = new Uint16Array(index.length * copies);
+    part.offsets.forEach((offset, c) => {
+        for (let v = 0; v < vertices; v++) {
+            const o = (c * vertices + v) * 3;
+            positions[o] = position[v * 3] + offset[0];
+            positions[o + 1] = position[v * 3 + 1] + offset[1];
+            positions[o + 2] = position[v * 3 + 2] + offset[2];
+        }
+        normals.set(normal, c * normal.length);
+        for (let i = 0; i < index.length; i++) indices[c * index.length + i] = index[i] + c * vertices;
+    });
+    source.dispose();
+
+    const geometry = new THREE.InstancedBufferGeometry();
+    geometry.setIndex(new THREE.BufferAttribute(indices, 1));
+    geometry.setAttribute('position', new THREE.BufferAttribute(positions, 3));
+    geometry.setAttribute('normal', new THREE.BufferAttribute(normals, 3));
+    return geometry;
+}
+
+const constellationVertexShader = `
+    #define SHELL_COUNT ${constellationShells.length}
+    attribute vec4 orbit;       // ascending node, inclination, phase (radians), radius
+    attribute float orbitShell;
+    uniform float shellAngle[SHELL_COUNT];
+    uniform vec3 earthCenter;
+    uniform float modelScale;
+    varying vec3 vNormal;
+    varying vec3 vWorldPosition;
+
+    void main() {
+        // Orbit frame: node direction and its in-plane perpendicular (scene y is north)
+        float node = orbit.x;
+        float inclination = orbit.y;
+        vec3 nodeAxis = vec3(cos(node), 0.0, sin(node));
+        vec3 planeAxis = vec3(-sin(node) * cos(inclination), sin(inclination), cos(node) * cos(inclination));
+
+        float u = orbit.z + shellAngle[int(orbitShell)];
+        vec3 radial = cos(u) * nodeAxis + sin(u) * planeAxis;
+        vec3 along = -sin(u) * nodeAxis + cos(u) * planeAxis;
+
+        // Panels span the orbit normal, the antenna points away from Earth
+        mat3 attitude = mat3(cross(radial, along), radial, along);
+        vec3 world = earthCenter + radial * orbit.w + attitude * (position * modelScale);
+
+        vNormal = attitude * normal;
+        vWorldPosition = world;
+        gl_Position = projectionMatrix * viewMatrix * vec4(world, 1.0);
+    }
+`;
+
+const constellationFragmentShader = `
+    uniform vec3 color;
+    uniform vec3 emissive;
+    uniform float shininess;
+    varying vec3 vNormal;
+    varying vec3 vWorldPosition;
+
+    void main() {
+        // Lit by the sun at the origin, with a little ambient so the night side reads
+        vec3 normal = normalize(vNormal);
+        vec3 toSun = normalize(-vWorldPosition);
+        vec3 toCamera = normalize(cameraPosition - vWorldPosition);
+        float diffuse = max(dot(normal, toSun), 0.0);
+        float specular = pow(max(dot(reflect(-toSun, normal), toCamera), 0.0), 32.0) * shininess;
+        gl_FragColor = vec4(color * (0.15 + diffuse) + specular + emissive, 1.0);
+    }
+`;
+
+function createConstellations() {
+    const earth = planets[2];
+    const earthRadius = earth.geometry.parameters.radius;
+
+    let total = 0;
+    constellationShells.forEach(shell => { total += shell.planes * shell.perPlane; });
+
+    // Walker delta pattern: planes spread evenly in node, satellites evenly in each
+    // plane, and plane p shifted by p * phasing / total of a slot
+    const elements = new Float32Array(total * 4);
+    const shellIndex = new Float32Array(total);
+    const speeds = [];
+    let s = 0;
+    constellationShells.forEach((shell, k) => {
+        const radius = earthRadius * (1 + shell.altitude / earthRadiusKm * constellationAltitudeScale);
+        const count = shell.planes * shell.perPlane;
+        const inclination = THREE.MathUtils.degToRad(shell.inclination);
+        speeds.push(constellationOrbitSpeed(radius));
+        for (let p = 0; p < shell.planes; p++) {
+            for (let i = 0; i < shell.perPlane; i++) {
+                elements[s * 4] = Math.PI * 2 * p / shell.planes;
+                elements[s * 4 + 1] = inclination;
+                elements[s * 4 + 2] = Math.PI * 2 * (i / shell.perPlane + p * shell.phasing / count);
+                elements[s * 4 + 3] = radius;
+                shellIndex[s] = k;
+                s++;
+            }
+        }
+    });
+
+    // Every part draws the same satellites, so the instance buffers are shared
+    const orbitAttribute = new THREE.InstancedBufferAttribute(elements, 4);
+    const shellAttribute = new THREE.InstancedBufferAttribute(shellIndex, 1);
+    const uniforms = {
+        shellAngle: { value: new Float32Array(constellationShells.length) },
+        earthCenter: { value: new THREE.Vector3() },
+        modelScale: { value: constellationModelScale }
+    };
+
+    const meshes = constellationParts.map(part => {
+        const geometry = buildPartGeometry(part);
+        geometry.setAttribute('orbit', orbitAttribute);
+        geometry.setAttribute('orbitShell', shellAttribute);
+        geometry.instanceCount = total;
+
+        const material = new THREE.ShaderMaterial({
+            uniforms: {
+                ...uniforms,
+                color: { value: new THREE.Color(part.color) },
+                emissive: { value: new THREE.Color(part.emissive) },
+                shininess: { value: part.shininess }
+            },
+            vertexShader: constellationVertexShader,
+            fragmentShader: constellationFragmentShader
+        });
+
+        const mesh = new THREE.Mesh(geometry, material);
+        mesh.frustumCulled = false; // Positions only exist in the shader
+        scene.add(mesh);
+        return mesh;
+    });
+
+    constellations = { meshes: meshes, uniforms: uniforms, speeds: speeds, count: total, earth: earth };
+    updateConstellations(simTime);
+}
+
+// Advance each shell's mean anomaly (wrapped here in double precision) and follow Earth
+function updateConstellations(time) {
+    if (!constellations) return;
+
+    const angles = constellations.uniforms.shellAngle.value;
+    constellations.speeds.forEach((speed, k) => {
+        angles[k] = (speed * time) % (Math.PI * 2);
+    });
+    constellations.uniforms.earthCenter.value.copy(constellations.earth.position);
+}
+
+// GPU particle emitters
+// Each emitter is a ring buffer of fixed slots: slot i is re-emitted every `lifetime`
+// ticks, offset by i * lifetime / count, so a particle's age, random seed and position
+// are functions of simTime evaluated in the vertex shader. The buffers are written
+// once; per frame the CPU only touches a few uniforms.
+const particleEmitters = [];
+const drawingBufferSize = new THREE.Vector2();
+
+// Converts the size uniform (world units at distance 1) to pixels. Taken from the drawing
+// buffer rather than the window, which capture mode sizes independently.
+function particlePointScale() {
+    return renderer.getDrawingBufferSize(drawingBufferSize).y / 2;
+}
+
+// After the drawing buffer is resized
+function updateParticlePointScale() {
+    const pointScale = particlePointScale();
+    particleEmitters.forEach(emitter => {
+        emitter.material.uniforms.pointScale.value = pointScale;
+    });
+}
+
+// A slot's random seeds repeat every this many cycles, so simTime can be wrapped on
+// the CPU (in double precision) to a whole number of those periods. The float32 time
+// uniform then stays small enough to keep full precision at any simulation time.
+const particleSeedCycles = 256;
+
+const particleVertexShader = `
+    attribute float slot;
+    uniform float time;
+    uniform float lifetime;
+    uniform float slotInterval;
+    uniform float seedCycles;
+    uniform float speed;
+    uniform float activity;
+    uniform float size;
+    uniform float pointScale;
+    uniform vec3 emitterPosition;
+    uniform vec3 emitterDirection;
+    varying float vFade;
+
+    // New random numbers for every emission cycle of a slot
+    vec3 hash3(vec3 p, float cycle) {
+        return fract(sin(p * vec3(127.1, 311.7, 74.7) + cycle * vec3(12.9898, 78.233, 37.719)) * 43758.5453);
+    }
+
+    void main() {
+        float emitted = time - slot * slotInterval;
+        float cycle = floor(emitted / lifetime);
+        float age = emitted - cycle * lifetime;
+        float life = age / lifetime;
+        vec3 seed = hash3(position, mod(cycle, seedCycles)); // position holds the slot's static random seed
+
+        vec3 offset = vec3(0.0);
+        float fade = 1.0 - life;
+        #include <particle_motion>
+
+        vFade = emitted < 0.0 ? 0.0 : fade;
+        vec4 mvPosition = modelViewMatrix * vec4(emitterPosition + offset, 1.0);
+        gl_PointSize = size * pointScale / -mvPosition.z;
+        gl_Position = projectionMatrix * mvPosition;
+    }
+`;
+
+const particleFragmentShader = `
+    uniform vec3 color;
+    uniform float opacity;
+    varying float vFade;
+
+    void main() {
+        float falloff = 1.0 - smoothstep(0.25, 0.5, length(gl_PointCoord - 0.5));
+        float alpha = opacity * vFade * falloff;
+        if (alpha <= 0.0) discard;
+        gl_FragColor = vec4(color, alpha);
+    }
+`;
+
+// options: count, lifetime (ticks), speed, size, color, opacity, seed,
+// motion (GLSL that sets `offset` and scales `fade` from age, life and seed)
+function createParticleEmitter(options) {
+    const count = options.count;
+    const random = seededRandom(options.seed || 1);
+    const seeds = new Float32Array(count * 3);
+    const slots = new Float32Array(count);
+    for (let i = 0; i < count; i++) {
+        seeds[i * 3] = random();
+        seeds[i * 3 + 1] = random();
+        seeds[i * 3 + 2] = random();
+        slots[i] = i;
+    }
+
+    const geometry = new THREE.BufferGeometry();
+    geometry.setAttribute('position', new THREE.BufferAttribute(seeds, 3)); // Seeds, also sets the draw count
+    geometry.setAttribute('slot', new THREE.BufferAttribute(slots, 1));
+
+    const material = new THREE.ShaderMaterial({
+        uniforms: {
+            time: { value: 0 },
+            lifetime: { value: options.lifetime },
+            slotInterval: { value: options.lifetime / count },
+            seedCycles: { value: particleSeedCycles },
+            speed: { value: options.speed || 1 },
+            activity: { value: 1 },
+            size: { value: options.size },
+            pointScale: { value: particlePointScale() },
+            emitterPosition: { value: new THREE.Vector3() },
+            emitterDirection: { value: new THREE.Vector3(1, 0, 0) },
+            color: { value: new THREE.Color(options.color) },
+            opacity: { value: options.opacity }
+        },
+        vertexShader: particleVertexShader.replace('#include <particle_motion>', options.motion),
+        fragmentShader: particleFragmentShader,
+        transparent: true,
+        depthWrite: false,
+        blending: THREE.AdditiveBlending
+    });
+
+    const points = new THREE.Points(geometry, material);
+    points.frustumCulled = false; // Particles are placed by the shader, not the seed buffer
+    particleEmitters.push(points);
+    return points;
+}
+
+// Advance every emitter's clock. Past the first period the time is kept within
+// [period, 2 * period): ages and seed cycles are unchanged, and no slot's emission
+// time falls below zero (which would hide it as not yet emitted).
+function updateParticleEmitters(time) {
+    particleEmitters.forEach(emitter => {
+        const uniforms = emitter.material.uniforms;
+        const period = uniforms.lifetime.value * particleSeedCycles;
+        uniforms.time.value = time < period ? time : period + time % period;
+    });
+}
+
 // Create comet
 function createComet() {
     const cometGroup = new THREE.Group();
@@ -705,44 +2138,44 @@ function createComet() {
     const nucleus = new THREE.Mesh(nucleusGeometry, nucleusMaterial);
     cometGroup.add(nucleus);
 
-    // Comet tail (particles)
-    const tailGeometry = new THREE.BufferGeometry();
-    const tailCount = 100;
-    const tailPositions = new Float32Array(tailCount * 3);
-
-    for (let i = 0; i < tailCount; i++) {
-        const distance = i * 2;
-        tailPositions[i * 3] = -distance;
-        tailPositions[i * 3 + 1] = (Math.random() - 0.5) * 2;
-        tailPositions[i * 3 + 2] = (Math.random() - 0.5) * 2;
-    }
-
-    tailGeometry.setAttribute('position', new THREE.BufferAttribute(tailPositions, 3));
-
-    const tailMaterial = new THREE.PointsMaterial({
-        color: 0x88ccff,
+    // Comet tail - gas streams away from the sun, longer and brighter near perihelion.
+    // Drawn in world space so the tail keeps pointing away from the sun as the comet turns.
+    const tail = createParticleEmitter({
+        count: 20000,
+        lifetime: 120,
+        speed: 3,
         size: 3,
-        transparent: true,
-        opacity: 0.6,
-        sizeAttenuation: true
+        color: 0x88ccff,
+        opacity: 0.35,
+        seed: 7,
+        motion: `
+            vec3 direction = normalize(emitterDirection + (seed - 0.5) * 0.3);
+            offset = direction * speed * (0.15 + activity) * age + (seed.zxy - 0.5) * 4.0;
+            fade *= 0.25 + 0.75 * activity;
+        `
     });
+    scene.add(tail);
 
-    const tail = new THREE.Points(tailGeometry, tailMaterial);
-    cometGroup.add(tail);
-
-    cometGroup.userData = {
-        angle: 0,
+    // Elliptical orbit, bobbing above and below the ecliptic
+    addBody(cometGroup, {
+        radius: 1400,
+        eccentricity: 0.7,
         speed: 0.008,
-        minDistance: 300,
-        maxDistance: 1400,
-        eccentricity: 0.7
-    };
+        phase: 0,
+        wobble: 100,
+        flags: BODY_FACE_MOTION
+    });
 
     comet = cometGroup;
+    comet.userData.tail = tail;
     scene.add(cometGroup);
 }
 
 // Create meteor shower
+// Meteors are fixed slots replayed in cycles of meteorLifetime ticks; each cycle's
+// start point and velocity come from a hash of (slot, cycle), so any time is O(1).
+const meteorLifetime = 100; // Ticks (life fades 1 -> 0 at 0.01 per tick)
+
 function createMeteors() {
     for (let i = 0; i < 40; i++) {
         createMeteor();
@@ -760,26 +2193,53 @@ function createMeteor() {
     });
     const meteor = new THREE.Mesh(meteorGeometry, meteorMaterial);
 
-    // Random starting position far from center
-    const angle = Math.random() * Math.PI * 2;
-    const distance = 2000 + Math.random() * 500;
-    meteor.position.x = Math.cos(angle) * distance;
-    meteor.position.y = (Math.random() - 0.5) * 1000;
-    meteor.position.z = Math.sin(angle) * distance;
-
-    // Direction towards center with some randomness
-    const targetAngle = angle + Math.PI + (Math.random() - 0.5) * 0.5;
     meteor.userData = {
-        velocity: {
-            x: Math.cos(targetAngle) * 15,
-            y: (Math.random() - 0.5) * 5,
-            z: Math.sin(targetAngle) * 15
-        },
+        slot: meteors.length,
+        cycle: -1,
+        impactCycle: -1, // Cycle in which this meteor hit something (hidden until the next)
+        start: { x: 0, y: 0, z: 0 },
+        velocity: { x: 0, y: 0, z: 0 },
         life: 1.0
     };
 
     scene.add(meteor);
     meteors.push(meteor);
+    updateMeteor(meteor, simTime);
+    addSpatialEntry(meteor, SPATIAL_METEOR, 1);
+}
+
+// Closed-form meteor state at simulation time `time`
+function updateMeteor(meteor, time) {
+    const data = meteor.userData;
+    const cycle = Math.floor(time / meteorLifetime);
+    const age = time - cycle * meteorLifetime;
+
+    if (cycle !== data.cycle) {
+        data.cycle = cycle;
+        const random = seededRandom(Math.imul(data.slot + 1, 0x9E3779B1) ^ Math.imul(cycle, 0x85EBCA77));
+
+        // Random starting position far from center
+        const angle = random() * Math.PI * 2;
+        const distance = 2000 + random() * 500;
+        data.start.x = Math.cos(angle) * distance;
+        data.start.y = (random() - 0.5) * 1000;
+        data.start.z = Math.sin(angle) * distance;
+
+        // Direction towards center with some randomness
+        const targetAngle = angle + Math.PI + (random() - 0.5) * 0.5;
+        data.velocity.x = Math.cos(targetAngle) * 15;
+        data.velocity.y = (random() - 0.5) * 5;
+        data.velocity.z = Math.sin(targetAngle) * 15;
+    }
+
+    meteor.position.set(
+        data.start.x + data.velocity.x * age,
+        data.start.y + data.velocity.y * age,
+        data.start.z + data.velocity.z * age
+    );
+    data.life = 1 - age / meteorLifetime;
+    meteor.material.opacity = data.life;
+    meteor.visible = data.impactCycle !== cycle;
 }
 
 // Click to focus on any object
@@ -792,24 +2252,23 @@ function onPlanetClick(event) {
     raycaster.setFromCamera(mouse, camera);
 
     // Check all clickable objects
-    const clickableObjects = [
-        ...planets,
-        ...(iss ? [iss] : []),
-        ...(moon ? [moon] : []),
-        ...(comet ? [comet] : []),
-        ...satellites,
-        ...spaceships
-    ];
+    const clickableObjects = clickableGroups().flat().filter(Boolean);
 
     const intersects = raycaster.intersectObjects(clickableObjects, true);
 
+    let clickedObject = null;
     if (intersects.length > 0) {
         // Find the top-level object
-        let clickedObject = intersects[0].object;
+        clickedObject = intersects[0].object;
         while (clickedObject.parent && !clickableObjects.includes(clickedObject)) {
             clickedObject = clickedObject.parent;
         }
+    } else {
+        clickedObject = pickNearestObject(raycaster.ray, clickableObjects);
+    }
 
+    if (clickedObject) {
+        cancelCameraTweens();
         focusedPlanet = clickedObject;
 
         // Show info panel
@@ -838,6 +2297,27 @@ function onPlanetClick(event) {
     }
 }
 
+// Everything that can be clicked and focused, by kind, in a fixed order (resume snapshots
+// store focus as kind + index into these)
+function clickableGroups() {
+    return [planets, [iss], [moon], [comet], satellites, spaceships];
+}
+
+// Small craft are hard to hit with a ray, so a click that misses picks the nearest body
+// or craft around the point where the ray meets the orbital plane
+const pickPlane = new THREE.Plane(new THREE.Vector3(0, 1, 0), 0);
+const pickPoint = new THREE.Vector3();
+const pickRadiusFactor = 0.03; // Of the camera's distance to that point
+
+function pickNearestObject(ray, candidates) {
+    if (!ray.intersectPlane(pickPlane, pickPoint)) return null;
+
+    const radius = camera.position.distanceTo(pickPoint) * pickRadiusFactor;
+    const id = querySpatialNearest(pickPoint.x, pickPoint.y, pickPoint.z, radius, SPATIAL_BODY | SPATIAL_CRAFT, -1);
+    const object = id === -1 ? null : spatialGrid.objects[id];
+    return candidates.includes(object) ? object : null;
+}
+
 // Helper function to identify object type
 function getObjectName(obj) {
     if (obj === iss) return 'ISS';
@@ -900,7 +2380,7 @@ function getObjectInfo(obj, name) {
         return {
             title: `Artificial Satellite ${index}`,
             type: 'Communications Satellite',
-            distance: `Orbit: ${Math.round(obj.userData.distance)} units`,
+            distance: `Orbit: ${Math.round(bodyStore.orbitRadius[obj.userData.bodyIndex])} units`,
             diameter: '~10m with solar panels',
             desc: 'Part of a global network providing GPS, telecommunications, weather monitoring, and Earth observation services.'
         };
@@ -913,7 +2393,7 @@ function getObjectInfo(obj, name) {
         return {
             title: types[index] || 'Spaceship',
             type: 'Spacecraft',
-            distance: `Currently at ${Math.round(obj.userData.distance)} units`,
+            distance: `Currently at ${Math.round(bodyStore.orbitRadius[obj.userData.bodyIndex])} units`,
             diameter: '~15m',
             desc: index === 0 ?
                 'On a mission to explore the outer solar system and study distant planets and asteroids.' :
@@ -925,48 +2405,192 @@ function getObjectInfo(obj, name) {
 }
 
 // Camera Animation System
-function animateCameraTo(preset) {
-    if (cameraAnimating) return;
+// Tweens
+// One scheduler, advanced from animate() on the frame clock. A tween eases numeric
+// properties of any object (camera.position, controls.target, material.opacity,
+// simulationSpeed.value). Starting a tween on a channel interrupts the one running
+// there and carries its velocity over, so a new camera preset mid-flight bends the
+// path instead of stopping dead. Tween objects are pooled; a handle is only valid
+// until the tween finishes or is cancelled.
+const TWEEN_IDLE = 0;
+const TWEEN_PENDING = 1; // Chained, waiting for its predecessor
+const TWEEN_RUNNING = 2;
+const TWEEN_DONE = 3;    // Finished or cancelled, swept by updateTweens
+
+const easings = {
+    linear: t => t,
+    outCubic: t => 1 - Math.pow(1 - t, 3),
+    inOutCubic: t => t < 0.5 ? 4 * t * t * t : 1 - Math.pow(-2 * t + 2, 3) / 2
+};
 
-    const targetPos = cameraPresets[preset].position;
-    const targetLookAt = cameraPresets[preset].target;
+const tweenPool = [];
+const activeTweens = [];
+
+function acquireTween() {
+    return tweenPool.pop() || {
+        state: TWEEN_IDLE,
+        target: null,
+        keys: [],
+        from: [],
+        to: [],
+        startVelocity: [], // units per second carried over from an interrupted tween
+        velocity: [],
+        elapsed: 0,
+        duration: 1,
+        ease: easings.inOutCubic,
+        channel: null,
+        onUpdate: null,
+        onComplete: null,
+        next: null,
+        // Queue another tween to start when this one completes; returns the new tween
+        chain(target, to, options) {
+            this.next = createTween(target, to, options);
+            return this.next;
+        }
+    };
+}
+
+function releaseTween(tween) {
+    tween.state = TWEEN_IDLE;
+    tween.target = null;
+    tween.onUpdate = null;
+    tween.onComplete = null;
+    tween.next = null;
+    tweenPool.push(tween);
+}
 
-    cameraAnimating = true;
-    const startPos = camera.position.clone();
-    const startTarget = controls.target.clone();
-    const duration = 2000; // 2 seconds
-    const startTime = Date.now();
+// Build a tween without starting it.
+// options: duration (seconds), ease, delay (seconds), channel, onUpdate(target), onComplete(target)
+function createTween(target, to, options = {}) {
+    const tween = acquireTween();
+    tween.state = TWEEN_PENDING;
+    tween.target = target;
+    tween.keys.length = 0;
+    tween.to.length = 0;
+    Object.keys(to).forEach(key => {
+        tween.keys.push(key);
+        tween.to.push(to[key]);
+    });
+    tween.duration = options.duration !== undefined ? options.duration : 1;
+    tween.elapsed = -(options.delay || 0);
+    tween.ease = options.ease || easings.inOutCubic;
+    tween.channel = options.channel || null;
+    tween.onUpdate = options.onUpdate || null;
+    tween.onComplete = options.onComplete || null;
+    return tween;
+}
 
-    function easeInOutCubic(t) {
-        return t < 0.5 ? 4 * t * t * t : 1 - Math.pow(-2 * t + 2, 3) / 2;
+function beginTween(tween) {
+    // Hand off from whatever is running on the same channel
+    let previous = null;
+    if (tween.channel) {
+        previous = activeTweens.find(t => t.state === TWEEN_RUNNING && t.channel === tween.channel) || null;
+        if (previous) cancelTween(previous);
     }
 
-    function animate() {
-        const elapsed = Date.now() - startTime;
-        const progress = Math.min(elapsed / duration, 1);
-        const eased = easeInOutCubic(progress);
+    tween.keys.forEach((key, k) => {
+        tween.from[k] = tween.target[key];
+        const carried = previous && previous.target === tween.target ? previous.keys.indexOf(key) : -1;
+        tween.startVelocity[k] = carried >= 0 ? previous.velocity[carried] : 0;
+        tween.velocity[k] = tween.startVelocity[k];
+    });
+    tween.from.length = tween.keys.length;
+
+    tween.state = TWEEN_RUNNING;
+    activeTweens.push(tween);
+    return tween;
+}
 
-        // Interpolate camera position
-        camera.position.x = startPos.x + (targetPos.x - startPos.x) * eased;
-        camera.position.y = startPos.y + (targetPos.y - startPos.y) * eased;
-        camera.position.z = startPos.z + (targetPos.z - startPos.z) * eased;
+function startTween(target, to, options) {
+    return beginTween(createTween(target, to, options));
+}
 
-        // Interpolate target
-        controls.target.x = startTarget.x + (targetLookAt.x - startTarget.x) * eased;
-        controls.target.y = startTarget.y + (targetLookAt.y - startTarget.y) * eased;
-        controls.target.z = startTarget.z + (targetLookAt.z - startTarget.z) * eased;
+// Stop a running tween where it is, dropping anything chained after it
+function cancelTween(tween) {
+    if (tween.state !== TWEEN_RUNNING) return;
+    tween.state = TWEEN_DONE;
+
+    let next = tween.next;
+    tween.next = null;
+    while (next) {
+        const after = next.next;
+        releaseTween(next);
+        next = after;
+    }
+}
 
-        controls.update();
+function cancelTweenChannel(channel) {
+    activeTweens.forEach(tween => {
+        if (tween.state === TWEEN_RUNNING && tween.channel === channel) cancelTween(tween);
+    });
+}
 
-        if (progress < 1) {
-            requestAnimationFrame(animate);
+function stepTween(tween, delta) {
+    tween.elapsed += delta;
+    if (tween.elapsed < 0) return; // Still in its delay
+
+    const duration = tween.duration;
+    const t = duration > 0 ? Math.min(tween.elapsed / duration, 1) : 1;
+    const eased = tween.ease(t);
+    // Hermite term: starts at the carried-over velocity, vanishes at both ends
+    const carry = (t - 2 * t * t + t * t * t) * duration;
+    const target = tween.target;
+
+    for (let k = 0; k < tween.keys.length; k++) {
+        const key = tween.keys[k];
+        const value = tween.from[k] + (tween.to[k] - tween.from[k]) * eased + tween.startVelocity[k] * carry;
+        tween.velocity[k] = delta > 0 ? (value - target[key]) / delta : 0;
+        target[key] = value;
+    }
+
+    if (tween.onUpdate) tween.onUpdate(target);
+
+    if (t >= 1) {
+        tween.state = TWEEN_DONE;
+        if (tween.onComplete) tween.onComplete(target);
+        const next = tween.next;
+        tween.next = null;
+        if (next) beginTween(next);
+    }
+}
+
+// Advance every running tween by delta seconds and recycle finished ones
+function updateTweens(delta) {
+    const count = activeTweens.length;
+    for (let i = 0; i < count; i++) {
+        if (activeTweens[i].state === TWEEN_RUNNING) stepTween(activeTweens[i], delta);
+    }
+
+    let write = 0;
+    for (let i = 0; i < activeTweens.length; i++) {
+        const tween = activeTweens[i];
+        if (tween.state === TWEEN_RUNNING) {
+            activeTweens[write++] = tween;
         } else {
-            cameraAnimating = false;
-            focusedPlanet = null; // Clear focused planet when using presets
+            releaseTween(tween);
         }
     }
+    activeTweens.length = write;
+}
 
-    animate();
+// Camera preset animation (interrupting a flight in progress blends into the new one)
+function animateCameraTo(preset) {
+    const targetPos = cameraPresets[preset].position;
+    const targetLookAt = cameraPresets[preset].target;
+
+    focusedPlanet = null; // Presets take over from planet following
+    if (kiosk && kioskSettings.controller) {
+        kiosk.pendingPreset = preset;
+    }
+
+    startTween(camera.position, targetPos, { duration: 2, channel: 'camera' });
+    startTween(controls.target, targetLookAt, { duration: 2, channel: 'cameraTarget' });
+}
+
+// Stop camera flights (user grabbed the controls or focused a body)
+function cancelCameraTweens() {
+    cancelTweenChannel('camera');
+    cancelTweenChannel('cameraTarget');
 }
 
 
@@ -992,35 +2616,84 @@ function initPlanetData() {
     });
 }
 
-// Add Atmospheres
-function addAtmospheres() {
-    // Add atmosphere to Earth, Venus, Mars, Jupiter, Saturn, Uranus, Neptune
-    const atmospherePlanets = [
-        { index: 1, color: 0xffddaa, size: 1.2, opacity: 0.4 }, // Venus
-        { index: 2, color: 0x4488ff, size: 1.1, opacity: 0.3 }, // Earth
-        { index: 3, color: 0xff4400, size: 1.1, opacity: 0.2 }, // Mars
-        { index: 4, color: 0xffaa88, size: 1.05, opacity: 0.2 }, // Jupiter
-        { index: 5, color: 0xeebb88, size: 1.05, opacity: 0.2 }, // Saturn
-        { index: 6, color: 0x88ffff, size: 1.1, opacity: 0.3 }, // Uranus
-        { index: 7, color: 0x4444ff, size: 1.1, opacity: 0.3 }  // Neptune
-    ];
+// Atmosphere shells for every planet with an atmosphere config, in one instanced draw
+function createAtmospheres() {
+    const shells = [];
+    planetData.forEach((data, index) => {
+        if (data.atmosphere && planets[index]) shells.push({ planet: planets[index], data: data });
+    });
 
-    atmospherePlanets.forEach(config => {
-        if (planets[config.index]) {
-            const planet = planets[config.index];
-            const geometry = planet.geometry.clone();
-            const material = new THREE.MeshBasicMaterial({
-                color: config.color,
-                transparent: true,
-                opacity: config.opacity,
-                side: THREE.BackSide,
-                blending: THREE.AdditiveBlending
-            });
-            const atmosphere = new THREE.Mesh(geometry, material);
-            atmosphere.scale.set(config.size, config.size, config.size);
-            planet.add(atmosphere);
-        }
+    // Every shell shares one unit sphere, scaled per planet through its instance matrix
+    const geometry = new THREE.SphereGeometry(1, 64, 32);
+    const colors = new Float32Array(shells.length * 3);
+    const params = new Float32Array(shells.length * 2);
+    const color = new THREE.Color();
+    shells.forEach((shell, i) => {
+        color.setHex(shell.data.atmosphere.color);
+        colors[i * 3] = color.r;
+        colors[i * 3 + 1] = color.g;
+        colors[i * 3 + 2] = color.b;
+        params[i * 2] = shell.data.atmosphere.opacity;
+        params[i * 2 + 1] = shell.data.atmosphere.thickness;
+    });
+    geometry.setAttribute('atmosphereColor', new THREE.InstancedBufferAttribute(colors, 3));
+    geometry.setAttribute('atmosphereParams', new THREE.InstancedBufferAttribute(params, 2));
+
+    const material = new THREE.ShaderMaterial({
+        vertexShader: `
+            attribute vec3 atmosphereColor;
+            attribute vec2 atmosphereParams; // opacity, thickness
+            varying vec3 vColor;
+            varying float vGlow;
+
+            void main() {
+                vec4 mvPosition = modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+                vec3 viewNormal = normalize((modelViewMatrix * instanceMatrix * vec4(normal, 0.0)).xyz);
+                vec3 toCamera = normalize(-mvPosition.xyz);
+
+                // Back faces only: 0 at the shell's edge, 1 where it meets the planet's limb
+                float limb = sqrt(1.0 - 1.0 / (atmosphereParams.y * atmosphereParams.y));
+                float glow = clamp(-dot(viewNormal, toCamera) / limb, 0.0, 1.0);
+                vGlow = glow * glow * atmosphereParams.x;
+                vColor = atmosphereColor;
+
+                gl_Position = projectionMatrix * mvPosition;
+            }
+        `,
+        fragmentShader: `
+            varying vec3 vColor;
+            varying float vGlow;
+
+            void main() {
+                gl_FragColor = vec4(vColor * vGlow, 1.0);
+            }
+        `,
+        side: THREE.BackSide,
+        blending: THREE.AdditiveBlending,
+        transparent: true,
+        depthWrite: false
+    });
+
+    const mesh = new THREE.InstancedMesh(geometry, material, shells.length);
+    mesh.instanceMatrix.setUsage(THREE.DynamicDrawUsage);
+    mesh.frustumCulled = false; // Instances follow the planets, far outside the unit sphere
+    scene.add(mesh);
+
+    atmospheres = { mesh: mesh, shells: shells };
+    updateAtmospheres();
+}
+
+// Follow each planet with its shell
+function updateAtmospheres() {
+    if (!atmospheres) return;
+
+    const te = atmospheres.mesh.instanceMatrix.array;
+    atmospheres.shells.forEach((shell, i) => {
+        const p = shell.planet.position;
+        writeInstanceMatrix(te, i * 16, p.x, p.y, p.z, 0, 0, 0,
+            shell.planet.geometry.parameters.radius * shell.data.atmosphere.thickness);
     });
+    atmospheres.mesh.instanceMatrix.needsUpdate = true;
 }
 
 // Create ISS
@@ -1060,12 +2733,14 @@ function createISS() {
     rightArray.position.x = 4;
     issGroup.add(rightArray);
 
-    // Position ISS around Earth
-    issGroup.userData = {
-        orbitRadius: 18, // Closer than Moon (40)
+    // Position ISS around Earth, facing it
+    addBody(issGroup, {
+        radius: 18,      // Closer than Moon (40)
         speed: 0.08,     // Faster than Moon (0.05)
-        angle: Math.PI // Start opposite to moon
-    };
+        phase: Math.PI,  // Start opposite to moon
+        parent: planets[2].userData.bodyIndex, // Earth is index 2
+        flags: BODY_FACE_PARENT
+    });
 
     iss = issGroup;
     scene.add(iss);
@@ -1084,7 +2759,7 @@ function createNebula() {
 
         // Random colors: Purple, Blue, Pink
         const colors = [0x440088, 0x004488, 0x880044];
-        const color = colors[Math.floor(Math.random() * colors.length)];
+        const color = colors[Math.floor(worldRandom() * colors.length)];
 
         const material = new THREE.MeshBasicMaterial({
             color: color,
@@ -1098,14 +2773,14 @@ function createNebula() {
         for (let j = 0; j < particleCount; j++) {
             const cloud = new THREE.Mesh(geometry, material);
             cloud.position.set(
-                (Math.random() - 0.5) * 600,
-                (Math.random() - 0.5) * 200,
-                (Math.random() - 0.5) * 600
+                (worldRandom() - 0.5) * 600,
+                (worldRandom() - 0.5) * 200,
+                (worldRandom() - 0.5) * 600
             );
-            cloud.rotation.z = Math.random() * Math.PI;
+            cloud.rotation.z = worldRandom() * Math.PI;
             cloud.scale.set(
-                1 + Math.random(),
-                1 + Math.random(),
+                1 + worldRandom(),
+                1 + worldRandom(),
                 1
             );
             nebulaGroup.add(cloud);
@@ -1116,7 +2791,7 @@ function createNebula() {
         const distance = 2000;
         nebulaGroup.position.set(
             Math.cos(angle) * distance,
-            (Math.random() - 0.5) * 1000,
+            (worldRandom() - 0.5) * 1000,
             Math.sin(angle) * distance
         );
 
@@ -1129,11 +2804,144 @@ function createNebula() {
 // Init Controls
 function initControls() {
     const speedControl = document.getElementById('speed-control');
-    if (speedControl) {
-        speedControl.addEventListener('input', (e) => {
-            timeScale = parseFloat(e.target.value);
+    const speedMultiplier = document.getElementById('speed-multiplier');
+    // Ease into the new speed rather than jumping (the multiplier spans four orders of magnitude)
+    const updateTimeScale = () => {
+        const speed = parseFloat(speedControl.value) * parseFloat(speedMultiplier.value);
+        startTween(simulationSpeed, { value: speed }, { duration: 0.5, ease: easings.outCubic, channel: 'timeScale' });
+    };
+    if (speedControl && speedMultiplier) {
+        speedControl.addEventListener('input', updateTimeScale);
+        speedMultiplier.addEventListener('change', updateTimeScale);
+    }
+
+    // Timeline scrubber (in Earth years)
+    timelineControl = document.getElementById('timeline-control');
+    timelineReadout = document.getElementById('timeline-readout');
+    if (timelineControl) {
+        timelineMax = parseFloat(timelineControl.max);
+        timelineControl.addEventListener('input', (e) => {
+            setSimTime(parseFloat(e.target.value) * ticksPerYear);
         });
+        timelineControl.addEventListener('pointerdown', () => { timelineDragging = true; });
+        window.addEventListener('pointerup', () => { timelineDragging = false; });
+        window.addEventListener('pointercancel', () => { timelineDragging = false; });
+    }
+}
+
+// Jump to any simulation time - every timeline body is evaluated from scratch
+function setSimTime(time) {
+    simTime = Math.max(0, time);
+    resetTrails(); // Trails are history, not state
+
+    if (kiosk && kioskSettings.controller) {
+        // Scrubbing on the controller moves the whole wall
+        kiosk.timeJumped = true;
+        kiosk.remoteTime = simTime;
+        kiosk.remoteAt = performance.now();
+    }
+}
+
+let timelineControl = null;
+let timelineReadout = null;
+let timelineText = '';
+let timelineValue = 0;     // Last value written to the scrubber, in its 0.01 year steps
+let timelineMax = 0;
+let timelineDragging = false;
+
+// Reflect simTime in the scrubber (skipped while the user is dragging it). The DOM is
+// only written when the slider would actually move.
+function updateTimeline() {
+    if (!timelineControl || !timelineReadout) return;
+
+    const years = simTime / ticksPerYear;
+    if (years > timelineMax) {
+        timelineMax = Math.ceil(years * 1.25);
+        timelineControl.max = timelineMax;
     }
+    const value = Math.round(years * 100) / 100;
+    if (!timelineDragging && value !== timelineValue) {
+        timelineControl.value = value;
+        timelineValue = value;
+    }
+
+    const text = years.toFixed(2);
+    if (text !== timelineText) {
+        timelineReadout.textContent = text;
+        timelineText = text;
+    }
+}
+
+// Simulation state dump
+// Evaluates the body kernel at fixed simulation times and downloads the initial
+// conditions plus every body's position and orientation, for reference_sim.py to
+// check against its NumPy implementation of the same rules.
+const simulationDumpTimes = [0, 1, 60, 600, 3600, 36000, 360000]; // Ticks
+
+function bodyLabel(i) {
+    const object = bodyStore.objects[i];
+    if (!object) return 'Asteroid ' + bodyStore.instanceId[i];
+    if (planets.includes(object)) return planetData[planets.indexOf(object)].name;
+    if (satellites.includes(object)) return 'Satellite ' + (satellites.indexOf(object) + 1);
+    if (spaceships.includes(object)) return 'Spaceship ' + (spaceships.indexOf(object) + 1);
+    return getObjectName(object);
+}
+
+// Debug: dumpSimulationState() in the console, then
+//   python3 reference_sim.py check simulation-state-<seed>.json
+function dumpSimulationState(times = simulationDumpTimes, download = true) {
+    const n = bodyStore.count;
+    const columns = {};
+    Object.keys(bodyStore.columns).forEach(key => {
+        if (!key.startsWith('pos')) columns[key] = Array.from(bodyStore[key].subarray(0, n));
+    });
+
+    const matrix = new THREE.Matrix4();
+    const snapshots = times.map(time => {
+        updateBodies(time);
+        const positions = new Array(n * 3);
+        const orientations = new Array(n * 9); // Rotation * scale, column-major 3x3
+        for (let i = 0; i < n; i++) {
+            positions[i * 3] = bodyStore.posX[i];
+            positions[i * 3 + 1] = bodyStore.posY[i];
+            positions[i * 3 + 2] = bodyStore.posZ[i];
+
+            const object = bodyStore.objects[i];
+            let te;
+            if (object) {
+                object.updateMatrix();
+                te = object.matrix.elements;
+            } else {
+                matrix.fromArray(bodyStore.instancedMeshes[bodyStore.instanceOf[i]].instanceMatrix.array, bodyStore.instanceId[i] * 16);
+                te = matrix.elements;
+            }
+            for (let k = 0; k < 3; k++) {
+                orientations[i * 9 + k * 3] = te[k * 4];
+                orientations[i * 9 + k * 3 + 1] = te[k * 4 + 1];
+                orientations[i * 9 + k * 3 + 2] = te[k * 4 + 2];
+            }
+        }
+        return { time: time, positions: positions, orientations: orientations };
+    });
+    updateBodies(simTime); // Back to the live frame
+
+    const state = {
+        version: 1,
+        seed: worldSeed,
+        count: n,
+        labels: Array.from({ length: n }, (_, i) => bodyLabel(i)),
+        columns: columns,
+        snapshots: snapshots
+    };
+
+    if (download) {
+        const link = document.createElement('a');
+        link.href = URL.createObjectURL(new Blob([JSON.stringify(state)], { type: 'application/json' }));
+        link.download = `simulation-state-${worldSeed}.json`;
+        link.click();
+        URL.revokeObjectURL(link.href);
+    }
+    return state;
 }
 
 // Motion Trail Functions
@@ -1156,6 +2964,13 @@ function createTrail(color, maxPoints) {
     return line;
 }
 
+function resetTrails() {
+    [trails.iss, trails.comet, ...trails.spaceships, ...trails.meteors].forEach(trail => {
+        trail.positions.length = 0;
+        if (trail.line) trail.line.geometry.setDrawRange(0, 0);
+    });
+}
+
 function updateTrail(trail, newPosition) {
     // Add new position
     trail.positions.push(newPosition.clone());
@@ -1165,7 +2980,11 @@ function updateTrail(trail, newPosition) {
         trail.positions.shift();
     }
 
-    // Update line geometry
+    writeTrailGeometry(trail);
+}
+
+// Copy a trail's points into its line geometry
+function writeTrailGeometry(trail) {
     if (trail.line && trail.positions.length > 1) {
         const positions = trail.line.geometry.attributes.position.array;
 
@@ -1214,29 +3033,22 @@ function createWormhole() {
     const glow = new THREE.Mesh(glowGeometry, glowMaterial);
     wormholeGroup.add(glow);
 
-    // Particles sucking in
-    const particleCount = 200;
-    const particleGeometry = new THREE.BufferGeometry();
-    const particlePositions = new Float32Array(particleCount * 3);
-
-    for (let i = 0; i < particleCount; i++) {
-        const r = 50 + Math.random() * 100;
-        const theta = Math.random() * Math.PI * 2;
-        const phi = Math.random() * Math.PI * 2;
-
-        particlePositions[i * 3] = r * Math.sin(theta) * Math.cos(phi);
-        particlePositions[i * 3 + 1] = r * Math.sin(theta) * Math.sin(phi);
-        particlePositions[i * 3 + 2] = r * Math.cos(theta);
-    }
-
-    particleGeometry.setAttribute('position', new THREE.BufferAttribute(particlePositions, 3));
-    const particleMaterial = new THREE.PointsMaterial({
-        color: 0xff00ff,
+    // Particles spiralling in from a shell around the portal
+    const particles = createParticleEmitter({
+        count: 5000,
+        lifetime: 240,
         size: 2,
-        transparent: true,
-        opacity: 0.8
+        color: 0xff00ff,
+        opacity: 0.8,
+        seed: 11,
+        motion: `
+            float theta = acos(seed.x * 2.0 - 1.0);
+            float phi = seed.y * 6.2831853 + life * 12.566371;
+            float radius = mix(50.0 + seed.z * 100.0, 8.0, life * life);
+            offset = radius * vec3(sin(theta) * cos(phi), sin(theta) * sin(phi), cos(theta));
+            fade = smoothstep(0.0, 0.1, life) * (1.0 - life);
+        `
     });
-    const particles = new THREE.Points(particleGeometry, particleMaterial);
     wormholeGroup.add(particles);
 
     // Position deep in space
@@ -1255,35 +3067,38 @@ function createUFOs() {
         const ufoGroup = new THREE.Group();
 
         // Saucer Body
-        const bodyGeometry = new THREE.SphereGeometry(5, 32, 16);
-        bodyGeometry.scale(1, 0.3, 1);
-        const bodyMaterial = new THREE.MeshStandardMaterial({
-            color: 0x888888,
-            metalness: 0.9,
-            roughness: 0.1
-        });
-        const body = new THREE.Mesh(bodyGeometry, bodyMaterial);
+        const body = new THREE.Mesh(
+            getGeometry('SphereGeometry', 5, 32, 16),
+            getMaterial('MeshStandardMaterial', {
+                color: 0x888888,
+                metalness: 0.9,
+                roughness: 0.1
+            })
+        );
+        body.scale.set(1, 0.3, 1); // Flatten on the mesh so the sphere stays shareable
         ufoGroup.add(body);
 
         // Cockpit
-        const cockpitGeometry = new THREE.SphereGeometry(2, 16, 16);
-        const cockpitMaterial = new THREE.MeshStandardMaterial({
-            color: 0x00ff00,
-            emissive: 0x00ff00,
-            emissiveIntensity: 0.5,
-            transparent: true,
-            opacity: 0.8
-        });
-        const cockpit = new THREE.Mesh(cockpitGeometry, cockpitMaterial);
+        const cockpit = new THREE.Mesh(
+            getGeometry('SphereGeometry', 2, 16, 16),
+            getMaterial('MeshStandardMaterial', {
+                color: 0x00ff00,
+                emissive: 0x00ff00,
+                emissiveIntensity: 0.5,
+                transparent: true,
+                opacity: 0.8
+            })
+        );
         cockpit.position.y = 1.5;
         ufoGroup.add(cockpit);
 
         // Lights
         const lightCount = 8;
         for (let j = 0; j < lightCount; j++) {
-            const lightGeo = new THREE.SphereGeometry(0.5, 8, 8);
-            const lightMat = new THREE.MeshBasicMaterial({ color: 0xff00ff });
-            const light = new THREE.Mesh(lightGeo, lightMat);
+            const light = new THREE.Mesh(
+                getGeometry('SphereGeometry', 0.5, 8, 8),
+                getMaterial('MeshBasicMaterial', { color: 0xff00ff })
+            );
 
             const angle = (j / lightCount) * Math.PI * 2;
             light.position.set(Math.cos(angle) * 4.5, 0, Math.sin(angle) * 4.5);
@@ -1292,16 +3107,16 @@ function createUFOs() {
 
         // Initial Position
         ufoGroup.position.set(
-            (Math.random() - 0.5) * 2000,
-            (Math.random() - 0.5) * 200,
-            (Math.random() - 0.5) * 2000
+            (worldRandom() - 0.5) * 2000,
+            (worldRandom() - 0.5) * 200,
+            (worldRandom() - 0.5) * 2000
         );
 
         ufoGroup.userData = {
             velocity: new THREE.Vector3(
-                (Math.random() - 0.5) * 2,
-                (Math.random() - 0.5) * 2,
-                (Math.random() - 0.5) * 2
+                (worldRandom() - 0.5) * 2,
+                (worldRandom() - 0.5) * 2,
+                (worldRandom() - 0.5) * 2
             ),
             changeDirTimer: 0
         };
@@ -1339,11 +3154,576 @@ function createLensFlare() {
     lensFlare.scale.set(200, 200, 1);
     scene.add(lensFlare);
 }
+// Gravity Simulation Mode
+// Planets are integrated with a symplectic leapfrog and small bodies (asteroid belt,
+// meteors, extra debris) with a Barnes-Hut octree, all inside gravity-worker.js.
+// The worker may run slower than the display, so particles are extrapolated on the GPU
+// from the last state (x + v*t + a*t^2/2) and planets the same way on the CPU. The
+// gravity clock is held to the worker's measured throughput and never runs backwards:
+// when the worker can't keep up, the simulation slows down rather than snapping back.
+const gravitySettings = {
+    GM: 6400,            // Sun's GM in scene units (a circular orbit at Earth's distance has Earth's speed)
+    particleCount: parseInt(urlParams.get('particles'), 10) || 20000,
+    theta: parseFloat(urlParams.get('theta')) || 0.8,   // Barnes-Hut opening angle
+    dt: parseFloat(urlParams.get('dt')) || 0.5,         // Integrator step in ticks
+    softening: 2,
+    beltMass: 5e-7,      // Total small-body mass in solar masses (0 disables self-gravity)
+    treeInterval: 4,     // Steps between octree rebuilds
+    maxStepsPerRequest: 8,
+    requestMs: 50,       // Worker time budget per request; sets how many steps are asked for
+    maxExtrapolation: 30 // Ticks a stale state may be extrapolated before it freezes
+};
+
+function enableGravityMode() {
+    if (gravity) return;
+
+    const GM = gravitySettings.GM;
+
+    // Resolve current positions (this can run before the first frame)
+    updateBodies(simTime);
+
+    // Heavy bodies: the sun (pinned at the origin) followed by the planets
+    const heavyCount = planets.length + 1;
+    const heavyPositions = new Float64Array(heavyCount * 3);
+    const heavyVelocities = new Float64Array(heavyCount * 3);
+    const heavyMass = new Float64Array(heavyCount);
+    heavyMass[0] = GM;
+
+    planets.forEach((planet, k) => {
+        const i = planet.userData.bodyIndex;
+        const h = (k + 1) * 3;
+        setCircularOrbitState(heavyPositions, heavyVelocities, h, bodyStore.posX[i], bodyStore.posY[i], bodyStore.posZ[i], Math.sign(bodyStore.angularSpeed[i]));
+        heavyMass[k + 1] = GM * planetData[k].mass;
+        bodyStore.flags[i] |= BODY_EXTERNAL;
+    });
+
+    // Small bodies seeded from the asteroid belt and the meteor shower, then padded
+    // with extra debris cloned from random asteroids
+    const asteroidCount = asteroidBelt.count;
+    const firstAsteroid = asteroidBelt.userData.firstBody;
+    const count = Math.max(gravitySettings.particleCount, asteroidCount + meteors.length);
+    const positions = new Float32Array(count * 3);
+    const velocities = new Float32Array(count * 3);
+
+    for (let n = 0; n < count; n++) {
+        const k = n * 3;
+        if (n < asteroidCount) {
+            const i = firstAsteroid + n;
+            setCircularOrbitState(positions, velocities, k, bodyStore.posX[i], bodyStore.posY[i], bodyStore.posZ[i], 1);
+        } else if (n < asteroidCount + meteors.length) {
+            const meteor = meteors[n - asteroidCount];
+            positions[k] = meteor.position.x;
+            positions[k + 1] = meteor.position.y;
+            positions[k + 2] = meteor.position.z;
+            velocities[k] = meteor.userData.velocity.x;
+            velocities[k + 1] = meteor.userData.velocity.y;
+            velocities[k + 2] = meteor.userData.velocity.z;
+        } else {
+            const i = firstAsteroid + Math.floor(worldRandom() * asteroidCount);
+            const r = bodyStore.orbitRadius[i] + (worldRandom() - 0.5) * 20;
+            const angle = worldRandom() * Math.PI * 2;
+            const y = bodyStore.height[i] + (worldRandom() - 0.5) * 4;
+            setCircularOrbitState(positions, velocities, k, Math.cos(angle) * r, y, Math.sin(angle) * r, 1);
+        }
+    }
+
+    // Particles render from an interleaved position/velocity/acceleration buffer
+    const stateBuffer = new THREE.InterleavedBuffer(new Float32Array(count * 9), 9);
+    stateBuffer.setUsage(THREE.DynamicDrawUsage);
+    for (let n = 0; n < count; n++) {
+        stateBuffer.array.set(positions.subarray(n * 3, n * 3 + 3), n * 9);
+        stateBuffer.array.set(velocities.subarray(n * 3, n * 3 + 3), n * 9 + 3);
+    }
+
+    const geometry = new THREE.BufferGeometry();
+    geometry.setAttribute('position', new THREE.InterleavedBufferAttribute(stateBuffer, 3, 0));
+    geometry.setAttribute('velocity', new THREE.InterleavedBufferAttribute(stateBuffer, 3, 3));
+    geometry.setAttribute('acceleration', new THREE.InterleavedBufferAttribute(stateBuffer, 3, 6));
+
+    const material = new THREE.ShaderMaterial({
+        uniforms: {
+            elapsed: { value: 0 },
+            color: { value: new THREE.Color(0x999999) },
+            size: { value: 2 }
+        },
+        vertexShader: `
+            uniform float elapsed;
+            uniform float size;
+            attribute vec3 velocity;
+            attribute vec3 acceleration;
+
+            void main() {
+                vec3 p = position + velocity * elapsed + 0.5 * acceleration * elapsed * elapsed;
+                vec4 mvPosition = modelViewMatrix * vec4(p, 1.0);
+                gl_PointSize = size * (300.0 / -mvPosition.z);
+                gl_Position = projectionMatrix * mvPosition;
+            }
+        `,
+        fragmentShader: `
+            uniform vec3 color;
+
+            void main() {
+                if (length(gl_PointCoord - 0.5) > 0.5) discard;
+                gl_FragColor = vec4(color, 1.0);
+            }
+        `
+    });
+
+    const points = new THREE.Points(geometry, material);
+    points.frustumCulled = false;
+    scene.add(points);
+
+    const worker = new Worker('gravity-worker.js');
+    gravity = {
+        worker: worker,
+        points: points,
+        stateBuffer: stateBuffer,
+        spareBuffer: new Float32Array(count * 9),
+        inFlight: false,
+        clock: 0,       // Tick displayed; only ever moves forward
+        stateTime: 0,   // Tick of the newest state from the worker
+        requestedTime: 0,
+        heavyPositions: heavyPositions.slice(),
+        heavyVelocities: heavyVelocities.slice(),
+        heavyAccelerations: new Float64Array(heavyCount * 3),
+        stepMs: 0,      // Worker time for the last request
+        msPerStep: 0    // Smoothed worker time per integrator step (0 until measured)
+    };
+
+    worker.onmessage = (event) => onGravityState(event.data);
+    worker.postMessage({
+        type: 'init',
+        params: {
+            G: 1,
+            theta: gravitySettings.theta,
+            dt: gravitySettings.dt,
+            softening: gravitySettings.softening,
+            particleMass: GM * gravitySettings.beltMass / count,
+            treeInterval: gravitySettings.treeInterval
+        },
+        heavyMass: heavyMass,
+        heavyPositions: heavyPositions,
+        heavyVelocities: heavyVelocities,
+        positions: positions,
+        velocities: velocities
+    }, [heavyPositions.buffer, heavyVelocities.buffer, positions.buffer, velocities.buffer]);
+
+    // The simulation takes over the belt and the meteors
+    asteroidBelt.visible = false;
+    meteors.forEach(meteor => { meteor.visible = false; });
+}
+
+// Position plus circular Keplerian velocity around the sun (direction = +1 counter-clockwise seen from +y)
+function setCircularOrbitState(positions, velocities, offset, x, y, z, direction) {
+    const r = Math.sqrt(x * x + z * z);
+    const v = Math.sqrt(gravitySettings.GM / r) * direction;
+    positions[offset] = x;
+    positions[offset + 1] = y;
+    positions[offset + 2] = z;
+    velocities[offset] = -z / r * v;
+    velocities[offset + 1] = 0;
+    velocities[offset + 2] = x / r * v;
+}
+
+function onGravityState(message) {
+    if (!gravity) return;
+
+    // Swap the filled buffer in; the one it replaces goes back for the next step
+    gravity.spareBuffer = gravity.stateBuffer.array;
+    gravity.stateBuffer.array = message.buffer;
+    gravity.stateBuffer.needsUpdate = true;
+
+    gravity.heavyPositions = message.heavyPositions;
+    gravity.heavyVelocities = message.heavyVelocities;
+    gravity.heavyAccelerations = message.heavyAccelerations;
+    gravity.stateTime = gravity.requestedTime;
+    gravity.stepMs = message.stepMs;
+    gravity.inFlight = false;
+
+    const perStep = message.stepMs / message.steps;
+    gravity.msPerStep = gravity.msPerStep ? gravity.msPerStep * 0.7 + perStep * 0.3 : perStep;
+}
+
+// `frameTicks` is the real time the frame covered; the integrator only runs forward
+function updateGravity(step, frameTicks) {
+    const settings = gravitySettings;
+
+    // Advance the clock no faster than the worker can integrate, easing off as the lead
+    // over the newest state grows, and never past the extrapolation limit. Until the
+    // first batch is timed the clock waits for it.
+    if (step > 0) {
+        let limit = gravity.requestedTime;
+        let advance = step;
+        if (gravity.msPerStep) {
+            const throughput = settings.dt / gravity.msPerStep * 1000; // Ticks per second
+            const lead = (gravity.clock - gravity.stateTime) / settings.maxExtrapolation;
+            advance = Math.min(step, throughput * frameTicks / 60 * Math.max(1 - lead, 0));
+            limit = gravity.stateTime + settings.maxExtrapolation;
+        }
+        gravity.clock = Math.max(gravity.clock, Math.min(gravity.clock + advance, limit));
+    }
+
+    // Once the previous batch is back, ask for enough steps to pass the clock, bounded by
+    // how many the worker can finish within the request budget
+    if (!gravity.inFlight && gravity.clock + settings.dt > gravity.stateTime) {
+        const budget = gravity.msPerStep ? Math.floor(settings.requestMs / gravity.msPerStep) : settings.maxStepsPerRequest;
+        const behind = Math.floor((gravity.clock - gravity.stateTime) / settings.dt) + 1;
+        const steps = Math.max(1, Math.min(behind, budget, settings.maxStepsPerRequest));
+        gravity.requestedTime = gravity.stateTime + steps * settings.dt;
+
+        const buffer = gravity.spareBuffer;
+        gravity.spareBuffer = null;
+        gravity.inFlight = true;
+        gravity.worker.postMessage({ type: 'step', steps: steps, buffer: buffer }, [buffer.buffer]);
+    }
+
+    // A fresh state can be slightly ahead of the clock; extrapolating back to the clock
+    // (a fraction of a request) keeps what is shown moving forward
+    const elapsed = gravity.clock - gravity.stateTime;
+    gravity.points.material.uniforms.elapsed.value = elapsed;
+
+    // Planets follow the same extrapolation on the CPU
+    planets.forEach((planet, k) => {
+        const i = planet.userData.bodyIndex;
+        const h = (k + 1) * 3;
+        const p = gravity.heavyPositions, v = gravity.heavyVelocities, a = gravity.heavyAccelerations;
+        bodyStore.posX[i] = p[h] + v[h] * elapsed + 0.5 * a[h] * elapsed * elapsed;
+        bodyStore.posY[i] = p[h + 1] + v[h + 1] * elapsed + 0.5 * a[h + 1] * elapsed * elapsed;
+        bodyStore.posZ[i] = p[h + 2] + v[h + 2] * elapsed + 0.5 * a[h + 2] * elapsed * elapsed;
+    });
+}
+
+function disableGravityMode() {
+    if (!gravity) return;
+
+    gravity.worker.terminate();
+    disposeObject(gravity.points);
+
+    // Planets return to their kinematic orbits, picking up from where gravity left them
+    planets.forEach(planet => {
+        const i = planet.userData.bodyIndex;
+        const angle = Math.atan2(bodyStore.posZ[i], bodyStore.posX[i]);
+        bodyStore.phase[i] = angle - bodyStore.angularSpeed[i] * simTime;
+        bodyStore.flags[i] &= ~BODY_EXTERNAL;
+    });
+    asteroidBelt.visible = true;
+
+    gravity = null;
+}
+
+// Spatial Events
+const wormholeApproachRadius = 150;
+
+function initSpatialGrid() {
+    addSpatialEntry(sunGroup, SPATIAL_BODY, 50);
+    planets.forEach(planet => addSpatialEntry(planet, SPATIAL_BODY, planet.geometry.parameters.radius));
+    addSpatialEntry(moon, SPATIAL_BODY, moon.geometry.parameters.radius);
+    satellites.forEach(satellite => addSpatialEntry(satellite, SPATIAL_CRAFT, 12));
+    spaceships.forEach(ship => addSpatialEntry(ship, SPATIAL_CRAFT, 10));
+    addSpatialEntry(iss, SPATIAL_CRAFT, 5);
+    addSpatialEntry(comet, SPATIAL_CRAFT, 4);
+    addSpatialEntry(wormhole, SPATIAL_WORMHOLE, 30);
+    ufos.forEach(ufo => addSpatialEntry(ufo, SPATIAL_UFO, 5));
+}
+
+// Raise proximity events as DOM events on document:
+//   'meteorimpact'     detail: { meteor, body }
+//   'wormholeapproach' detail: { ufo, wormhole }
+function checkSpatialEvents() {
+    const hits = spatialQueryResults;
+
+    // Each meteor only looks at the cells around itself
+    if (!gravity) {
+        meteors.forEach(meteor => {
+            if (!meteor.visible) return;
+            const p = meteor.position;
+            const count = querySpatialRadius(p.x, p.y, p.z, 1, SPATIAL_BODY, hits);
+            if (count > 0) {
+                const body = spatialGrid.objects[hits[0]];
+                // Burns up; the slot reappears at the start of its next cycle
+                meteor.userData.impactCycle = meteor.userData.cycle;
+                meteor.visible = false;
+                document.dispatchEvent(new CustomEvent('meteorimpact', { detail: { meteor: meteor, body: body } }));
+            }
+        });
+    }
+
+    // UFOs entering the wormhole's approach sphere (edge-triggered)
+    if (wormhole) {
+        const p = wormhole.position;
+        const count = querySpatialRadius(p.x, p.y, p.z, wormholeApproachRadius, SPATIAL_UFO, hits);
+        const inside = new Set();
+        for (let k = 0; k < count; k++) {
+            inside.add(spatialGrid.objects[hits[k]]);
+        }
+        ufos.forEach(ufo => {
+            const isInside = inside.has(ufo);
+            if (isInside && !ufo.userData.nearWormhole) {
+                document.dispatchEvent(new CustomEvent('wormholeapproach', { detail: { ufo: ufo, wormhole: wormhole } }));
+            }
+            ufo.userData.nearWormhole = isInside;
+        });
+    }
+}
+
+// A meteor burning up leaves a brief flash where it hit
+const impactFlashes = [];
+
+function onMeteorImpact(event) {
+    let flash = impactFlashes.find(f => !f.visible);
+    if (!flash) {
+        flash = new THREE.Mesh(getGeometry('SphereGeometry', 1, 8, 8), new THREE.MeshBasicMaterial({
+            color: 0xffcc66,
+            transparent: true,
+            blending: THREE.AdditiveBlending,
+            depthWrite: false
+        }));
+        impactFlashes.push(flash);
+        scene.add(flash);
+    }
+
+    flash.position.copy(event.detail.meteor.position);
+    flash.scale.set(1, 1, 1);
+    flash.material.opacity = 1;
+    flash.visible = true;
+    startTween(flash.scale, { x: 8, y: 8, z: 8 }, { duration: 0.6, ease: easings.outCubic });
+    startTween(flash.material, { opacity: 0 }, {
+        duration: 0.6,
+        ease: easings.outCubic,
+        onComplete: () => { flash.visible = false; }
+    });
+}
+
+// The portal swells as a UFO approaches; repeated approaches hand off on one channel
+function onWormholeApproach(event) {
+    const scale = event.detail.wormhole.scale;
+    startTween(scale, { x: 1.3, y: 1.3, z: 1.3 }, { duration: 0.4, ease: easings.outCubic, channel: 'wormhole-pulse' })
+        .chain(scale, { x: 1, y: 1, z: 1 }, { duration: 0.8 });
+}
+
+// Lighting profiles
+// ?lighting=full|balanced|fast (or L to cycle). Small and decorative bodies that use
+// MeshStandardMaterial (asteroids, craft, UFOs, the moon, the comet nucleus) drop to a
+// cheaper shading tier, and planets keep full PBR only while the camera is close.
+//   standard  MeshStandardMaterial, every scene light evaluated per fragment
+//   lambert   MeshLambertMaterial, lights evaluated per vertex
+//   sun       one diffuse term towards the sun at the origin, per vertex, no scene lights
+const lightingProfiles = {
+    full: { decorative: 'standard', planets: 'standard', planetPbrDistance: Infinity },
+    balanced: { decorative: 'lambert', planets: 'lambert', planetPbrDistance: 800 },
+    fast: { decorative: 'sun', planets: 'lambert', planetPbrDistance: 400 }
+};
+
+// Rough per-fragment cost of each tier relative to standard (used by lightingReport)
+const shadingTierCost = { standard: 1, lambert: 0.2, sun: 0.1 };
+
+const lightingState = {
+    profile: lightingProfiles[urlParams.get('lighting')] ? urlParams.get('lighting') : 'full',
+    sources: new Map(),  // mesh -> its original MeshStandardMaterial
+    variants: new Map()  // standard material -> { lambert, sun }
+};
+
+const sunShadedVertexShader = `
+    varying float vSun;
+    varying vec2 vUv;
+
+    void main() {
+        vec4 local = vec4(position, 1.0);
+        vec3 objectNormal = normal;
+        #ifdef USE_INSTANCING
+            local = instanceMatrix * local;
+            objectNormal = mat3(instanceMatrix) * objectNormal;
+        #endif
+        vec4 world = modelMatrix * local;
+        vec3 worldNormal = normalize(mat3(modelMatrix) * objectNormal);
+        vSun = max(dot(worldNormal, normalize(-world.xyz)), 0.0);
+        vUv = uv;
+        gl_Position = projectionMatrix * viewMatrix * world;
+    }
+`;
+
+const sunShadedFragmentShader = `
+    uniform vec3 color;
+    uniform vec3 emissive;
+    uniform vec3 sunColor;
+    uniform vec3 ambient;
+    uniform float opacity;
+    #ifdef USE_SUN_MAP
+        uniform sampler2D map;
+    #endif
+    varying float vSun;
+    varying vec2 vUv;
+
+    void main() {
+        vec3 albedo = color;
+        #ifdef USE_SUN_MAP
+            albedo *= texture2D(map, vUv).rgb;
+        #endif
+        gl_FragColor = vec4(albedo * (ambient + sunColor * vSun) + emissive, opacity);
+    }
+`;
+
+// Cheaper stand-in for a standard material, built once per material and tier
+function shadingVariant(source, tier) {
+    let variants = lightingState.variants.get(source);
+    if (!variants) {
+        variants = {};
+        lightingState.variants.set(source, variants);
+    }
+    if (variants[tier]) return variants[tier];
+
+    if (tier === 'lambert') {
+        variants[tier] = new THREE.MeshLambertMaterial({
+            color: source.color,
+            map: source.map,
+            emissive: source.emissive,
+            emissiveIntensity: source.emissiveIntensity,
+            transparent: source.transparent,
+            opacity: source.opacity
+        });
+    } else {
+        variants[tier] = new THREE.ShaderMaterial({
+            uniforms: {
+                color: { value: source.color.clone() },
+                emissive: { value: source.emissive.clone().multiplyScalar(source.emissiveIntensity) },
+                sunColor: { value: new THREE.Color(0xffee88) }, // Matches the sun's point light
+                ambient: { value: new THREE.Color(0x202030) },
+                map: { value: source.map },
+                opacity: { value: source.opacity }
+            },
+            defines: source.map ? { USE_SUN_MAP: '' } : {},
+            transparent: source.transparent,
+            vertexShader: sunShadedVertexShader,
+            fragmentShader: sunShadedFragmentShader
+        });
+    }
+    return variants[tier];
+}
+
+// Called when a standard material is disposed
+function disposeShadingVariants(material) {
+    const variants = lightingState.variants.get(material);
+    if (!variants) return;
+    Object.values(variants).forEach(variant => variant.dispose());
+    lightingState.variants.delete(material);
+}
+
+function setMeshShadingTier(mesh, tier) {
+    const source = lightingState.sources.get(mesh);
+    const material = tier === 'standard' ? source : shadingVariant(source, tier);
+    if (mesh.material !== material) mesh.material = material;
+    mesh.userData.shadingTier = tier;
+}
+
+// Switch every standard-material mesh to the tiers of `name`
+function setLightingProfile(name) {
+    if (!lightingProfiles[name]) return;
+    lightingState.profile = name;
+    const profile = lightingProfiles[name];
+
+    scene.traverse(child => {
+        if (!child.isMesh) return;
+        if (!lightingState.sources.has(child)) {
+            if (!child.material || child.material.type !== 'MeshStandardMaterial') return;
+            lightingState.sources.set(child, child.material);
+        }
+        setMeshShadingTier(child, planets.includes(child) ? profile.planets : profile.decorative);
+    });
+    updateLighting();
+}
+
+function cycleLightingProfile() {
+    const names = Object.keys(lightingProfiles);
+    setLightingProfile(names[(names.indexOf(lightingState.profile) + 1) % names.length]);
+}
+
+// Planets inside planetPbrDistance of the camera get full PBR (with 10% hysteresis)
+function updateLighting() {
+    const profile = lightingProfiles[lightingState.profile];
+    if (profile.planets === 'standard') return;
+
+    planets.forEach(planet => {
+        if (!lightingState.sources.has(planet)) return; // Earth has its own shader
+        const distance = camera.position.distanceTo(planet.position);
+        const close = planet.userData.shadingTier === 'standard' ? 1.1 : 1;
+        const tier = distance < profile.planetPbrDistance * close ? 'standard' : profile.planets;
+        if (tier !== planet.userData.shadingTier) setMeshShadingTier(planet, tier);
+    });
+}
+
+// Debug: linked shader programs and an estimate of the frame's lighting fragment cost,
+// from each mesh's projected bounding-sphere area weighted by its tier's cost
+function lightingReport() {
+    const focal = window.innerHeight / 2 / Math.tan(THREE.MathUtils.degToRad(camera.fov / 2));
+    const screenArea = window.innerWidth * window.innerHeight;
+    const sphere = new THREE.Sphere();
+    const matrix = new THREE.Matrix4();
+    const coverage = (center, radius) => {
+        const depth = center.distanceTo(camera.position);
+        if (depth <= radius) return screenArea;
+        const r = radius * focal / depth;
+        return Math.min(Math.PI * r * r, screenArea);
+    };
+
+    const tiers = {};
+    Object.keys(shadingTierCost).forEach(tier => {
+        tiers[tier] = { meshes: 0, instances: 0, fragments: 0, cost: 0 };
+    });
+    lightingState.sources.forEach((source, mesh) => {
+        if (!mesh.visible || !mesh.geometry) return;
+        const entry = tiers[mesh.userData.shadingTier || 'standard'];
+        if (!mesh.geometry.boundingSphere) mesh.geometry.computeBoundingSphere();
+
+        let fragments = 0;
+        const count = mesh.isInstancedMesh ? mesh.count : 1;
+        for (let i = 0; i < count; i++) {
+            sphere.copy(mesh.geometry.boundingSphere);
+            if (mesh.isInstancedMesh) {
+                mesh.getMatrixAt(i, matrix);
+                sphere.applyMatrix4(matrix);
+            }
+            sphere.applyMatrix4(mesh.matrixWorld);
+            fragments += coverage(sphere.center, sphere.radius);
+        }
+
+        entry.meshes++;
+        entry.instances += count;
+        entry.fragments += Math.round(fragments);
+        entry.cost += fragments * shadingTierCost[mesh.userData.shadingTier || 'standard'];
+    });
+
+    let total = 0;
+    Object.values(tiers).forEach(entry => {
+        total += entry.cost;
+        entry.cost = Math.round(entry.cost);
+    });
+
+    return {
+        profile: lightingState.profile,
+        programs: renderer.info.programs ? renderer.info.programs.length : 0,
+        fragmentCost: Math.round(total), // Standard-material fragment equivalents
+        tiers: tiers
+    };
+}
+
+function reportLightingCost() {
+    const report = lightingReport();
+    console.table(report.tiers);
+    console.log(`Lighting profile "${report.profile}": ${report.programs} shader programs, ~${report.fragmentCost} standard-fragment equivalents`);
+    return report;
+}
+
 // Window resize
 function onWindowResize() {
+    if (capture) return; // Capture keeps its fixed output resolution
+
     camera.aspect = window.innerWidth / window.innerHeight;
+    if (kiosk && !kioskSettings.controller) {
+        applyKioskViewport(); // Also updates the projection matrix
+    }
     camera.updateProjectionMatrix();
     renderer.setSize(window.innerWidth, window.innerHeight);
+    updateParticlePointScale();
 }
 
 // Keyboard shortcuts
@@ -1371,169 +3751,470 @@ function onKeyDown(event) {
         case 'R':
             animateCameraTo('overview');
             break;
+        case 'l':
+        case 'L':
+            cycleLightingProfile();
+            break;
+        case 'd':
+        case 'D':
+            toggleDebugOverlay();
+            break;
+        case 'g':
+        case 'G':
+            if (gravity) {
+                disableGravityMode();
+            } else {
+                enableGravityMode();
+            }
+            break;
     }
 }
 
-// Animation loop
-function animate() {
-    requestAnimationFrame(animate);
+// Frame capture
+// ?capture=1 steps the simulation at a fixed 1/fps per frame at a fixed resolution, reads
+// every rendered frame back and POSTs it to capture_server.py, which writes a numbered
+// image sequence. The simulation only advances when the readback queue has room, so a
+// busy machine slows the capture down instead of dropping frames.
+//   ?capture=1&fps=30&width=1920&height=1080&frames=600&format=png|raw&seed=42
+//   &endpoint=http://localhost:8765
+const captureSettings = {
+    enabled: urlParams.get('capture') === '1',
+    fps: parseFloat(urlParams.get('fps')) || 60,
+    width: parseInt(urlParams.get('width'), 10) || 1920,
+    height: parseInt(urlParams.get('height'), 10) || 1080,
+    frames: parseInt(urlParams.get('frames'), 10) || 0, // 0 = until the tab is closed
+    format: urlParams.get('format') === 'raw' ? 'raw' : 'png', // raw = RGBA via async PBO readback
+    endpoint: urlParams.get('endpoint') || 'http://localhost:8765',
+    maxInFlight: 4 // Frames being read back or uploaded at once
+};
+let capture = null; // Active capture state (see startCapture)
+
+function startCapture() {
+    const gl = renderer.getContext();
+    const raw = captureSettings.format === 'raw' && typeof WebGL2RenderingContext !== 'undefined' &&
+        gl instanceof WebGL2RenderingContext;
+    if (captureSettings.format === 'raw' && !raw) {
+        console.warn('Raw capture needs WebGL2, falling back to PNG');
+    }
 
-    tick += 0.01;
+    renderer.setPixelRatio(1);
+    renderer.setSize(captureSettings.width, captureSettings.height, false);
+    renderer.setClearColor(0x000000, 1); // Opaque frames, the page background isn't captured
+    camera.aspect = captureSettings.width / captureSettings.height;
+    camera.updateProjectionMatrix();
+    updateParticlePointScale();
+
+    capture = {
+        gl: gl,
+        raw: raw,
+        frame: 0,
+        inFlight: 0,
+        readbacks: [],   // Raw frames waiting for their GPU fence
+        buffers: [],     // Recycled pixel pack buffers
+        finished: false
+    };
+    console.log(`Capturing ${captureSettings.width}x${captureSettings.height} at ${captureSettings.fps} fps, seed ${worldSeed}`);
+}
 
-    // Rotate planets in orbit
-    planets.forEach(planet => {
-        planet.userData.angle += planet.userData.speed * timeScale;
-        planet.position.x = Math.cos(planet.userData.angle) * planet.userData.distance;
-        planet.position.z = Math.sin(planet.userData.angle) * planet.userData.distance;
+// A frame may be rendered once assets are on the GPU and the queue has room
+function captureReady() {
+    if (capture.finished) return false;
+    if (pendingAssetLoads > 0 || pendingTextureUploads.length > 0) return false;
+    return capture.inFlight < captureSettings.maxInFlight;
+}
 
-        // Rotate planet on its axis
-        planet.rotation.y += 0.01 * timeScale;
+// Called right after renderer.render, while the drawing buffer still holds the frame
+function captureFrame() {
+    const index = capture.frame++;
+    capture.inFlight++;
+
+    if (capture.raw) {
+        // Copy into a pixel pack buffer and fence it; pollCaptureReadbacks maps it later
+        const gl = capture.gl;
+        const bytes = captureSettings.width * captureSettings.height * 4;
+        const buffer = capture.buffers.pop() || gl.createBuffer();
+        gl.bindBuffer(gl.PIXEL_PACK_BUFFER, buffer);
+        gl.bufferData(gl.PIXEL_PACK_BUFFER, bytes, gl.STREAM_READ);
+        gl.readPixels(0, 0, captureSettings.width, captureSettings.height, gl.RGBA, gl.UNSIGNED_BYTE, 0);
+        gl.bindBuffer(gl.PIXEL_PACK_BUFFER, null);
+        capture.readbacks.push({
+            index: index,
+            buffer: buffer,
+            sync: gl.fenceSync(gl.SYNC_GPU_COMMANDS_COMPLETE, 0)
+        });
+        gl.flush();
+    } else {
+        renderer.domElement.toBlob(blob => sendCaptureFrame(index, blob), 'image/png');
+    }
 
-        // Update Earth's day/night shader with sun position
-        if (planet.userData.nightMaterial) {
-            // Sun is at origin (0, 0, 0)
-            planet.userData.nightMaterial.uniforms.sunDirection.value.set(0, 0, 0);
-        }
+    pollCaptureReadbacks();
 
-        // Animate Earth's clouds (rotate slightly faster than planet)
-        if (planet.userData.clouds) {
-            planet.userData.clouds.rotation.y += 0.012 * timeScale;
-        }
+    if (captureSettings.frames > 0 && capture.frame >= captureSettings.frames) {
+        capture.finished = true;
+    }
+}
 
-        // Animate Saturn's rings (subtle rotation)
-        if (planet.userData.rings) {
-            planet.userData.rings.forEach((ring, index) => {
-                ring.rotation.z += (0.0001 + index * 0.00005) * timeScale;
-            });
-        }
-    });
-    // Animate satellites
-    satellites.forEach(satellite => {
-        satellite.userData.angle += satellite.userData.speed * timeScale;
-        satellite.position.x = Math.cos(satellite.userData.angle) * satellite.userData.distance;
-        satellite.position.z = Math.sin(satellite.userData.angle) * satellite.userData.distance;
+// Hand finished GPU readbacks to the uploader without stalling on the fence
+function pollCaptureReadbacks() {
+    const gl = capture.gl;
+    while (capture.readbacks.length > 0) {
+        const readback = capture.readbacks[0];
+        const status = gl.clientWaitSync(readback.sync, 0, 0);
+        if (status !== gl.ALREADY_SIGNALED && status !== gl.CONDITION_SATISFIED) break;
+
+        capture.readbacks.shift();
+        gl.deleteSync(readback.sync);
+        const pixels = new Uint8Array(captureSettings.width * captureSettings.height * 4);
+        gl.bindBuffer(gl.PIXEL_PACK_BUFFER, readback.buffer);
+        gl.getBufferSubData(gl.PIXEL_PACK_BUFFER, 0, pixels);
+        gl.bindBuffer(gl.PIXEL_PACK_BUFFER, null);
+        capture.buffers.push(readback.buffer);
+        sendCaptureFrame(readback.index, pixels);
+    }
+}
 
-        // Rotate satellite slowly
-        satellite.rotation.y += 0.02 * timeScale;
-    });
+function sendCaptureFrame(index, body) {
+    const format = capture.raw ? 'rgba' : 'png';
+    const url = `${captureSettings.endpoint}/frame/${index}?format=${format}` +
+        `&width=${captureSettings.width}&height=${captureSettings.height}`;
+
+    fetch(url, { method: 'POST', body: body })
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        })
+        .catch(error => {
+            console.error(`Capture of frame ${index} failed, stopping:`, error);
+            capture.finished = true;
+        })
+        .finally(() => {
+            capture.inFlight--;
+            if (capture.finished && capture.inFlight === 0 && capture.readbacks.length === 0) {
+                fetch(`${captureSettings.endpoint}/done?frames=${capture.frame}&fps=${captureSettings.fps}`, { method: 'POST' })
+                    .catch(() => {});
+                console.log(`Capture finished after ${capture.frame} frames`);
+            }
+        });
+}
 
-    // Animate spaceships
-    spaceships.forEach((ship, index) => {
-        ship.userData.angle += ship.userData.speed * timeScale;
-        ship.position.x = Math.cos(ship.userData.angle) * ship.userData.distance;
-        ship.position.z = Math.sin(ship.userData.angle) * ship.userData.distance;
-
-        // Gentle vertical movement
-        ship.position.y += ship.userData.verticalSpeed * timeScale;
-        if (Math.abs(ship.position.y) > 100) {
-            ship.userData.verticalSpeed *= -1;
-        }
+// Kiosk mode
+// Displays on a wall follow kiosk_server.py instead of their own clocks:
+//   ?kiosk=ws://host:8766&tile=col,row&grid=cols,rows   (a display, input disabled)
+//   ?kiosk=ws://host:8766&role=controller                (the one interactive screen)
+// The server broadcasts binary state deltas (see kiosk_server.py for the layout) at
+// ~10 Hz; between messages each client extrapolates simTime and eases its camera.
+const kioskSettings = {
+    url: urlParams.get('kiosk'),
+    controller: urlParams.get('role') === 'controller',
+    tile: (urlParams.get('tile') || '0,0').split(',').map(Number),
+    grid: (urlParams.get('grid') || '1,1').split(',').map(Number),
+    sendInterval: 0.1 // Seconds between controller updates
+};
+const KIOSK_STATE = 1;
+const KIOSK_CONTROL = 2;
+const KIOSK_TIME = 1;
+const KIOSK_SCALE = 2;
+const KIOSK_FOCUS = 4;
+const KIOSK_PRESET = 8;
+const KIOSK_CAMERA = 16;
+const kioskPresets = Object.keys(cameraPresets);
+let kiosk = null; // Connection and remote clock (see startKiosk)
+
+function startKiosk() {
+    kiosk = {
+        socket: null,
+        seq: 0,
+        remoteTime: simTime,       // Last authoritative simTime
+        remoteAt: performance.now(),
+        remoteScale: timeScale,
+        pose: null,                // Streamed camera pose to ease towards (displays)
+        // Controller bookkeeping
+        sendTimer: 0,
+        sentScale: timeScale,
+        sentFocus: -1,
+        sentPose: new Float32Array(6),
+        pendingPreset: null,
+        timeJumped: false,
+        interacting: false
+    };
 
-        // Point ship in direction of movement
-        ship.rotation.y = ship.userData.angle + Math.PI / 2;
+    if (kioskSettings.controller) {
+        controls.addEventListener('start', () => kiosk.interacting = true);
+        controls.addEventListener('end', () => kiosk.interacting = false);
+    } else {
+        controls.enabled = false; // Displays are driven entirely by the server
+        applyKioskViewport();
+    }
+    connectKiosk();
+}
 
-        // Update motion trail
-        if (trails.spaceships[index]) {
-            updateTrail(trails.spaceships[index], ship.position);
-        }
-    });
+function connectKiosk() {
+    const socket = new WebSocket(kioskSettings.url);
+    socket.binaryType = 'arraybuffer';
+    socket.onmessage = event => readKioskState(event.data);
+    socket.onclose = () => setTimeout(connectKiosk, 2000); // Keep retrying, the server may restart
+    kiosk.socket = socket;
+}
 
+// This display's slice of one big virtual screen
+function applyKioskViewport() {
+    const [col, row] = kioskSettings.tile;
+    const [cols, rows] = kioskSettings.grid;
+    const width = window.innerWidth;
+    const height = window.innerHeight;
+    camera.aspect = (width * cols) / (height * rows);
+    camera.setViewOffset(width * cols, height * rows, width * col, height * row, width, height);
+}
 
+function readKioskState(buffer) {
+    const view = new DataView(buffer);
+    if (view.getUint8(0) !== KIOSK_STATE) return;
+    const mask = view.getUint8(1);
+    let offset = 4;
 
-    // Animate asteroids
-    asteroids.forEach(asteroid => {
-        asteroid.userData.angle += asteroid.userData.speed * timeScale;
-        asteroid.position.x = Math.cos(asteroid.userData.angle) * asteroid.userData.distance;
-        asteroid.position.z = Math.sin(asteroid.userData.angle) * asteroid.userData.distance;
+    if (mask & KIOSK_TIME) {
+        kiosk.remoteTime = view.getFloat64(offset, true);
+        kiosk.remoteAt = performance.now();
+        offset += 8;
+    }
+    // The server echoes the controller's own scale and focus back to it; obeying them
+    // would cut a running speed tween short at whatever value was last sent
+    if (mask & KIOSK_SCALE) {
+        kiosk.remoteScale = view.getFloat32(offset, true);
+        if (!kioskSettings.controller) {
+            kiosk.sentScale = kiosk.remoteScale;
+            cancelTweenChannel('timeScale');
+            timeScale = kiosk.remoteScale;
+        }
+        offset += 4;
+    }
+    let focus = null;
+    if (mask & KIOSK_FOCUS) {
+        focus = view.getInt8(offset);
+        if (!kioskSettings.controller) kiosk.sentFocus = focus;
+        offset += 1;
+    }
+    if (mask & KIOSK_PRESET) {
+        const preset = kioskPresets[view.getUint8(offset)];
+        if (!kioskSettings.controller && preset) {
+            kiosk.pose = null;
+            animateCameraTo(preset);
+        }
+        offset += 1;
+    }
+    // After the preset, which clears focus when it starts
+    if (focus !== null && !kioskSettings.controller) {
+        focusedPlanet = planets[focus] || null;
+    }
+    if (mask & KIOSK_CAMERA) {
+        if (!kioskSettings.controller) {
+            kiosk.pose = kiosk.pose || new Float32Array(6);
+            for (let i = 0; i < 6; i++) {
+                kiosk.pose[i] = view.getFloat32(offset + i * 4, true);
+            }
+            cancelCameraTweens();
+        }
+        offset += 24;
+    }
+}
 
-        asteroid.rotation.x += asteroid.userData.rotationSpeed.x * timeScale;
-        asteroid.rotation.y += asteroid.userData.rotationSpeed.y;
-        asteroid.rotation.z += asteroid.userData.rotationSpeed.z;
-    });
+// Simulation ticks to advance this frame so simTime converges on the server's clock
+function kioskStep(frameTicks) {
+    const elapsedTicks = (performance.now() - kiosk.remoteAt) * 0.06 * kiosk.remoteScale;
+    const remoteNow = kiosk.remoteTime + elapsedTicks;
+    const step = frameTicks * timeScale;
+    const error = remoteNow - (simTime + step);
+
+    // Far off (joined late, or the controller scrubbed the timeline): jump
+    if (Math.abs(error) > Math.max(60, Math.abs(kiosk.remoteScale) * 60)) {
+        setSimTime(remoteNow);
+        return 0;
+    }
+    return Math.max(0, step + error * 0.1);
+}
 
+// Per frame: displays ease towards the streamed camera, the controller publishes changes
+function updateKiosk(delta) {
+    if (!kioskSettings.controller) {
+        if (kiosk.pose) {
+            const blend = 1 - Math.exp(-delta * 10);
+            camera.position.lerp(kioskVector.set(kiosk.pose[0], kiosk.pose[1], kiosk.pose[2]), blend);
+            controls.target.lerp(kioskVector.set(kiosk.pose[3], kiosk.pose[4], kiosk.pose[5]), blend);
+        }
+        return;
+    }
 
-    // Animate ISS
-    if (iss && planets[2]) { // Earth is index 2
-        const earth = planets[2];
-        iss.userData.angle += iss.userData.speed * timeScale;
-        iss.position.x = earth.position.x + Math.cos(iss.userData.angle) * iss.userData.orbitRadius;
-        iss.position.z = earth.position.z + Math.sin(iss.userData.angle) * iss.userData.orbitRadius;
-        iss.position.y = earth.position.y;
+    kiosk.sendTimer += delta;
+    if (kiosk.sendTimer < kioskSettings.sendInterval) return;
+    if (!kiosk.socket || kiosk.socket.readyState !== WebSocket.OPEN) return;
+    kiosk.sendTimer = 0;
+
+    let mask = 0;
+    const focus = planets.indexOf(focusedPlanet);
+    if (kiosk.timeJumped) mask |= KIOSK_TIME;
+    if (timeScale !== kiosk.sentScale) mask |= KIOSK_SCALE;
+    if (focus !== kiosk.sentFocus) mask |= KIOSK_FOCUS;
+    if (kiosk.pendingPreset !== null) mask |= KIOSK_PRESET;
+
+    const pose = kiosk.sentPose;
+    if (kiosk.interacting && kiosk.pendingPreset === null) {
+        const p = camera.position;
+        const t = controls.target;
+        if (p.x !== pose[0] || p.y !== pose[1] || p.z !== pose[2] ||
+            t.x !== pose[3] || t.y !== pose[4] || t.z !== pose[5]) {
+            pose.set([p.x, p.y, p.z, t.x, t.y, t.z]);
+            mask |= KIOSK_CAMERA;
+        }
+    }
+    if (mask === 0) return;
+
+    const message = new DataView(new ArrayBuffer(4 + 8 + 4 + 1 + 1 + 24));
+    let offset = 4;
+    message.setUint8(0, KIOSK_CONTROL);
+    message.setUint8(1, mask);
+    message.setUint16(2, kiosk.seq = (kiosk.seq + 1) & 0xffff, true);
+    if (mask & KIOSK_TIME) {
+        message.setFloat64(offset, simTime, true);
+        offset += 8;
+    }
+    if (mask & KIOSK_SCALE) {
+        message.setFloat32(offset, timeScale, true);
+        kiosk.sentScale = timeScale;
+        offset += 4;
+    }
+    if (mask & KIOSK_FOCUS) {
+        message.setInt8(offset, focus);
+        kiosk.sentFocus = focus;
+        offset += 1;
+    }
+    if (mask & KIOSK_PRESET) {
+        message.setUint8(offset, kioskPresets.indexOf(kiosk.pendingPreset));
+        offset += 1;
+    }
+    if (mask & KIOSK_CAMERA) {
+        for (let i = 0; i < 6; i++) {
+            message.setFloat32(offset + i * 4, pose[i], true);
+        }
+        offset += 24;
+    }
+    kiosk.socket.send(message.buffer.slice(0, offset));
 
-        // Rotate to face earth
-        iss.lookAt(earth.position);
+    kiosk.pendingPreset = null;
+    kiosk.timeJumped = false;
+}
 
-        // Update ISS motion trail
-        updateTrail(trails.iss, iss.position);
+const kioskVector = new THREE.Vector3();
+
+// Animation loop
+function animate() {
+    requestAnimationFrame(animate);
+
+    // Nothing is drawn until the resume record has been applied (or found missing), so a
+    // reload doesn't show a fresh scene and then jump
+    if (snapshotSettings.enabled && !snapshotState.loaded) {
+        frameClock.getDelta(); // The wait isn't simulation time
+        return;
     }
-    // Animate Earth's moon
-    if (moon && planets[2]) { // Earth is index 2
-        const earth = planets[2];
-        moon.userData.angle += moon.userData.speed * timeScale;
-        moon.position.x = earth.position.x + Math.cos(moon.userData.angle) * moon.userData.orbitRadius;
-        moon.position.z = earth.position.z + Math.sin(moon.userData.angle) * moon.userData.orbitRadius;
-        moon.position.y = earth.position.y;
+
+    // Capture mode holds the simulation still until assets and the upload queue allow a frame
+    if (capture && !captureReady()) {
+        processTextureUploads();
+        pollCaptureReadbacks();
+        return;
     }
 
-    // Animate comet (elliptical orbit)
-    if (comet) {
-        comet.userData.angle += comet.userData.speed * timeScale;
-        const a = comet.userData.maxDistance;
-        const e = comet.userData.eccentricity;
-        const r = a * (1 - e * e) / (1 + e * Math.cos(comet.userData.angle));
+    // Advance the simulation clock by real elapsed time (a fixed step when capturing)
+    const frameTicks = capture ? 60 / captureSettings.fps : Math.min(frameClock.getDelta() * 60, maxFrameTicks);
+    const step = kiosk ? kioskStep(frameTicks) : frameTicks * timeScale;
+    simTime += step;
+    updateTimeline();
 
-        comet.position.x = r * Math.cos(comet.userData.angle);
-        comet.position.z = r * Math.sin(comet.userData.angle);
-        comet.position.y = Math.sin(comet.userData.angle * 2) * 100;
+    // Tweens run on real time, so camera flights don't speed up with the simulation
+    updateTweens(frameTicks / 60);
 
-        // Point comet in direction of movement
-        comet.rotation.y = comet.userData.angle + Math.PI / 2;
+    // Kiosk displays follow the shared camera; the controller publishes its changes
+    if (kiosk) {
+        updateKiosk(frameTicks / 60);
+    }
 
-        // Update comet motion trail
-        updateTrail(trails.comet, comet.position);
+    // Gravity mode writes planet positions before the kernel resolves their moons
+    if (gravity) {
+        updateGravity(step, frameTicks);
     }
 
-    // Animate meteors
-    for (let i = meteors.length - 1; i >= 0; i--) {
-        const meteor = meteors[i];
-        meteor.position.x += meteor.userData.velocity.x * timeScale;
-        meteor.position.y += meteor.userData.velocity.y * timeScale;
-        meteor.position.z += meteor.userData.velocity.z * timeScale;
+    // Place every orbiting body (planets, moons, satellites, ships, asteroids, comet)
+    updateBodies(simTime);
+    updateParticleEmitters(simTime);
+    updateConstellations(simTime);
 
-        meteor.userData.life -= 0.01 * timeScale;
-        meteor.material.opacity = meteor.userData.life;
+    // Comet tail follows the nucleus and points away from the sun (at the origin)
+    if (comet) {
+        const uniforms = comet.userData.tail.material.uniforms;
+        const i = comet.userData.bodyIndex;
+        const perihelion = bodyStore.orbitRadius[i] * (1 - bodyStore.eccentricity[i]);
+        const sunDistance = comet.position.length();
+        uniforms.emitterPosition.value.copy(comet.position);
+        uniforms.emitterDirection.value.copy(comet.position).normalize();
+        uniforms.activity.value = Math.min(1, Math.pow(perihelion / sunDistance, 2));
+    }
 
-        if (meteor.userData.life <= 0) {
-            scene.remove(meteor);
-            meteors.splice(i, 1);
-            createMeteor(); // Create new one
+    planets.forEach(planet => {
+        // Drift Earth's clouds (rotate slightly faster than the planet)
+        if (planet.material.uniforms && planet.material.uniforms.cloudOffset) {
+            planet.material.uniforms.cloudOffset.value = (0.002 * simTime / (Math.PI * 2)) % 1;
         }
-    }
 
+        // Animate Saturn's rings (subtle rotation)
+        if (planet.userData.rings) {
+            planet.userData.rings.forEach((ring, index) => {
+                ring.rotation.z = (0.0001 + index * 0.00005) * simTime;
+            });
+        }
+    });
 
-    // Apply Time Scale to global tick
-    tick += 0.01 * timeScale;
+    // Atmosphere shells follow their planets
+    updateAtmospheres();
+    updateLighting();
+
+    // Update motion trails
+    spaceships.forEach((ship, index) => {
+        if (trails.spaceships[index]) {
+            updateTrail(trails.spaceships[index], ship.position);
+        }
+    });
+    if (iss) {
+        updateTrail(trails.iss, iss.position);
+    }
+    if (comet) {
+        updateTrail(trails.comet, comet.position);
+    }
+
+    // Animate meteors (handed over to the gravity simulation in gravity mode)
+    if (!gravity) {
+        meteors.forEach(meteor => updateMeteor(meteor, simTime));
+    }
 
     // Animate Wormhole
     if (wormhole) {
-        wormhole.children[0].rotation.z -= 0.02 * timeScale; // Portal ring
-        wormhole.children[2].rotation.y += 0.01 * timeScale; // Particles
+        wormhole.children[0].rotation.z = -0.02 * simTime; // Portal ring
+        wormhole.children[2].rotation.y = 0.01 * simTime; // Particles
     }
 
-    // Animate UFOs
+    // Animate UFOs (ambient wanderers, not on the timeline - capped so fast-forward
+    // doesn't fling them across the bounds every frame)
+    const ufoStep = Math.min(step, 5);
     ufos.forEach(ufo => {
         ufo.userData.changeDirTimer++;
         if (ufo.userData.changeDirTimer > 100) {
             ufo.userData.velocity.set(
-                (Math.random() - 0.5) * 5,
-                (Math.random() - 0.5) * 2,
-                (Math.random() - 0.5) * 5
+                (worldRandom() - 0.5) * 5,
+                (worldRandom() - 0.5) * 2,
+                (worldRandom() - 0.5) * 5
             );
             ufo.userData.changeDirTimer = 0;
         }
 
-        ufo.position.add(ufo.userData.velocity.clone().multiplyScalar(timeScale));
-        ufo.rotation.y += 0.1 * timeScale;
+        ufo.position.add(ufo.userData.velocity.clone().multiplyScalar(ufoStep));
+        ufo.rotation.y += 0.1 * ufoStep;
 
         // Keep within bounds
         if (ufo.position.length() > 2000) {
@@ -1542,6 +4223,10 @@ function animate() {
         }
     });
 
+    // Proximity events (meteor impacts, UFOs near the wormhole)
+    updateSpatialGrid();
+    checkSpatialEvents();
+
     // Update Lens Flare Position
     if (lensFlare) {
         // Position flare between camera and sun (0,0,0)
@@ -1569,74 +4254,468 @@ function animate() {
     // Update OrbitControls (required for damping)
     controls.update();
     // Move stars towards camera (upward in Y direction)
+    starDrift += frameTicks;
     if (stars[0]) {
-        const positions = stars[0].geometry.attributes.position.array;
+        updateStarDrift();
+    }
 
-        for (let i = 0; i < positions.length; i += 3) {
-            // Move star upward (towards camera)
-            positions[i + 1] += 2;
+    // Stream star catalog chunks for the current view
+    updateStarCatalog();
 
-            // Reset star position when it gets too close
-            if (positions[i + 1] > 2000) {
-                positions[i + 1] = -2000;
-                positions[i] = (Math.random() - 0.5) * 4000;
-                positions[i + 2] = (Math.random() - 0.5) * 4000;
-            }
+    // Keep label glyphs on their bodies
+    updateLabels();
+
+    // World clock panel (once per second)
+    updateClocks();
+
+    // Resume snapshot every few seconds
+    updateSnapshots();
+
+    // Resource counts (once per second, only with the debug overlay open)
+    updateDebugOverlay();
+
+    // Stream decoded textures to the GPU within the per-frame budget
+    processTextureUploads();
+
+    renderer.render(scene, camera);
+
+    if (capture) {
+        captureFrame();
+    }
+}
+
+// Resume snapshots
+// The dynamic state that is not a function of simTime and the world seed - UFO motion,
+// trail history, the random stream, camera, focus and speed - is packed into a small
+// versioned binary record and written to IndexedDB every few seconds and when the page
+// is hidden. The record's seed is also kept in localStorage, so at startup the world
+// is rebuilt from it straight away (no new randomness) while IndexedDB is read; the
+// first frame waits (at most openTimeout) for the rest of the record to be applied,
+// if the seeds still match.
+// ?resume=0 disables it; an explicit ?seed= that differs from the record ignores it.
+//
+// Layout, little-endian:
+//   u32 magic 'SAMY'  u16 version  u16 body count (world layout check)
+//   u32 seed  u32 random state  f64 simTime  f64 star drift
+//   f32 speed slider  f32 speed multiplier
+//   u8 focus kind (clickableGroups index + 1, 0 none)  u8 focus index
+//   6 x f32 camera position, target
+//   u8 ufo count, per UFO: 3 x f32 position, 3 x f32 velocity, f32 rotation.y, u16 timer
+//   u8 trail count, per trail: u16 points, points x 3 x f32
+const SNAPSHOT_MAGIC = 0x594D4153; // 'SAMY'
+const SNAPSHOT_VERSION = 3;
+
+const snapshotSettings = {
+    enabled: urlParams.get('resume') !== '0' && !captureSettings.enabled, // Captures start from zero
+    interval: 5000,     // ms between saves
+    openTimeout: 500,   // ms to wait for IndexedDB before starting fresh
+    database: 'samay',
+    store: 'snapshots',
+    key: 'resume',
+    seedKey: 'resumeSeed' // localStorage
+};
+
+const snapshotState = {
+    db: null,
+    lastSave: 0,
+    saving: false,
+    loaded: false       // The stored record has been read (saving before would overwrite it)
+};
+
+function openSnapshotDatabase() {
+    if (snapshotState.db) return Promise.resolve(snapshotState.db);
+
+    const open = new Promise(resolve => {
+        if (typeof indexedDB === 'undefined') {
+            resolve(null);
+            return;
+        }
+        const request = indexedDB.open(snapshotSettings.database, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(snapshotSettings.store);
+        request.onsuccess = () => {
+            snapshotState.db = request.result;
+            resolve(request.result);
+        };
+        request.onerror = () => resolve(null);
+        request.onblocked = () => resolve(null);
+    });
+    const timeout = new Promise(resolve => setTimeout(() => resolve(null), snapshotSettings.openTimeout));
+    return Promise.race([open, timeout]);
+}
+
+// Trails in a fixed order so a record maps back onto the same buffers
+function snapshotTrails() {
+    return [trails.iss, trails.comet, ...trails.spaceships];
+}
+
+function encodeSnapshot() {
+    const trailList = snapshotTrails();
+    let size = 4 + 2 + 2 + 4 + 4 + 8 + 8 + 4 + 4 + 2 + 24 + 1 + ufos.length * 30 + 1;
+    trailList.forEach(trail => { size += 2 + trail.positions.length * 12; });
+
+    const buffer = new ArrayBuffer(size);
+    const view = new DataView(buffer);
+    let offset = 0;
+    const u8 = v => { view.setUint8(offset, v); offset += 1; };
+    const u16 = v => { view.setUint16(offset, v, true); offset += 2; };
+    const u32 = v => { view.setUint32(offset, v, true); offset += 4; };
+    const f32 = v => { view.setFloat32(offset, v, true); offset += 4; };
+
+    const speedControl = document.getElementById('speed-control');
+    const speedMultiplier = document.getElementById('speed-multiplier');
+
+    u32(SNAPSHOT_MAGIC);
+    u16(SNAPSHOT_VERSION);
+    u16(bodyStore.count);
+    u32(worldSeed);
+    u32(worldRandom.state);
+    view.setFloat64(offset, simTime, true);
+    view.setFloat64(offset + 8, starDrift, true);
+    offset += 16;
+    f32(speedControl ? parseFloat(speedControl.value) : timeScale);
+    f32(speedMultiplier ? parseFloat(speedMultiplier.value) : 1);
+    const groups = clickableGroups();
+    const focusKind = focusedPlanet ? groups.findIndex(group => group.includes(focusedPlanet)) : -1;
+    u8(focusKind + 1);
+    u8(focusKind >= 0 ? groups[focusKind].indexOf(focusedPlanet) : 0);
+    [camera.position, controls.target].forEach(v => { f32(v.x); f32(v.y); f32(v.z); });
+
+    u8(ufos.length);
+    ufos.forEach(ufo => {
+        const velocity = ufo.userData.velocity;
+        f32(ufo.position.x); f32(ufo.position.y); f32(ufo.position.z);
+        f32(velocity.x); f32(velocity.y); f32(velocity.z);
+        f32(ufo.rotation.y);
+        u16(Math.min(ufo.userData.changeDirTimer, 0xffff));
+    });
+
+    u8(trailList.length);
+    trailList.forEach(trail => {
+        u16(trail.positions.length);
+        trail.positions.forEach(p => { f32(p.x); f32(p.y); f32(p.z); });
+    });
+    return buffer;
+}
+
+// Decoded record, or null for anything that isn't a current-version snapshot
+function decodeSnapshot(buffer) {
+    if (!(buffer instanceof ArrayBuffer)) return null;
+
+    const view = new DataView(buffer);
+    let offset = 0;
+    const u8 = () => view.getUint8(offset++);
+    const u16 = () => { offset += 2; return view.getUint16(offset - 2, true); };
+    const u32 = () => { offset += 4; return view.getUint32(offset - 4, true); };
+    const f32 = () => { offset += 4; return view.getFloat32(offset - 4, true); };
+
+    try {
+        if (u32() !== SNAPSHOT_MAGIC || u16() !== SNAPSHOT_VERSION) return null;
+        const snapshot = { bodyCount: u16(), seed: u32(), randomState: u32() };
+        snapshot.simTime = view.getFloat64(offset, true);
+        snapshot.starDrift = view.getFloat64(offset + 8, true);
+        offset += 16;
+        snapshot.speed = f32();
+        snapshot.multiplier = f32();
+        snapshot.focusKind = u8();
+        snapshot.focusIndex = u8();
+        snapshot.camera = Array.from({ length: 6 }, f32);
+
+        snapshot.ufos = Array.from({ length: u8() }, () => ({
+            position: [f32(), f32(), f32()],
+            velocity: [f32(), f32(), f32()],
+            rotationY: f32(),
+            timer: u16()
+        }));
+        snapshot.trails = Array.from({ length: u8() }, () => {
+            const points = new Float32Array(u16() * 3);
+            for (let i = 0; i < points.length; i++) points[i] = f32();
+            return points;
+        });
+        return snapshot;
+    } catch (e) {
+        return null; // Truncated record (RangeError from the DataView)
+    }
+}
+
+// Read the last record; resolves null when there is none, it doesn't apply, or it takes
+// longer than openTimeout (the first frame waits for this)
+function loadSnapshot() {
+    if (!snapshotSettings.enabled) return Promise.resolve(null);
+
+    const read = openSnapshotDatabase().then(db => {
+        if (!db) return null;
+        return new Promise(resolve => {
+            const request = db.transaction(snapshotSettings.store, 'readonly')
+                .objectStore(snapshotSettings.store).get(snapshotSettings.key);
+            request.onsuccess = () => resolve(decodeSnapshot(request.result));
+            request.onerror = () => resolve(null);
+        });
+    }).then(snapshot => {
+        if (snapshot && urlParams.get('seed') && (parseInt(urlParams.get('seed'), 10) >>> 0) !== snapshot.seed) {
+            return null; // A different world was asked for
         }
+        return snapshot;
+    }).catch(() => null);
+    const timeout = new Promise(resolve => setTimeout(() => resolve(null), snapshotSettings.openTimeout));
+    return Promise.race([read, timeout]);
+}
+
+function saveSnapshot() {
+    if (!snapshotSettings.enabled || !snapshotState.loaded || snapshotState.saving) return;
+    snapshotState.saving = true;
+    snapshotState.lastSave = performance.now();
+
+    const buffer = encodeSnapshot();
+    localStorage.setItem(snapshotSettings.seedKey, worldSeed);
+    openSnapshotDatabase().then(db => {
+        if (!db) return;
+        const transaction = db.transaction(snapshotSettings.store, 'readwrite');
+        transaction.objectStore(snapshotSettings.store).put(buffer, snapshotSettings.key);
+        return new Promise(resolve => {
+            transaction.oncomplete = resolve;
+            transaction.onerror = resolve;
+            transaction.onabort = resolve;
+        });
+    }).catch(() => {}).then(() => {
+        snapshotState.saving = false;
+    });
+}
 
-        stars[0].geometry.attributes.position.needsUpdate = true;
+// The record's dynamic state on top of the world rebuilt from its seed
+function applySnapshot(snapshot) {
+    if (snapshot.seed !== worldSeed) {
+        return; // Built from another seed (localStorage cleared, or ?seed= given)
+    }
+    if (snapshot.bodyCount !== bodyStore.count || snapshot.ufos.length !== ufos.length ||
+        snapshot.trails.length !== snapshotTrails().length) {
+        console.warn('Resume snapshot is from a different scene layout, starting fresh');
+        return;
     }
 
-    renderer.render(scene, camera);
+    simTime = snapshot.simTime;
+    starDrift = snapshot.starDrift;
+    worldRandom.state = snapshot.randomState;
+
+    const speedControl = document.getElementById('speed-control');
+    const speedMultiplier = document.getElementById('speed-multiplier');
+    if (speedControl && speedMultiplier) {
+        speedControl.value = snapshot.speed;
+        speedMultiplier.value = snapshot.multiplier;
+    }
+    cancelTweenChannel('timeScale');
+    timeScale = snapshot.speed * snapshot.multiplier;
+
+    cancelCameraTweens();
+    camera.position.set(snapshot.camera[0], snapshot.camera[1], snapshot.camera[2]);
+    controls.target.set(snapshot.camera[3], snapshot.camera[4], snapshot.camera[5]);
+    const focusGroup = snapshot.focusKind > 0 ? clickableGroups()[snapshot.focusKind - 1] : null;
+    focusedPlanet = (focusGroup && focusGroup[snapshot.focusIndex]) || null;
+
+    snapshot.ufos.forEach((state, i) => {
+        const ufo = ufos[i];
+        ufo.position.fromArray(state.position);
+        ufo.userData.velocity.fromArray(state.velocity);
+        ufo.rotation.y = state.rotationY;
+        ufo.userData.changeDirTimer = state.timer;
+    });
+
+    snapshotTrails().forEach((trail, i) => {
+        const points = snapshot.trails[i];
+        trail.positions = [];
+        for (let p = 0; p < points.length; p += 3) {
+            trail.positions.push(new THREE.Vector3(points[p], points[p + 1], points[p + 2]));
+        }
+        trail.positions.splice(0, Math.max(0, trail.positions.length - trail.maxPoints));
+        writeTrailGeometry(trail);
+    });
 }
 
-// Initialize when DOM is ready
-init();
+// Called by init once the world exists; the stored record is applied before the first
+// frame (animate holds until it settles). A kiosk display follows its server instead.
+function startSnapshots() {
+    if (!snapshotSettings.enabled) return;
+    loadSnapshot().then(snapshot => {
+        if (snapshot && !kiosk) applySnapshot(snapshot);
+        snapshotState.loaded = true;
+    });
 
-// Clock Logic
-function updateClocks() {
-    const now = new Date();
+    snapshotState.lastSave = performance.now();
+    document.addEventListener('visibilitychange', () => {
+        if (document.hidden) saveSnapshot();
+    });
+    window.addEventListener('pagehide', saveSnapshot);
+}
 
-    const options = {
-        hour12: true,
-        hour: '2-digit',
-        minute: '2-digit',
-        second: '2-digit'
-    };
+// Save on the interval (from animate)
+function updateSnapshots() {
+    if (snapshotSettings.enabled && performance.now() - snapshotState.lastSave > snapshotSettings.interval) {
+        saveSnapshot();
+    }
+}
 
-    const dateOptions = {
-        weekday: 'short',
-        month: 'short',
-        day: 'numeric'
-    };
+// World clocks
+// Zones come from ?zones=Asia/Tokyo,Europe/London (or localStorage 'clockZones', see
+// setClockZones). Each zone's UTC offset is read through a cached Intl.DateTimeFormat
+// once a minute; in between, the time is plain arithmetic. updateClocks runs from the
+// frame loop and only touches text nodes whose value changed.
+const defaultClockZones = [
+    { zone: 'Asia/Kolkata', label: 'India (IST)' },
+    { zone: 'America/New_York', label: 'New York (EST)' },
+    { zone: 'America/Los_Angeles', label: 'Los Angeles (PST)' },
+    { zone: 'UTC', label: 'UTC' }
+];
+const clockGrid = document.querySelector('.clock-grid');
+const clockState = {
+    clocks: [],
+    lastSecond: -1,
+    lastMinute: -1
+};
 
-    // India (IST)
-    const indiaTime = now.toLocaleTimeString('en-US', { ...options, timeZone: 'Asia/Kolkata' });
-    const indiaDate = now.toLocaleDateString('en-US', { ...dateOptions, timeZone: 'Asia/Kolkata' });
-    document.getElementById('time-india').textContent = indiaTime;
-    document.getElementById('date-india').textContent = indiaDate;
+function loadClockZones() {
+    if (urlParams.get('zones')) {
+        return urlParams.get('zones').split(',').map(zone => ({ zone: zone.trim() }));
+    }
+    try {
+        const saved = JSON.parse(localStorage.getItem('clockZones'));
+        if (Array.isArray(saved) && saved.length > 0) {
+            return saved.map(entry => typeof entry === 'string' ? { zone: entry } : entry);
+        }
+    } catch (e) {
+        // Fall through to the defaults
+    }
+    return defaultClockZones;
+}
 
-    // New York (EST/EDT)
-    const nyTime = now.toLocaleTimeString('en-US', { ...options, timeZone: 'America/New_York' });
-    const nyDate = now.toLocaleDateString('en-US', { ...dateOptions, timeZone: 'America/New_York' });
-    document.getElementById('time-ny').textContent = nyTime;
-    document.getElementById('date-ny').textContent = nyDate;
+// Save a zone list (['Asia/Tokyo', { zone: 'UTC', label: 'Zulu' }, ...]) and rebuild the panel
+function setClockZones(zones) {
+    localStorage.setItem('clockZones', JSON.stringify(zones));
+    initClocks(zones.map(entry => typeof entry === 'string' ? { zone: entry } : entry));
+}
 
-    // Los Angeles (PST/PDT)
-    const laTime = now.toLocaleTimeString('en-US', { ...options, timeZone: 'America/Los_Angeles' });
-    const laDate = now.toLocaleDateString('en-US', { ...dateOptions, timeZone: 'America/Los_Angeles' });
-    document.getElementById('time-la').textContent = laTime;
-    document.getElementById('date-la').textContent = laDate;
+function initClocks(zones = loadClockZones()) {
+    if (!clockGrid) return;
+    while (clockGrid.firstChild) clockGrid.removeChild(clockGrid.firstChild);
+
+    clockState.clocks = [];
+    zones.forEach(entry => {
+        let offsetFormat, dateFormat;
+        try {
+            offsetFormat = new Intl.DateTimeFormat('en-US', {
+                timeZone: entry.zone,
+                hourCycle: 'h23',
+                year: 'numeric',
+                month: 'numeric',
+                day: 'numeric',
+                hour: 'numeric',
+                minute: 'numeric',
+                second: 'numeric'
+            });
+            dateFormat = new Intl.DateTimeFormat('en-US', {
+                timeZone: entry.zone,
+                weekday: 'short',
+                month: 'short',
+                day: 'numeric'
+            });
+        } catch (e) {
+            console.warn('Unknown time zone:', entry.zone);
+            return;
+        }
 
-    // UTC
-    const utcTime = now.toLocaleTimeString('en-US', { ...options, timeZone: 'UTC' });
-    const utcDate = now.toLocaleDateString('en-US', { ...dateOptions, timeZone: 'UTC' });
-    document.getElementById('time-utc').textContent = utcTime;
-    document.getElementById('date-utc').textContent = utcDate;
+        const card = document.createElement('div');
+        card.className = 'clock-card';
+        const title = document.createElement('h2');
+        title.textContent = entry.label || entry.zone.split('/').pop().replace(/_/g, ' ');
+        const time = document.createElement('div');
+        time.className = 'time';
+        const date = document.createElement('div');
+        date.className = 'date';
+
+        // Separate text nodes so the seconds tick without rewriting the rest
+        const hoursMinutes = document.createTextNode('--:--');
+        const seconds = document.createTextNode(':--');
+        const period = document.createTextNode('');
+        time.appendChild(hoursMinutes);
+        time.appendChild(seconds);
+        time.appendChild(period);
+        date.appendChild(document.createTextNode('Loading...'));
+
+        card.appendChild(title);
+        card.appendChild(time);
+        card.appendChild(date);
+        clockGrid.appendChild(card);
+
+        clockState.clocks.push({
+            offsetFormat: offsetFormat,
+            dateFormat: dateFormat,
+            offset: 0,       // ms to add to UTC for local wall time
+            day: -1,         // Local day number the date text was made for
+            nodes: { hoursMinutes: hoursMinutes, seconds: seconds, period: period, date: date.firstChild },
+            text: { hoursMinutes: '', seconds: '', period: '', date: '' }
+        });
+    });
+
+    clockState.lastSecond = -1;
+    clockState.lastMinute = -1;
+}
+
+function zoneOffset(clock, now) {
+    const parts = {};
+    clock.offsetFormat.formatToParts(now).forEach(part => parts[part.type] = part.value);
+    const wall = Date.UTC(parts.year, parts.month - 1, parts.day, parts.hour, parts.minute, parts.second);
+    return wall - Math.floor(now / 1000) * 1000;
+}
+
+function setClockText(clock, field, value) {
+    if (clock.text[field] === value) return;
+    clock.text[field] = value;
+    clock.nodes[field].nodeValue = value;
 }
 
-setInterval(updateClocks, 1000);
-updateClocks();
+function pad2(value) {
+    return value < 10 ? '0' + value : String(value);
+}
+
+// Called every frame; does work once per second
+function updateClocks() {
+    const now = Date.now();
+    const second = Math.floor(now / 1000);
+    if (second === clockState.lastSecond) return;
+    clockState.lastSecond = second;
+    if (clockGrid && clockGrid.classList.contains('hidden')) return;
+
+    // Offsets can only change (DST, zone rules) on a minute boundary
+    const minute = Math.floor(second / 60);
+    const refreshOffsets = minute !== clockState.lastMinute;
+    clockState.lastMinute = minute;
+
+    clockState.clocks.forEach(clock => {
+        if (refreshOffsets) clock.offset = zoneOffset(clock, now);
+
+        const wall = second * 1000 + clock.offset;
+        const day = Math.floor(wall / 86400000);
+        const secondsOfDay = Math.floor((wall - day * 86400000) / 1000);
+        const hours = Math.floor(secondsOfDay / 3600);
+        const minutes = Math.floor(secondsOfDay / 60) % 60;
+
+        setClockText(clock, 'hoursMinutes', pad2(hours % 12 || 12) + ':' + pad2(minutes));
+        setClockText(clock, 'seconds', ':' + pad2(secondsOfDay % 60));
+        setClockText(clock, 'period', hours < 12 ? ' AM' : ' PM');
+
+        if (day !== clock.day) {
+            clock.day = day;
+            setClockText(clock, 'date', clock.dateFormat.format(now));
+        }
+    });
+}
+
+// Initialize when DOM is ready, resuming from the last snapshot if there is one
+// Rebuild the world of the last saved session, if any; applySnapshot restores the rest
+const resumeSeed = snapshotSettings.enabled && !urlParams.get('seed') ? localStorage.getItem(snapshotSettings.seedKey) : null;
+if (resumeSeed !== null) {
+    worldSeed = parseInt(resumeSeed, 10) >>> 0;
+    worldRandom.state = worldSeed;
+}
+init();
 
 // Theme Toggle
 const themeToggle = document.getElementById('theme-toggle');
@@ -1675,7 +4754,6 @@ document.addEventListener('click', (e) => {
 
 // Timezone Toggle
 const timezoneToggle = document.getElementById('timezone-toggle');
-const clockGrid = document.querySelector('.clock-grid');
 
 // Check local storage for timezone preference
 const savedTimezoneState = localStorage.getItem('timezoneVisible');
@@ -0,0 +1,136 @@
+"""Tests for reference_sim.py.
+
+fixtures/simulation-state-42.json is a dumpSimulationState() dump of the scene at
+?seed=42, trimmed to the 17 non-instanced bodies and the first 16 asteroids (parents
+remapped), at ticks 0, 1, 600, 36000 and 360000. It was produced by running script.js
+under node with a stubbed DOM, not in a browser, and with three.js r97's Object3D/Matrix4
+for the matrices (the page loads r128; the rotation and lookAt math is the same in both,
+but the orientations have not been checked against r128 itself).
+fixtures/golden/seed-42.json is `reference_sim.py golden` of that dump, so it only
+catches later drift of the dump, not a kernel change that rewrites both. The expected
+positions in test_known_bodies are worked out by hand from the scene's constants for
+that.
+
+Regenerate the fixtures after an intentional change to the kernel or the seeded scene.
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import reference_sim  # noqa: E402
+
+SCRIPT = os.path.join(ROOT, 'reference_sim.py')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+DUMP = os.path.join(FIXTURES, 'simulation-state-42.json')
+GOLDEN = os.path.join(FIXTURES, 'golden', 'seed-42.json')
+
+
+def run(*args):
+    return subprocess.run([sys.executable, SCRIPT, *args], capture_output=True, text=True)
+
+
+def columns(*bodies):
+    """Store columns for bodies given as dicts of overrides."""
+    defaults = dict(orbitRadius=0.0, eccentricity=0.0, phase=0.0, angularSpeed=0.0, height=0.0,
+                    verticalSpeed=0.0, wobble=0.0, spinX=0.0, spinY=0.0, spinZ=0.0, scale=1.0,
+                    parent=-1, flags=0, instanceOf=-1)
+    state = {'columns': {key: [body.get(key, value) for body in bodies] for key, value in defaults.items()}}
+    return reference_sim.body_columns(state)
+
+
+def test_check_dump_against_reference():
+    result = run('check', DUMP)
+    assert result.returncode == 0, result.stdout
+    assert 'FAILED' not in result.stdout
+
+
+def known_bodies(t):
+    """Earth, Moon, ISS and comet positions at tick t, from the constants in script.js."""
+    earth_angle = math.radians(80) + 0.01 * t
+    earth = np.array([400 * math.cos(earth_angle), 0, 400 * math.sin(earth_angle)])
+    moon_angle = 0.05 * t
+    iss_angle = math.pi + 0.08 * t
+    comet_angle = 0.008 * t
+    comet_r = 1400 * (1 - 0.7 ** 2) / (1 + 0.7 * math.cos(comet_angle))
+    return {
+        'Earth': earth,
+        'Moon': earth + [40 * math.cos(moon_angle), 0, 40 * math.sin(moon_angle)],
+        'ISS': earth + [18 * math.cos(iss_angle), 0, 18 * math.sin(iss_angle)],
+        'Comet': [comet_r * math.cos(comet_angle), 100 * math.sin(2 * comet_angle),
+                  comet_r * math.sin(comet_angle)],
+    }
+
+
+@pytest.mark.parametrize('path', [DUMP, GOLDEN])
+@pytest.mark.parametrize('t', [600, 36000])
+def test_known_bodies(path, t):
+    with open(path) as f:
+        state = json.load(f)
+    snapshot = next(s for s in state['snapshots'] if s['time'] == t)
+    positions, _ = reference_sim.snapshot_arrays(snapshot, state['count'])
+    for label, expected in known_bodies(t).items():
+        # The columns are float32, so the angles drift from the exact constants over time
+        np.testing.assert_allclose(positions[state['labels'].index(label)], expected, atol=1e-2,
+                                   err_msg=label)
+
+
+def test_compare_reports_moved_body(tmp_path):
+    with open(DUMP) as f:
+        state = json.load(f)
+    state['snapshots'][2]['positions'][3 * 2] += 0.5  # Earth's x at t=600
+    moved = tmp_path / 'moved.json'
+    moved.write_text(json.dumps(state))
+
+    result = run('compare', GOLDEN, str(moved))
+    assert result.returncode == 1
+    assert 'Earth' in result.stdout
+
+
+def test_circular_orbit():
+    body = columns(dict(orbitRadius=100, phase=0.25, angularSpeed=0.01, height=3))
+    positions, _ = reference_sim.evaluate(body, 50.0)
+    angle = 0.25 + 0.01 * 50
+    np.testing.assert_allclose(positions[0], [100 * math.cos(angle), 3, 100 * math.sin(angle)], rtol=1e-6)
+
+    # One full period later the body is back where it started
+    period = 2 * math.pi / 0.01
+    again, _ = reference_sim.evaluate(body, 50.0 + period)
+    np.testing.assert_allclose(again[0], positions[0], atol=1e-3)
+
+
+def test_eccentric_orbit_apsides():
+    body = columns(dict(orbitRadius=200, eccentricity=0.5, angularSpeed=0.01))
+    perihelion, _ = reference_sim.evaluate(body, 0.0)
+    aphelion, _ = reference_sim.evaluate(body, math.pi / 0.01)
+    np.testing.assert_allclose(perihelion[0], [100, 0, 0], atol=1e-4)   # a (1 - e)
+    np.testing.assert_allclose(aphelion[0], [-300, 0, 0], atol=1e-3)    # a (1 + e)
+
+
+def test_child_orbits_parent_position():
+    store = columns(dict(orbitRadius=400),
+                    dict(orbitRadius=40, phase=math.pi / 2, parent=0))
+    positions, _ = reference_sim.evaluate(store, 0.0)
+    np.testing.assert_allclose(positions[1], [400, 0, 40], atol=1e-4)
+
+
+@pytest.mark.parametrize('t, expected', [(5, 95), (20, 90), (330, 20), (420, 90)])
+def test_vertical_bounce_folds_at_limit(t, expected):
+    body = columns(dict(orbitRadius=100, height=90, verticalSpeed=1))
+    positions, _ = reference_sim.evaluate(body, float(t))
+    assert positions[0][1] == pytest.approx(expected)
+
+
+def test_external_positions_are_used_as_given():
+    store = columns(dict(orbitRadius=400, flags=reference_sim.BODY_EXTERNAL),
+                    dict(orbitRadius=40, parent=0))
+    external = np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 0.0]])
+    positions, _ = reference_sim.evaluate(store, 10.0, external)
+    np.testing.assert_allclose(positions, [[1, 2, 3], [41, 2, 3]], atol=1e-5)